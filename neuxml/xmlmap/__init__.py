@@ -34,6 +34,8 @@ the following names:
    nodes to Python strings
  * IntegerField and IntegerListField -- field classes for mapping xml
    nodes to Python integers
+ * document_changed -- invalidate field values cached for a document after
+   changing it directly with lxml
 
 """
 
@@ -47,6 +49,7 @@ from neuxml.xmlmap.core import (
     load_xslt,
 )
 from neuxml.xmlmap.fields import (
+    document_changed,
     StringField,
     StringListField,
     IntegerField,
@@ -72,6 +75,7 @@ __all__ = [
     "load_xmlobject_from_string",
     "load_xmlobject_from_file",
     "load_xslt",
+    "document_changed",
     "StringField",
     "StringListField",
     "IntegerField",
@@ -0,0 +1,263 @@
+# file neuxml/xmlmap/compiler.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Compile simple XPath expressions into Python functions.
+
+Evaluating an xpath with lxml sets up a libxml2 XPath context and compiles
+the expression on every call, which dominates the cost of reading a field
+whose xpath is just a child element or an attribute. :func:`compile_xpath`
+turns expressions made of child element steps, an optional final
+attribute or ``text()`` step, and simple predicates into a Python function
+that walks the lxml tree directly and returns the same nodes, in the same
+order, as :meth:`lxml.etree._Element.xpath`.
+
+Supported predicates are numeric positions (``[2]``), attribute presence
+(``[@type]``, ``[not(@type)]``), child element presence (``[e:did]``) and
+equality of an attribute or child element with a string literal
+(``[@type='text']``, ``[mods:roleTerm='creator']``).
+
+Attribute and text results are lxml "smart" strings, as with
+:meth:`~lxml.etree._Element.xpath`, so they can be used to find their
+parent element.
+"""
+
+from lxml import etree
+
+from neuxml.xpath import ast
+
+__all__ = ["compile_xpath", "prefixes"]
+
+#: set to False to evaluate every field xpath with lxml
+ENABLED = True
+
+_string_value = etree.XPath("string()")
+# final attribute and text() steps are left to lxml, which returns "smart"
+# strings that know their parent element; a precompiled XPath is still
+# much cheaper than element.xpath()
+_select_text = etree.XPath("text()")
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _qname(name_test, namespaces, attribute=False):
+    # Clark notation name for a NameTest; unprefixed names have no namespace.
+    # lxml matches * and {uri}* for elements, but not for attributes.
+    if attribute and name_test.name == "*":
+        raise _Unsupported()
+    if name_test.prefix is None:
+        return name_test.name
+    try:
+        return "{%s}%s" % (namespaces[name_test.prefix], name_test.name)
+    except KeyError:
+        # let lxml report the undefined prefix
+        raise _Unsupported()
+
+
+def _attribute_name(xp_ast, namespaces):
+    # name of the attribute selected by a bare @name step
+    if (
+        isinstance(xp_ast, ast.Step)
+        and xp_ast.axis in ("@", "attribute")
+        and isinstance(xp_ast.node_test, ast.NameTest)
+        and not xp_ast.predicates
+    ):
+        return _qname(xp_ast.node_test, namespaces, attribute=True)
+    raise _Unsupported()
+
+
+def _child_name(xp_ast, namespaces):
+    # name of the element selected by a bare child step
+    if (
+        isinstance(xp_ast, ast.Step)
+        and xp_ast.axis in (None, "child")
+        and isinstance(xp_ast.node_test, ast.NameTest)
+        and not xp_ast.predicates
+    ):
+        return _qname(xp_ast.node_test, namespaces)
+    raise _Unsupported()
+
+
+def _compile_predicate(pred, namespaces):
+    """Compile a boolean predicate into a test on an element."""
+    if isinstance(pred, ast.FunctionCall) and pred.prefix is None:
+        if pred.name == "not" and len(pred.args) == 1:
+            test = _compile_predicate(pred.args[0], namespaces)
+            return lambda node: not test(node)
+        raise _Unsupported()
+
+    if isinstance(pred, ast.Step):
+        if pred.axis in ("@", "attribute"):
+            name = _attribute_name(pred, namespaces)
+            return lambda node: node.get(name) is not None
+        tag = _child_name(pred, namespaces)
+        return lambda node: next(node.iterchildren(tag), None) is not None
+
+    if isinstance(pred, ast.BinaryExpression) and pred.op == "=":
+        path, literal = pred.left, pred.right
+        if isinstance(path, str):
+            path, literal = literal, path
+        if not isinstance(literal, str):
+            raise _Unsupported()
+        if isinstance(path, ast.Step) and path.axis in ("@", "attribute"):
+            name = _attribute_name(path, namespaces)
+            return lambda node: node.get(name) == literal
+        tag = _child_name(path, namespaces)
+        return lambda node: any(
+            _string_value(child) == literal for child in node.iterchildren(tag)
+        )
+
+    raise _Unsupported()
+
+
+def _compile_step(step, namespaces):
+    """Compile a child element step into a function returning the matching
+    children of an element."""
+    if not (
+        isinstance(step, ast.Step)
+        and step.axis in (None, "child")
+        and isinstance(step.node_test, ast.NameTest)
+    ):
+        raise _Unsupported()
+    tag = _qname(step.node_test, namespaces)
+    if not step.predicates:
+        return lambda node: list(node.iterchildren(tag))
+
+    # predicates filter in turn, so a position counts only the nodes that
+    # passed the predicates before it
+    filters = []
+    for pred in step.predicates:
+        if type(pred) is int:
+            if pred < 1:
+                raise _Unsupported()
+            filters.append(lambda nodes, i=pred - 1: nodes[i : i + 1])
+        else:
+            test = _compile_predicate(pred, namespaces)
+            filters.append(lambda nodes, test=test: [n for n in nodes if test(n)])
+
+    def select(node):
+        nodes = list(node.iterchildren(tag))
+        for filter_nodes in filters:
+            nodes = filter_nodes(nodes)
+        return nodes
+
+    return select
+
+
+def _union_operands(xp_ast):
+    if isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op == "|":
+        return _union_operands(xp_ast.left) + _union_operands(xp_ast.right)
+    return [xp_ast]
+
+
+def _path_steps(xp_ast):
+    steps = []
+    while isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op == "/":
+        steps.append(xp_ast.right)
+        xp_ast = xp_ast.left
+    steps.append(xp_ast)
+    steps.reverse()
+    # ./a and a/./b select the same nodes as a and a/b
+    return [
+        step
+        for step in steps
+        if not (isinstance(step, ast.AbbreviatedStep) and step.abbr == ".")
+    ]
+
+
+def _compile(xp_ast, namespaces):
+    if isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op == "|":
+        tags = [_child_name(operand, namespaces) for operand in _union_operands(xp_ast)]
+        # iterchildren returns children matching any tag in document order
+        return lambda node: list(node.iterchildren(*tags))
+
+    steps = _path_steps(xp_ast)
+    if not steps:
+        # only self steps
+        return lambda node: [node]
+
+    last = steps[-1]
+    final = None
+    if isinstance(last, ast.Step) and last.axis in ("@", "attribute"):
+        # checks the step is a supported attribute name
+        _attribute_name(last, namespaces)
+        prefix = last.node_test.prefix
+        select_attribute = etree.XPath(
+            ast.serialize(last),
+            namespaces={prefix: namespaces[prefix]} if prefix else None,
+        )
+
+        def final(nodes):
+            return [value for node in nodes for value in select_attribute(node)]
+
+        steps = steps[:-1]
+    elif (
+        isinstance(last, ast.Step)
+        and last.axis in (None, "child")
+        and isinstance(last.node_test, ast.NodeType)
+        and last.node_test.name == "text"
+        and not last.predicates
+    ):
+
+        def final(nodes):
+            return [text for node in nodes for text in _select_text(node)]
+
+        steps = steps[:-1]
+
+    selects = [_compile_step(step, namespaces) for step in steps]
+
+    if len(selects) == 1 and final is None:
+        return selects[0]
+
+    def evaluate(node):
+        nodes = [node]
+        for select in selects:
+            nodes = [match for parent in nodes for match in select(parent)]
+        if final is not None:
+            return final(nodes)
+        return nodes
+
+    return evaluate
+
+
+def compile_xpath(xp_ast, namespaces=None):
+    """Compile a parsed xpath into a function that takes an lxml element
+    and returns the list of matching nodes, as ``element.xpath()`` would,
+    resolving prefixes with the `namespaces` mapping. Returns None if the
+    expression is not supported."""
+    try:
+        return _compile(xp_ast, namespaces or {})
+    except _Unsupported:
+        return None
+
+
+def prefixes(xp_ast):
+    """Return the set of namespace prefixes used in a parsed xpath, in
+    names, function calls and variable references."""
+    found = set()
+    nodes = [xp_ast]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, tuple):
+            nodes.extend(node)
+        elif isinstance(node, ast._Node):
+            if isinstance(node, (ast.NameTest, ast.FunctionCall)) and node.prefix:
+                found.add(node.prefix)
+            elif isinstance(node, ast.VariableReference) and node.name[0]:
+                found.add(node.name[0])
+            nodes.extend(getattr(node, field) for field in node._fields)
+    return found
@@ -15,12 +15,23 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import copy
 import logging
 import io
 from lxml import etree
 from lxml.builder import ElementMaker
 
-from neuxml.xmlmap.fields import Field, SchemaField, StringField, StringListField
+from neuxml.xmlmap.fields import (
+    Field,
+    SchemaField,
+    StringField,
+    StringListField,
+    FrozenContext,
+    _document_root,
+    _node_nsmap,
+    document_state,
+    parse_fields,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -123,6 +134,8 @@ class _FieldDescriptor(object):
             # NOTE: return the *field* here rather than self;
             # allows sphinx autodocumentation to inspect the type properly
             return self.field
+        if obj.CACHE_FIELD_VALUES:
+            return obj._get_cached_value(self.field)
         return self.field.get_for_node(obj.node, obj.context)
 
     def __set__(self, obj, value):
@@ -219,6 +232,10 @@ class XmlObjectType(type):
                 use_attrs[attr_name] = attr_val
         use_attrs["_fields"] = fields
 
+        # parse the xpaths of all new fields together, so that xpaths
+        # declared more than once are parsed once
+        parse_fields(fields.values())
+
         super_new = super(XmlObjectType, cls).__new__
         new_class = super_new(cls, name, bases, use_attrs)
 
@@ -254,6 +271,10 @@ class XmlObject(object, metaclass=XmlObjectType):
 
     Programs can also pass an optional dictionary to the constructor to
     specify namespaces for XPath evaluation.
+    Objects created for :class:`~neuxml.xmlmap.fields.NodeField` and
+    :class:`~neuxml.xmlmap.fields.NodeListField` values have a read-only
+    :class:`~neuxml.xmlmap.fields.FrozenContext`, shared with their parent
+    when the same namespaces apply.
 
     If keyword arguments are passed in to the constructor, they will be used to
     set initial values for the corresponding fields on the :class:`XmlObject`.
@@ -291,6 +312,25 @@ class XmlObject(object, metaclass=XmlObjectType):
      the use of :class:`xmlmap.fields.SchemaField` for a sub-xmlobject
      that should not be validated, set to False."""
 
+    CACHE_FIELD_VALUES = False
+    """Set to True to cache the Python value of each field on an instance
+    after it is first read, instead of evaluating the xpath every time.
+    Cached values are discarded whenever the document is changed through
+    any xmlmap field or list. Code that modifies the XML of such an object
+    directly with lxml must call :func:`neuxml.xmlmap.document_changed`
+    afterwards."""
+
+    REUSE_INSTANCES = False
+    """Set to True to reuse instances of this class for
+    :class:`~neuxml.xmlmap.fields.NodeField` and
+    :class:`~neuxml.xmlmap.fields.NodeListField` values: while an instance
+    wrapping an element is in use, reading a field that maps the same
+    element to this class returns that instance instead of a new one, with
+    the namespace context it was created with."""
+
+    _document_state = None
+    _field_values = None
+
     @property
     def xmlschema(self):
         """A parsed XSD schema instance of
@@ -315,29 +355,59 @@ class XmlObject(object, metaclass=XmlObjectType):
             node = self._build_root_element()
 
         self.node = node
+        if isinstance(context, FrozenContext):
+            # a parent object's context, shared if the same namespaces apply
+            self.context = context.for_node(type(self), node)
+        else:
+            self.context = self._build_context(node, context)
+
+        for field, value in kwargs.items():
+            # TODO (maybe): handle setting/creating list fields
+            setattr(self, field, value)
+
+    def _build_context(self, node, context):
         # FIXME: context probably needs work
         # get namespaces from current node OR its parent (in case of an lxml 'smart' string)
-        if hasattr(node, "nsmap"):
-            nsmap = node.nsmap
-        elif hasattr(node, "getParent"):
-            nsmap = node.nsmap
-        else:
-            nsmap = {}
+        nsmap = _node_nsmap(node)
 
         # xpath has no notion of a default namespace - omit any namespace with no prefix
-        self.context = {
+        result = {
             "namespaces": dict([(prefix, ns) for prefix, ns in nsmap.items() if prefix])
         }
 
         if context is not None:
-            self.context.update(context)
+            result.update(context)
         if hasattr(self, "ROOT_NAMESPACES"):
-            # also include any root namespaces to guarantee that expected prefixes are available
-            self.context["namespaces"].update(self.ROOT_NAMESPACES)
-
-        for field, value in kwargs.items():
-            # TODO (maybe): handle setting/creating list fields
-            setattr(self, field, value)
+            # also include any root namespaces to guarantee that expected prefixes are available;
+            # the namespaces of the given context may be shared and read-only
+            result["namespaces"] = dict(result["namespaces"], **self.ROOT_NAMESPACES)
+        return result
+
+    def _get_cached_value(self, field):
+        # value of a field, cached until the document next changes
+        state = self._document_state
+        if state is None or state.root is not _document_root(self.node):
+            # first read, or the node has moved to another document
+            state = self._document_state = document_state(self.node)
+            self._field_values = {}
+        elif self._field_values is None:
+            self._field_values = {}
+        cached = self._field_values.get(field)
+        if cached is not None and cached[0] == state.generation:
+            return cached[1]
+        value = field.get_for_node(self.node, self.context)
+        self._field_values[field] = (state.generation, value)
+        return value
+
+    def __deepcopy__(self, memo):
+        # cached values and the document state belong to the original
+        # document; the cache is keyed by fields, which can't be copied
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+        for name, value in self.__dict__.items():
+            if name not in ("_document_state", "_field_values"):
+                copied.__dict__[name] = copy.deepcopy(value, memo)
+        return copied
 
     def _build_root_element(self):
         opts = {}
@@ -277,7 +277,9 @@ class Component(_EadBase):
     "list of digital archival object references as :class:`DigitalArchivalObject`"
 
     c = xmlmap.NodeListField(
-        "e:c02|e:c03|e:c04|e:c05|e:c06|e:c07|e:c08|e:c09|e:c10|e:c11|e:c12", "self"
+        "e:c02|e:c03|e:c04|e:c05|e:c06|e:c07|e:c08|e:c09|e:c10|e:c11|e:c12",
+        "self",
+        optimize=True,
     )
     "list of :class:`Component` - recursive mapping to any c-level 2-12; `c02|c03|c04|c05|c06|c07|c08|c09|c10|c11|c12`"
 
@@ -369,6 +371,7 @@ class IndexEntry(_EadBase):
     name = xmlmap.NodeField(
         "e:corpname|e:famname|e:function|e:genreform|e:geogname|e:name|e:namegrp|e:occupation|e:persname|e:title|e:subject",
         xmlmap.XmlObject,
+        optimize=True,
     )
     "access element, e.g. name or subject"
     ptrgroup = xmlmap.NodeField("e:ptrgrp", PointerGroup)
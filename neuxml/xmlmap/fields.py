@@ -15,15 +15,23 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+from array import array
 from copy import deepcopy
 from datetime import datetime, date
+import functools
 import logging
+import math
+import re
+import threading
+import weakref
 
 from lxml import etree
 from lxml.builder import ElementMaker
 
-from neuxml.xpath import ast
-from neuxml.xpath.core import parse, serialize
+from neuxml.xmlmap import compiler
+from neuxml.xpath import ast, persist
+from neuxml.xpath.core import serialize
+from neuxml.xpath.optimize import optimize as optimize_ast
 
 __all__ = [
     "StringField",
@@ -54,18 +62,28 @@ class Field(object):
     that it is unknown whether the field is required or not.  The required value
     for an xmlmap field should not conflict with the schema or DTD for that xml,
     if there is one.
+
+    Takes an optional ``optimize`` flag; if true, XML is accessed with an
+    equivalent but cheaper rewrite of the xpath (see
+    :mod:`neuxml.xpath.optimize`), such as a single name test in place of
+    a long union of element names.
     """
 
     # track each time a Field instance is created, to retain order
     creation_counter = 0
 
     def __init__(
-        self, xpath, manager, mapper, required=None, verbose_name=None, help_text=None
+        self,
+        xpath,
+        manager,
+        mapper,
+        required=None,
+        verbose_name=None,
+        help_text=None,
+        optimize=False,
     ):
         # compile xpath in order to catch an invalid xpath at load time
-        etree.XPath(xpath)
-        # NOTE: not saving compiled xpath because namespaces must be
-        # passed in at compile time when evaluating an etree.XPath on a node
+        _check_xpath(xpath)
         self.xpath = xpath
         self.manager = manager
         self.mapper = mapper
@@ -73,26 +91,171 @@ class Field(object):
         self.verbose_name = verbose_name
         self.help_text = help_text
 
-        # pre-parse the xpath for setters, etc
-        self.parsed_xpath = parse(xpath)
+        self.optimize = optimize
+
+        # the xpath is parsed on first use; XmlObjectType parses the
+        # xpaths of all the fields of a class together (see parse_fields)
+        self._parsed_xpath = None
+        self._eval_xpath = None
+
+        # python functions compiled from the xpath by
+        # neuxml.xmlmap.compiler, and compiled etree.XPath objects, keyed by
+        # the namespace uris of the prefixes used in the xpath
+        self._prefixes = None
+        self._evaluators = {}
+        self._xpaths = {}
+        # the last frozen context each was looked up for, with the result
+        self._evaluator_for_context = None
+        self._xpath_for_context = None
 
         # adjust creation counter, save local copy of current count
         self.creation_counter = Field.creation_counter
         Field.creation_counter += 1
 
+    @property
+    def parsed_xpath(self):
+        """The xpath parsed into :mod:`neuxml.xpath.ast` nodes, used by
+        setters to create missing nodes. The persistent parse cache is
+        consulted if it is enabled, and common subexpressions (such as a
+        path prefix) are shared with other fields."""
+        if self._parsed_xpath is None:
+            self._parsed_xpath = ast.intern(persist.parse(self.xpath))
+        return self._parsed_xpath
+
+    @property
+    def eval_xpath(self):
+        """The xpath evaluated to find matching XML: the declared xpath, or
+        its optimized form if the field was created with ``optimize``.
+        Setters still create nodes based on the declared xpath."""
+        if not self.optimize:
+            return self.xpath
+        if self._eval_xpath is None:
+            self._eval_xpath = serialize(optimize_ast(self.parsed_xpath))
+        return self._eval_xpath
+
+    def __getstate__(self):
+        # compiled xpaths can't be copied or pickled; copies compile their own
+        state = self.__dict__.copy()
+        state.update(
+            _evaluators={},
+            _xpaths={},
+            _evaluator_for_context=None,
+            _xpath_for_context=None,
+        )
+        return state
+
     def get_for_node(self, node, context):
+        evaluate = None
+        # compiled xpaths return plain strings, so fields that give the raw
+        # xpath result (lxml smart strings) use lxml
+        if isinstance(self.manager, SingleNodeManager) and not isinstance(
+            self.mapper, NullMapper
+        ):
+            evaluate = self._get_evaluator(context)
+        if evaluate is None:
+            evaluate = self._get_xpath(context)
         return self.manager.get(
-            self.xpath, node, context, self.mapper, self.parsed_xpath
+            self.eval_xpath,
+            node,
+            context,
+            self.mapper,
+            self.parsed_xpath,
+            evaluate=evaluate,
         )
 
+    def _get_prefixes(self):
+        if self._prefixes is None:
+            self._prefixes = sorted(compiler.prefixes(self.parsed_xpath))
+        return self._prefixes
+
+    def _get_evaluator(self, context):
+        """Return a compiled python function equivalent to evaluating the
+        xpath in this context, or None to evaluate it with lxml."""
+        # anything else in the context, such as variables or extension
+        # functions, may change the meaning of the xpath
+        if not compiler.ENABLED:
+            return None
+        last = self._evaluator_for_context
+        if last is not None and last[0] is context:
+            return last[1]
+        if any(key != "namespaces" for key in context):
+            return None
+        namespaces = context.get("namespaces", {})
+        key = tuple(namespaces.get(prefix) for prefix in self._get_prefixes())
+        try:
+            evaluate = self._evaluators[key]
+        except KeyError:
+            if len(self._evaluators) >= XPATH_CACHE_SIZE:
+                self._evaluators.clear()
+            evaluate = compiler.compile_xpath(self.parsed_xpath, namespaces)
+            self._evaluators[key] = evaluate
+        if isinstance(context, FrozenContext):
+            # frozen contexts can't change, so their identity is enough
+            self._evaluator_for_context = (context, evaluate)
+        return evaluate
+
+    def _get_xpath(self, context):
+        """Return a function evaluating the xpath on a node in this context
+        with a compiled :class:`lxml.etree.XPath`, equivalent to
+        ``node.xpath(xpath, **context)``, or None if the context can not be
+        compiled. Compiled xpaths are cached by the namespaces they use;
+        variables in the context are passed when the xpath is called."""
+        last = self._xpath_for_context
+        if last is not None and last[0] is context:
+            return last[1]
+        if "extensions" in context:
+            return None
+        namespaces = context.get("namespaces") or {}
+        smart_strings = context.get("smart_strings", True)
+        prefixes = self._get_prefixes()
+        key = (smart_strings,) + tuple(namespaces.get(prefix) for prefix in prefixes)
+        try:
+            xpath = self._xpaths[key]
+        except KeyError:
+            if len(self._xpaths) >= XPATH_CACHE_SIZE:
+                self._xpaths.clear()
+            xpath = etree.XPath(
+                self.eval_xpath,
+                namespaces=dict(
+                    (prefix, namespaces[prefix])
+                    for prefix in prefixes
+                    if prefix in namespaces
+                ),
+                smart_strings=smart_strings,
+            )
+            self._xpaths[key] = xpath
+        variables = dict(
+            (name, value)
+            for name, value in context.items()
+            if name not in ("namespaces", "smart_strings")
+        )
+        if variables:
+            return functools.partial(xpath, **variables)
+        if isinstance(context, FrozenContext):
+            self._xpath_for_context = (context, xpath)
+        return xpath
+
     def set_for_node(self, node, context, value):
+        document_changed(node)
         return self.manager.set(
-            self.xpath, self.parsed_xpath, node, context, self.mapper, value
+            self.eval_xpath,
+            self.parsed_xpath,
+            node,
+            context,
+            self.mapper,
+            value,
+            evaluate=self._get_xpath(context),
         )
 
     def delete_for_node(self, node, context):
+        document_changed(node)
         return self.manager.delete(
-            self.xpath, self.parsed_xpath, node, context, self.mapper
+            self.eval_xpath,
+            self.parsed_xpath,
+            node,
+            context,
+            self.mapper,
+            evaluate=self._get_xpath(context),
         )
 
     def __repr__(self):
@@ -102,9 +265,319 @@ class Field(object):
         return "<%s.%s>" % (self.__class__.__module__, self.__class__.__name__)
 
 
+#: maximum number of compiled :class:`lxml.etree.XPath` objects, and of
+#: compiled python evaluators, kept by each field, one for each distinct
+#: set of namespaces it is used with
+XPATH_CACHE_SIZE = 8
+
+# xpaths that lxml has compiled without error
+_valid_xpaths = set()
+
+
+def _check_xpath(xpath):
+    # raise an lxml XPathSyntaxError if the xpath is invalid; each distinct
+    # xpath is only compiled once. The compiled xpath is not kept, because
+    # namespaces must be passed in at compile time; fields compile and
+    # cache xpaths for each namespace context they are used in
+    if xpath not in _valid_xpaths:
+        etree.XPath(xpath)
+        _valid_xpaths.add(xpath)
+
+
+def parse_fields(fields):
+    """Parse the xpaths of a collection of fields that have not been parsed
+    yet, parsing each distinct xpath only once."""
+    pending = [field for field in fields if field._parsed_xpath is None]
+    if not pending:
+        return
+    parsed = persist.parse_many([field.xpath for field in pending])
+    interned = {}
+    for field in pending:
+        try:
+            xp_ast = interned[field.xpath]
+        except KeyError:
+            xp_ast = interned[field.xpath] = ast.intern(parsed[field.xpath])
+        field._parsed_xpath = xp_ast
+
+
+# mutation tracking, used by XmlObject instances that cache field values
+
+
+class DocumentState(object):
+    """Mutation counter for an XML document. Every change made to the
+    document through xmlmap fields increments :attr:`generation`, which
+    invalidates field values cached for the document (see
+    :attr:`neuxml.xmlmap.XmlObject.CACHE_FIELD_VALUES`).
+
+    The state also holds the identity map of :class:`XmlObject` instances
+    wrapping elements of the document, for classes that set
+    :attr:`neuxml.xmlmap.XmlObject.REUSE_INSTANCES`."""
+
+    __slots__ = ("root", "generation", "instances", "__weakref__")
+
+    def __init__(self, root):
+        # holding the root element keeps its proxy, and so its id, stable
+        self.root = root
+        self.generation = 0
+        # instances by (element, class); an entry lasts as long as its
+        # instance, which in turn keeps this state alive
+        self.instances = weakref.WeakValueDictionary()
+
+
+class _ReadOnlyDict(dict):
+    # a dictionary that refuses changes, so a context shared between
+    # objects cannot be changed through one of them by mistake
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "shared xmlobject contexts are read-only; "
+            "assign the object a new context instead"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce_ex__(self, protocol):
+        # copies are ordinary dictionaries
+        return (dict, (self.copy(),))
+
+
+def _node_nsmap(node):
+    # namespaces in scope for an element, or for the parent element of an
+    # lxml 'smart' string
+    if hasattr(node, "nsmap"):
+        return node.nsmap
+    parent = node.getparent() if hasattr(node, "getparent") else None
+    return parent.nsmap if parent is not None else {}
+
+
+class FrozenContext(_ReadOnlyDict):
+    """A read-only xpath evaluation context, holding only the namespaces
+    for an element: the prefixed namespaces in scope of the element
+    (:attr:`nsmap`) and the ``ROOT_NAMESPACES`` of the
+    :class:`~neuxml.xmlmap.XmlObject` class wrapping it
+    (:attr:`root_namespaces`).
+
+    Objects created for :class:`NodeField` and :class:`NodeListField`
+    values share one frozen context with their parent whenever the same
+    namespaces apply, and fields cache their compiled xpaths by the
+    identity of a frozen context. Changing the context or its namespaces
+    raises :class:`TypeError`; to change the context of such an object,
+    assign it a new dictionary. :meth:`copy` and :func:`copy.deepcopy`
+    give ordinary dictionaries with a copy of the namespaces, while
+    ``dict(obj.context)`` still shares the read-only namespaces."""
+
+    __slots__ = ("nsmap", "root_namespaces")
+
+    def __init__(self, nsmap, root_namespaces):
+        self.nsmap = nsmap
+        self.root_namespaces = root_namespaces
+        # xpath has no notion of a default namespace - omit any namespace
+        # with no prefix
+        namespaces = dict((prefix, ns) for prefix, ns in nsmap.items() if prefix)
+        namespaces.update(root_namespaces)
+        dict.__init__(self, namespaces=_ReadOnlyDict(namespaces))
+
+    def copy(self):
+        return dict(self, namespaces=dict(self["namespaces"]))
+
+    def for_node(self, node_class, node):
+        """Return the frozen context for an instance of `node_class`
+        wrapping `node`: this context if the same namespaces apply, or a
+        new one."""
+        nsmap = _node_nsmap(node)
+        root_namespaces = getattr(node_class, "ROOT_NAMESPACES", {})
+        if nsmap == self.nsmap and root_namespaces == self.root_namespaces:
+            return self
+        return FrozenContext(nsmap, root_namespaces)
+
+
+# starting point for the frozen contexts of objects whose parent has an
+# ordinary context
+_EMPTY_CONTEXT = FrozenContext({}, {})
+
+
+def _wrap(node_class, node, context):
+    # an instance of node_class wrapping node, sharing the frozen context
+    # of its parent where it applies
+    if not isinstance(context, FrozenContext):
+        context = _EMPTY_CONTEXT
+    return node_class(node, context=context)
+
+
+# states for documents with caching xmlobjects, by id of the root element
+_document_states = weakref.WeakValueDictionary()
+_document_states_lock = threading.Lock()
+
+
+def _document_root(node):
+    if not isinstance(node, etree._Element):
+        # lxml smart string
+        node = node.getparent()
+    return node.getroottree().getroot()
+
+
+def document_state(node):
+    """Return the :class:`DocumentState` for the document containing
+    `node`. A state is kept only while something refers to it."""
+    root = _document_root(node)
+    state = _document_states.get(id(root))
+    if state is not None:
+        return state
+    with _document_states_lock:
+        state = _document_states.get(id(root))
+        if state is None:
+            state = _document_states[id(root)] = DocumentState(root)
+        return state
+
+
+def document_changed(node):
+    """Record that the document containing `node` has changed, so that
+    field values cached for it are computed again. xmlmap setters, deleters
+    and list operations call this automatically; call it after modifying
+    the nodes of such a document directly with lxml."""
+    if not _document_states:
+        return
+    state = _document_states.get(id(_document_root(node)))
+    if state is not None:
+        state.generation += 1
+
+
+def _reused_instance(node_class, node, state=None, context=None):
+    # the instance of node_class wrapping node in the identity map of its
+    # document, created on first use with the parent context
+    key = (node, node_class)
+    if state is None:
+        state = document_state(node)
+    instance = state.instances.get(key)
+    if instance is None:
+        instance = _wrap(node_class, node, context)
+        instance._document_state = state
+        with _document_states_lock:
+            instance = state.instances.setdefault(key, instance)
+    return instance
+
+
 # data mappers to translate between identified xml nodes and Python values
 
 
+# helpers for converting many matched nodes at once, without evaluating
+# an xpath for each of them
+
+_STRING_VALUE = etree.XPath("string()")
+_XML_SPACE = re.compile(r"[ \t\r\n]+")
+_XPATH_NUMBER = re.compile(
+    r"[ \t\r\n]*(-?)([0-9]*)(?:\.([0-9]*))?(?:[eE]([-+]?)([0-9]*))?[ \t\r\n]*\Z"
+)
+# texts of integers short enough to be read exactly as floats, separated
+# by nul characters, which can't occur in xml; negative zero is left out
+# since number() keeps its sign
+_INTEGER = r"[ \t\r\n]*(?:-(?=0*[1-9]))?[0-9]{1,15}[ \t\r\n]*"
+_INTEGER_TEXTS = re.compile(r"%s(?:\x00%s)*\Z" % (_INTEGER, _INTEGER))
+# libxml2 reads at most this many significant fraction digits
+_MAX_FRACTION_DIGITS = 20
+
+
+def _string_value(element):
+    # the xpath string() value of an element; the text of an element
+    # without children is read directly
+    if len(element) or not isinstance(element.tag, str):
+        return _STRING_VALUE(element)
+    return element.text or ""
+
+
+def _normalize_space(value):
+    # as the xpath normalize-space() function; the only ascii whitespace
+    # characters allowed in xml are the ones xpath normalizes
+    if value.isascii():
+        return " ".join(value.split())
+    return _XML_SPACE.sub(" ", value).strip(" ")
+
+
+def _pow10(exponent):
+    try:
+        return 10.0**exponent
+    except OverflowError:
+        return math.inf
+
+
+def _accumulate(digits):
+    # read decimal digits into a float one at a time, rounding after each
+    # one as libxml2 does
+    if len(digits) <= 15:
+        return float(int(digits or 0))
+    value = 0.0
+    for digit in digits:
+        value = value * 10 + (ord(digit) - 48)
+    return value
+
+
+def _xpath_number(value):
+    """Convert a string to a float as the xpath number() function does in
+    libxml2, which does not round long or fractional numbers the same way
+    as :class:`float`."""
+    stripped = value.strip(" \t\r\n")
+    digits = stripped[1:] if stripped[:1] == "-" else stripped
+    if 0 < len(digits) <= 15 and digits.isascii() and digits.isdigit():
+        # short integers are read exactly either way
+        return float(stripped)
+    match = _XPATH_NUMBER.match(value)
+    if match is None:
+        return math.nan
+    sign, digits, fraction, exponent_sign, exponent = match.groups()
+    if not digits and not fraction:
+        return math.nan
+    number = _accumulate(digits)
+    if fraction:
+        significant = fraction.lstrip("0")
+        zeros = len(fraction) - len(significant)
+        significant = significant[:_MAX_FRACTION_DIGITS]
+        number += _accumulate(significant) / _pow10(zeros + len(significant))
+    if sign:
+        number = -number
+    # libxml2 stops reading exponents at about a million
+    exponent = int((exponent or "0")[:8] or 0)
+    if exponent_sign == "-":
+        exponent = -exponent
+    return number * _pow10(exponent)
+
+
+def _integer_texts(nodes):
+    # the string values of the nodes as one string of integers separated
+    # by whitespace, if every node is an element whose value is a short
+    # integer; otherwise None
+    texts = []
+    for node in nodes:
+        if not isinstance(node, etree._Element):
+            return None
+        texts.append(_string_value(node))
+    texts = "\x00".join(texts)
+    if not _INTEGER_TEXTS.match(texts):
+        return None
+    return texts.replace("\x00", " ")
+
+
+# string() results are lxml smart strings without a parent
+_smart_string = etree._ElementUnicodeResult
+
+
+def _number_values(nodes):
+    # xpath number() values of matched elements, or None for any other
+    # matches, such as attribute values, which mappers convert themselves
+    values = []
+    for node in nodes:
+        if not isinstance(node, etree._Element):
+            values.append(None)
+        else:
+            values.append(_xpath_number(_string_value(node)))
+    return values
+
+
 class Mapper(object):
     # generic mapper to_xml function
     def to_xml(self, value):
@@ -113,11 +586,17 @@ class Mapper(object):
         else:
             return str(value)
 
+    def to_python_list(self, nodes):
+        """Convert a list of matched nodes to Python values; list fields
+        use this to convert all of their matches at once."""
+        return [self.to_python(node) for node in nodes]
+
 
 class StringMapper(Mapper):
     XPATH = etree.XPath("string()")
 
     def __init__(self, normalize=False):
+        self.normalize = normalize
         if normalize:
             self.XPATH = etree.XPath("normalize-space(string())")
 
@@ -128,6 +607,20 @@ class StringMapper(Mapper):
             return node
         return self.XPATH(node)
 
+    def to_python_list(self, nodes):
+        if type(self).to_python is not StringMapper.to_python:
+            # a subclass converting values its own way
+            return super(StringMapper, self).to_python_list(nodes)
+        values = []
+        for node in nodes:
+            if node is None or isinstance(node, str):
+                values.append(node)
+            elif self.normalize:
+                values.append(_smart_string(_normalize_space(_string_value(node))))
+            else:
+                values.append(_smart_string(_string_value(node)))
+        return values
+
 
 class IntegerMapper(Mapper):
     XPATH = etree.XPath("number()")
@@ -145,6 +638,21 @@ class IntegerMapper(Mapper):
             # anything that can't be converted to an Integer
             return None
 
+    def to_python_list(self, nodes):
+        if type(self).to_python is not IntegerMapper.to_python:
+            # a subclass converting values its own way
+            return super(IntegerMapper, self).to_python_list(nodes)
+        values = []
+        for node, number in zip(nodes, _number_values(nodes)):
+            if number is None:
+                values.append(self.to_python(node))
+                continue
+            try:
+                values.append(int(number))
+            except ValueError:
+                values.append(None)
+        return values
+
 
 class FloatMapper(Mapper):
     XPATH = etree.XPath("number()")
@@ -161,6 +669,15 @@ class FloatMapper(Mapper):
             # anything that can't be converted to an Float
             return None
 
+    def to_python_list(self, nodes):
+        if type(self).to_python is not FloatMapper.to_python:
+            # a subclass converting values its own way
+            return super(FloatMapper, self).to_python_list(nodes)
+        return [
+            self.to_python(node) if number is None else number
+            for node, number in zip(nodes, _number_values(nodes))
+        ]
+
 
 class SimpleBooleanMapper(Mapper):
     XPATH = etree.XPath("string()")
@@ -202,11 +719,82 @@ class SimpleBooleanMapper(Mapper):
             return None
 
 
+# date and time parsing: strptime is slow, so canonical ISO-8601 values
+# are read with fromisoformat, and values in other simple numeric formats
+# with a regular expression compiled once per format; anything these
+# don't match is left to strptime, which accepts some looser forms
+
+_ISO_DATETIME = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}T(?:[01][0-9]|2[0-3]):[0-9]{2}:[0-9]{2}"
+    r"(?:\.[0-9]{3}(?:[0-9]{3})?)?\Z"
+)
+_ISO_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}\Z")
+_FORMAT_DIRECTIVE = re.compile(r"%(.)")
+# patterns for the strptime directives a format parser handles, matching
+# only the zero-padded forms
+_DIRECTIVE_PATTERNS = {
+    "Y": "[0-9]{4}",
+    "m": "[0-9]{2}",
+    "d": "[0-9]{2}",
+    "H": "[0-9]{2}",
+    "M": "[0-9]{2}",
+    "S": "[0-9]{2}",
+    "f": "[0-9]{1,6}",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _format_pattern(format):
+    # a regular expression for a strptime format made up of the directives
+    # in _DIRECTIVE_PATTERNS and literal text, or None for other formats
+    pattern = []
+    seen = set()
+    position = 0
+    for match in _FORMAT_DIRECTIVE.finditer(format):
+        pattern.append(re.escape(format[position : match.start()]))
+        position = match.end()
+        directive = match.group(1)
+        if directive == "%":
+            pattern.append("%")
+        elif directive in _DIRECTIVE_PATTERNS and directive not in seen:
+            seen.add(directive)
+            pattern.append("(?P<%s>%s)" % (directive, _DIRECTIVE_PATTERNS[directive]))
+        else:
+            return None
+    if "%" in format[position:]:
+        return None
+    pattern.append(re.escape(format[position:]))
+    return re.compile("".join(pattern) + r"\Z")
+
+
+def _parse_datetime(rep, format):
+    # datetime.strptime(rep, format), without strptime for common formats
+    pattern = _format_pattern(format)
+    match = pattern.match(rep) if pattern is not None else None
+    if match is not None:
+        values = match.groupdict()
+        try:
+            return datetime(
+                int(values.get("Y", 1900)),
+                int(values.get("m", 1)),
+                int(values.get("d", 1)),
+                int(values.get("H", 0)),
+                int(values.get("M", 0)),
+                int(values.get("S", 0)),
+                int(values.get("f", "0").ljust(6, "0")),
+            )
+        except ValueError:
+            # let strptime decide how to report it
+            pass
+    return datetime.strptime(rep, format)
+
+
 class DateTimeMapper(object):
     XPATH = etree.XPath("string()")
 
     def __init__(self, format=None, normalize=False):
         self.format = format
+        self.normalize = normalize
         if normalize:
             self.XPATH = etree.XPath("normalize-space(string())")
 
@@ -217,13 +805,33 @@ class DateTimeMapper(object):
             rep = node
         else:
             rep = self.XPATH(node)
+        return self._parse(rep)
+
+    def to_python_list(self, nodes):
+        if type(self).to_python is not DateTimeMapper.to_python:
+            # a subclass converting values its own way
+            return [self.to_python(node) for node in nodes]
+        values = []
+        for node in nodes:
+            if node is None or isinstance(node, str):
+                values.append(self.to_python(node))
+                continue
+            rep = _string_value(node)
+            if self.normalize:
+                rep = _normalize_space(rep)
+            values.append(self._parse(rep))
+        return values
+
+    def _parse(self, rep):
         if rep.endswith("Z"):  # strip Z
             rep = rep[:-1]
-        if rep[-6] in "+-":  # strip tz
+        if len(rep) >= 6 and rep[-6] in "+-":  # strip tz
             rep = rep[:-6]
 
         if self.format is not None:
-            dt = datetime.strptime(rep, self.format)
+            dt = _parse_datetime(rep, self.format)
+        elif _ISO_DATETIME.match(rep):
+            dt = datetime.fromisoformat(rep)
         else:
             try:
                 dt = datetime.strptime(rep, "%Y-%m-%dT%H:%M:%S")
@@ -255,9 +863,15 @@ class DateMapper(DateTimeMapper):
         elif hasattr(node, "text"):
             rep = node.text
 
-        dt = datetime.strptime(rep, self.format)
+        if self.format == "%Y-%m-%d" and _ISO_DATE.match(rep):
+            return date.fromisoformat(rep)
+        dt = _parse_datetime(rep, self.format)
         return date(dt.year, dt.month, dt.day)
 
+    def to_python_list(self, nodes):
+        # dates are read from element text, without xpath
+        return [self.to_python(node) for node in nodes]
+
 
 class NullMapper(object):
     def to_python(self, node):
@@ -268,10 +882,42 @@ class NodeMapper(object):
     def __init__(self, node_class):
         self.node_class = node_class
 
-    def to_python(self, node):
+    # the context of the parent object is passed on, and shared with the
+    # new object if the same namespaces apply to it
+
+    def to_python(self, node, context=None):
         if node is None:
             return None
-        return self.node_class(node)
+        if getattr(self.node_class, "REUSE_INSTANCES", False) and isinstance(
+            node, etree._Element
+        ):
+            return _reused_instance(self.node_class, node, context=context)
+        return _wrap(self.node_class, node, context)
+
+    def to_python_list(self, nodes, context=None):
+        if type(self).to_python is not NodeMapper.to_python:
+            # a subclass converting values its own way
+            return [self.to_python(node) for node in nodes]
+        node_class = self.node_class
+        reuse = getattr(node_class, "REUSE_INSTANCES", False)
+        values = []
+        state = None
+        for node in nodes:
+            if node is None:
+                values.append(None)
+                continue
+            if reuse and isinstance(node, etree._Element):
+                # matched nodes share a document, so look up its state once
+                if state is None:
+                    state = document_state(node)
+                value = _reused_instance(node_class, node, state, context)
+            else:
+                value = _wrap(node_class, node, context)
+            # siblings usually share the context of the first of them
+            if isinstance(getattr(value, "context", None), FrozenContext):
+                context = value.context
+            values.append(value)
+        return values
 
     def to_xml(self, xmlobject):
         if xmlobject:
@@ -290,9 +936,12 @@ def _find_terminal_step(xast):
     return None
 
 
-def _find_xml_node(xpath, node, context):
+def _find_xml_node(xpath, node, context, evaluate=None):
     # In some cases the this will return a value not a node
-    matches = node.xpath(xpath, **context)
+    if evaluate is not None:
+        matches = evaluate(node)
+    else:
+        matches = node.xpath(xpath, **context)
     if matches and isinstance(matches, list):
         return matches[0]
     elif matches:
@@ -429,6 +1078,8 @@ def _set_in_xml(node, val, context, step):
     # node could be either an element or an attribute
     if isinstance(node, etree._Element):  # if it's an element
         if isinstance(val, etree._Element):
+            # the children of val are moved out of its document
+            document_changed(val)
             # remove node children and graft val children in.
             node.clear()
             node.text = val.text
@@ -551,13 +1202,14 @@ def _remove_predicates(xast, node, context):
     :param context: any context required for the xpath (e.g.,
         namespace definitions)
 
-    :returns: updated a copy of the xast without the predicates that
+    :returns: the xast, or a new step without the predicates that
         were successfully removed
     """
-    # work from a copy since it may be modified
-    xast_c = deepcopy(xast)
+    # parsed xpaths are shared and must not be modified; collect the
+    # predicates to keep and build a new step
+    remaining = list(xast.predicates)
     # check if predicates are constructable
-    for pred in list(xast_c.predicates):
+    for pred in xast.predicates:
         # ignore predicates that we can't construct
         if not _predicate_is_constructible(pred):
             continue
@@ -575,10 +1227,10 @@ def _remove_predicates(xast, node, context):
                     if pred.left.axis in ("@", "attribute"):
                         if _remove_attribute_node(node, context, pred.left):
                             # remove from the xast
-                            xast_c.predicates.remove(pred)
+                            remaining.remove(pred)
                     elif pred.left.axis in (None, "child"):
                         if _remove_child_node(node, context, pred.left, if_empty=True):
-                            xast_c.predicates.remove(pred)
+                            remaining.remove(pred)
 
                 elif isinstance(pred.left, ast.BinaryExpression):
                     # e.g., level/@id='b' or level/deep='deeper'
@@ -586,7 +1238,9 @@ def _remove_predicates(xast, node, context):
                     # so just remove the multipart path
                     _remove_xml(pred.left, node, context, if_empty=True)
 
-    return xast_c
+    if len(remaining) == len(xast.predicates):
+        return xast
+    return ast.Step(xast.axis, xast.node_test, remaining)
 
 
 def _empty_except_predicates(xast, node, context):
@@ -641,6 +1295,16 @@ def _is_text_nodetest(step):
     return False
 
 
+def _is_element_step(step):
+    """Check if a step selects child elements by name, so that new nodes
+    for it can be created as sibling elements."""
+    return (
+        isinstance(step, ast.Step)
+        and step.axis in (None, "child")
+        and isinstance(step.node_test, ast.NameTest)
+    )
+
+
 # managers to map operations to either a single identified node or a
 # list of them
 
@@ -651,16 +1315,19 @@ class SingleNodeManager(object):
         # described in XmlObjectType.__new__ comments and used by NodeField.
         self.instantiate_on_get = instantiate_on_get
 
-    def get(self, xpath, node, context, mapper, xast):
-        match = _find_xml_node(xpath, node, context)
+    def get(self, xpath, node, context, mapper, xast, evaluate=None):
+        match = _find_xml_node(xpath, node, context, evaluate)
         if match is None and self.instantiate_on_get:
-            return mapper.to_python(_create_xml_node(xast, node, context))
+            document_changed(node)
+            match = _create_xml_node(xast, node, context)
         # else, non-None match, or not instantiate
+        if isinstance(mapper, NodeMapper):
+            return mapper.to_python(match, context)
         return mapper.to_python(match)
 
-    def set(self, xpath, xast, node, context, mapper, value):
+    def set(self, xpath, xast, node, context, mapper, value, evaluate=None):
         xvalue = mapper.to_xml(value)
-        match = _find_xml_node(xpath, node, context)
+        match = _find_xml_node(xpath, node, context, evaluate)
 
         if xvalue is None:
             # match must be None. if it exists, delete it.
@@ -679,16 +1346,16 @@ class SingleNodeManager(object):
             step = _find_terminal_step(xast)
             _set_in_xml(match, xvalue, context, step)
 
-    def create(self, xpath, xast, node, context):
+    def create(self, xpath, xast, node, context, evaluate=None):
         # most clients will want to use get() or set(), but occasially we
         # just want a basic node to match the xpath.
-        match = _find_xml_node(xpath, node, context)
+        match = _find_xml_node(xpath, node, context, evaluate)
         if match is not None:
             return match
         return _create_xml_node(xast, node, context)
 
-    def delete(self, xpath, xast, node, context, mapper):
-        match = _find_xml_node(xpath, node, context)
+    def delete(self, xpath, xast, node, context, mapper, evaluate=None):
+        match = _find_xml_node(xpath, node, context, evaluate)
         # match must be None. if it exists, delete it.
         if match is not None:
             _remove_xml(xast, node, context)
@@ -703,7 +1370,10 @@ class NodeList(object):
 
     Supports common list functions and operators, including the following: len();
     **in**; equal and not equal comparison to standard python Lists.  Items can
-    be retrieved, set, and deleted by index, but slice indexing is not supported.
+    be retrieved, set, and deleted by index or by slice; retrieving a slice
+    returns a list of values, and only the nodes in the slice are selected and
+    converted.  :meth:`iter_window` iterates over part of a long list a few
+    items at a time.
     Supports the methods that Python documentation indicates should be provided
     by Mutable sequences, with the exceptions of reverse and sort; in the
     particular case of :class:`NodeListField`, it is unclear how a list of
@@ -717,18 +1387,25 @@ class NodeList(object):
     for schema validity, extra care may be required when constructing content.
     """
 
-    def __init__(self, xpath, node, context, mapper, xast):
+    # number of matches converted at a time when iterating over the list
+    _chunk_size = 100
+
+    def __init__(self, xpath, node, context, mapper, xast, evaluate=None):
         self.xpath = xpath
         self.node = node
         self.context = context
         self.mapper = mapper
         self.xast = xast
+        # compiled xpath supplied by the field, if any
+        self.evaluate = evaluate
 
     @property
     def matches(self):
         # current matches from the xml tree
         # NOTE: retrieving from the xml every time rather than caching
         # because the xml document could change, and we want the latest data
+        if self.evaluate is not None:
+            return self.evaluate(self.node)
         return self.node.xpath(self.xpath, **self.context)
 
     def is_empty(self):
@@ -737,10 +1414,25 @@ class NodeList(object):
         list is empty."""
         return all(n.is_empty() for n in self)
 
+    def _to_python(self, match):
+        # convert one match; xmlobjects are given the context of the list
+        if isinstance(self.mapper, NodeMapper):
+            return self.mapper.to_python(match, self.context)
+        return self.mapper.to_python(match)
+
+    def _convert(self, matches):
+        # convert matches to python values, all at once if the mapper
+        # supports it
+        if isinstance(self.mapper, NodeMapper):
+            return self.mapper.to_python_list(matches, self.context)
+        if hasattr(self.mapper, "to_python_list"):
+            return self.mapper.to_python_list(matches)
+        return [self._to_python(match) for match in matches]
+
     @property
     def data(self):
         # data in list form - basis for several other list-y functions
-        return [self.mapper.to_python(match) for match in self.matches]
+        return self._convert(self.matches)
 
     def __str__(self):
         return str(self.data)
@@ -749,14 +1441,26 @@ class NodeList(object):
         return str(self.data)
 
     def __len__(self):
-        return len(self.data)
+        # count the matches without mapping them to python values
+        return len(self.matches)
 
     def __contains__(self, item):
-        return item in self.data
+        return any(value == item for value in self)
 
     def __iter__(self):
-        for item in self.matches:
-            yield self.mapper.to_python(item)
+        # convert a few matches at a time, so that stopping early, as for
+        # ``in`` or is_empty, does not convert the whole list
+        matches = self.matches
+        size = self._chunk_size
+        for start in range(0, len(matches), size):
+            chunk = matches[start : start + size]
+            try:
+                values = self._convert(chunk)
+            except Exception:
+                # convert one at a time, to give the values before the
+                # one that cannot be converted
+                values = map(self._to_python, chunk)
+            yield from values
 
     def __eq__(self, other):
         # FIXME: is any other comparison possible ?
@@ -769,47 +1473,253 @@ class NodeList(object):
         # check argument type for getitem, setitem, delitem
         if not isinstance(key, (slice, int)):
             raise TypeError
-        assert not isinstance(key, slice), "Slice indexing is not supported"
 
-    def __getitem__(self, key):
-        self._check_key_type(key)
-        return self.mapper.to_python(self.matches[key])
+    def _window(self, start, stop=None):
+        # matches from index start up to stop, selected with a positional
+        # xpath so that lxml only returns the nodes in the window
+        if stop is not None and stop <= start:
+            return []
+        positions = []
+        if start > 0:
+            positions.append("position() > %d" % start)
+        if stop is not None:
+            positions.append("position() <= %d" % stop)
+        if not positions:
+            return self.matches
+        xpath = "(%s)[%s]" % (self.xpath, " and ".join(positions))
+        return self.node.xpath(xpath, **self.context)
+
+    def _slice_matches(self, key):
+        # matches selected by a slice; the list is only counted if the
+        # slice has negative indices
+        if key.step is not None and key.step < 1:
+            return self.matches[key]
+        start, stop = key.start, key.stop
+        if (start is not None and start < 0) or (stop is not None and stop < 0):
+            start, stop, _step = key.indices(len(self))
+        return self._window(start or 0, stop)[:: key.step]
 
-    def __setitem__(self, key, value):
+    def __getitem__(self, key):
         self._check_key_type(key)
-        if key == len(self.matches):
-            # just after the end of the list - create a new node
-            if len(self.matches):
-                # if there are existing nodes, use last element in list
-                # to determine where the new node should be created
-                last_item = self.matches[-1]
-                position = last_item.getparent().index(last_item)
-                insert_index = position + 1
-            else:
-                insert_index = None
-            match = _create_xml_node(self.xast, self.node, self.context, insert_index)
-        elif key > len(self.matches):
-            raise IndexError("Can't set at index %d - out of range" % key)
-        else:
-            match = self.matches[key]
-
+        if isinstance(key, slice):
+            return self._convert(self._slice_matches(key))
+        return self._to_python(self.matches[key])
+
+    def iter_window(self, start=0, stop=None, size=100):
+        """Generate the values of the list from index `start` up to `stop`,
+        as in ``list[start:stop]``, selecting and converting `size` nodes at
+        a time.  Negative indices count from the end of the list.  Useful
+        for paging through very long lists, such as the components of a
+        large finding aid, without converting every item."""
+        # checked here rather than when the generator starts
+        if size < 1:
+            raise ValueError("iter_window size must be at least 1")
+        return self._iter_window(start, stop, size)
+
+    def _iter_window(self, start, stop, size):
+        if start < 0 or (stop is not None and stop < 0):
+            start, stop, _step = slice(start, stop).indices(len(self))
+        while stop is None or start < stop:
+            end = start + size
+            if stop is not None:
+                end = min(end, stop)
+            matches = self._window(start, end)
+            yield from self._convert(matches)
+            if len(matches) < end - start:
+                break
+            start = end
+
+    # Each operation evaluates the xpath once and works from that snapshot
+    # of the matching nodes; the helpers below take the snapshot as an
+    # argument rather than evaluating the xpath again.
+
+    def _check_numeric(self):
+        if not isinstance(self.mapper, (IntegerMapper, FloatMapper)):
+            raise TypeError("Only integer and float lists can be read as numbers")
+
+    def _numbers(self, matches):
+        # the values of an integer or float list as floats read as the
+        # xpath number() function reads them, with nan for missing values
+        numbers = _number_values(matches)
+        for i, number in enumerate(numbers):
+            if number is None:
+                # attribute values and other strings
+                value = self.mapper.to_python(matches[i])
+                numbers[i] = math.nan if value is None else float(value)
+        return numbers
+
+    def to_array(self):
+        """Return the values of an integer or float list as an
+        :class:`array.array` of signed 64-bit integers (type code ``q``)
+        or doubles (``d``), without converting each value to a Python
+        object through the mapper.  Missing values in a float list are
+        NaN; an integer list raises :class:`ValueError` if any value is
+        not a number.  Does not require numpy."""
+        self._check_numeric()
+        numbers = self._numbers(self.matches)
+        if isinstance(self.mapper, FloatMapper):
+            return array("d", numbers)
+        if not all(math.isfinite(number) for number in numbers):
+            raise ValueError("Integer list has values that are not numbers")
+        return array("q", [int(number) for number in numbers])
+
+    def to_numpy(self, dtype=None):
+        """Return the values of an integer or float list as a numpy array,
+        of ``int64`` for an integer list and ``float64`` for a float list,
+        unless another `dtype` is specified.  Values are read as in
+        :meth:`to_array`; an integer list read as floats has NaN for
+        missing values instead of raising :class:`ValueError`, as does
+        any list read as integers.  Requires numpy."""
+        # numpy is optional, and only imported when it is used
+        import numpy
+
+        self._check_numeric()
+        matches = self.matches
+        texts = _integer_texts(matches)
+        if texts is not None:
+            # all of the values are integers; parse them in one go
+            numbers = numpy.fromstring(texts, dtype=numpy.int64, sep=" ")
+            if dtype is None and isinstance(self.mapper, FloatMapper):
+                dtype = numpy.float64
+            return numbers if dtype is None else numbers.astype(dtype)
+
+        numbers = numpy.array(self._numbers(matches), dtype=numpy.float64)
+        if isinstance(self.mapper, IntegerMapper):
+            # integer values are truncated, as int() does
+            numbers = numpy.trunc(numbers)
+            if dtype is None:
+                dtype = numpy.int64
+        if dtype is None:
+            return numbers
+        if numpy.issubdtype(dtype, numpy.integer) and not numpy.isfinite(numbers).all():
+            raise ValueError("List has values that are not numbers")
+        return numbers.astype(dtype)
+
+    def _create_after(self, matches, insert_index=None):
+        # create a new node for the list, by default just after the last
+        # existing match, and return it
+        document_changed(self.node)
+        if insert_index is None and matches:
+            # if there are existing nodes, use last element in list
+            # to determine where the new node should be created
+            last_item = matches[-1]
+            insert_index = last_item.getparent().index(last_item) + 1
+        return _create_xml_node(self.xast, self.node, self.context, insert_index)
+
+    def _set_match(self, match, value):
+        # set the value of a single matched node
+        document_changed(self.node)
         if isinstance(self.mapper, NodeMapper):
             # if this is a NodeListField, the value should be an xmlobject
             # replace the indexed node with the node specified
             # NOTE: lxml does not require dom-style import before append/replace
+            # the node is moved out of its current document
+            document_changed(value.node)
             match.getparent().replace(match, value.node)
         else:  # not a NodeListField - set single-node value in xml
             # terminal (rightmost) step informs how we update the xml
             step = _find_terminal_step(self.xast)
             _set_in_xml(match, self.mapper.to_xml(value), self.context, step)
 
+    def _set_matches(self, matches, values):
+        # set the values of several matched nodes in one pass
+        if isinstance(self.mapper, NodeMapper):
+            for match, value in zip(matches, values):
+                self._set_match(match, value)
+            return
+        if matches:
+            document_changed(self.node)
+        step = _find_terminal_step(self.xast)
+        for match, value in zip(matches, values):
+            _set_in_xml(match, self.mapper.to_xml(value), self.context, step)
+
+    def _remove_match(self, match):
+        document_changed(self.node)
+        match.getparent().remove(match)
+
+    def _remove_matches(self, matches):
+        # remove several matched nodes in one sweep
+        if matches:
+            document_changed(self.node)
+            for match in matches:
+                match.getparent().remove(match)
+
+    def _replace(self, matches, start, stop, values):
+        # replace the matches from index start up to stop with values:
+        # reuse the existing nodes in order, add nodes for any extra values
+        # in bulk just after them and remove any extra nodes
+        window = matches[start:stop]
+        insert_index = None
+        if window:
+            after = window
+        else:
+            after = matches
+            if start < len(matches):
+                # nothing to replace; add the values before the next
+                # match, as insert does
+                insert_index = self._insert_index(matches[start])
+        if isinstance(self.mapper, NodeMapper):
+            nodes = {value.node for value in values}
+            if any(match in nodes for match in window):
+                # some of the xmlobjects are already in the window, so they
+                # can't be swapped in one at a time; splice them all in
+                # after the window and remove the rest
+                if values:
+                    self._insert_values(after, values, insert_index)
+                self._remove_matches([match for match in window if match not in nodes])
+                return
+        self._set_matches(window, values)
+        if len(values) > len(window):
+            if window and isinstance(self.mapper, NodeMapper):
+                # the matches have been replaced by the xmlobject nodes
+                after = [value.node for value in values[: len(window)]]
+            self._insert_values(after, values[len(window) :], insert_index)
+        else:
+            self._remove_matches(window[len(values) :])
+
+    def _set_values(self, values):
+        # set the whole list
+        matches = self.matches
+        self._replace(matches, 0, len(matches), values)
+
+    def _set_slice(self, key, values):
+        values = list(values)
+        matches = self.matches
+        indices = range(*key.indices(len(matches)))
+        if key.step is None or key.step == 1:
+            self._replace(matches, indices.start, indices.stop, values)
+            return
+        if len(values) != len(indices):
+            raise ValueError(
+                "attempt to assign sequence of size %d to extended slice of size %d"
+                % (len(values), len(indices))
+            )
+        self._set_matches([matches[i] for i in indices], values)
+
+    def __setitem__(self, key, value):
+        self._check_key_type(key)
+        if isinstance(key, slice):
+            self._set_slice(key, value)
+            return
+        matches = self.matches
+        if key == len(matches):
+            # just after the end of the list - create a new node
+            match = self._create_after(matches)
+        elif key > len(matches):
+            raise IndexError("Can't set at index %d - out of range" % key)
+        else:
+            match = matches[key]
+        self._set_match(match, value)
+
     def __delitem__(self, key):
         self._check_key_type(key)
-        if key >= len(self.matches):
+        matches = self.matches
+        if isinstance(key, slice):
+            self._remove_matches(matches[key])
+            return
+        if key >= len(matches):
             raise IndexError("Can't delete at index %d - out of range" % key)
-
-        match = self.matches[key]
-        match.getparent().remove(match)
+        self._remove_match(matches[key])
 
     # according to python docs, Mutable sequences should provide the following methods:
     # append, count, index, extend, insert, pop, remove, reverse and sort
@@ -817,71 +1727,117 @@ class NodeList(object):
 
     def count(self, x):
         "Return the number of times x appears in the list."
-        return self.data.count(x)
+        return sum(1 for value in self if value == x)
 
     def append(self, x):
         "Add an item to the end of the list."
-        self[len(self)] = x
+        self._set_match(self._create_after(self.matches), x)
+
+    def _find(self, matches, x):
+        # index of the first match whose value is x
+        for i, match in enumerate(matches):
+            if self._to_python(match) == x:
+                return i
+        raise ValueError("%r is not in list" % (x,))
 
     def index(self, x):
         """Return the index in the list of the first item whose value is x,
         or error if there is no such item."""
-        return self.data.index(x)
+        return self._find(self.matches, x)
 
     def remove(self, x):
         """Remove the first item from the list whose value is x,
         or error if there is no such item."""
-        del self[self.index(x)]
+        matches = self.matches
+        self._remove_match(matches[self._find(matches, x)])
 
     def pop(self, i=None):
         """Remove the item at the given position in the list, and return it.
         If no index is specified, removes and returns the last item in the list."""
+        matches = self.matches
         if i is None:
-            i = len(self) - 1
-        val = self[i]
-        del self[i]
+            i = len(matches) - 1
+        match = matches[i]
+        val = self._to_python(match)
+        self._remove_match(match)
         return val
 
+    def _insert_index(self, match):
+        # index of a match in its parent, for adding nodes just before it
+        if not _is_element_step(_find_terminal_step(self.xast)):
+            # attribute and text values have no position of their own
+            raise TypeError("Only lists of elements support inserting before an item")
+        return match.getparent().index(match)
+
+    def _insert_values(self, matches, values, insert_index=None):
+        # add nodes for several values at once: the first node is created
+        # just as for a single item, and the rest are spliced in next to it
+        # with a single operation on its parent
+        if len(values) == 1:
+            self._set_match(self._create_after(matches, insert_index), values[0])
+            return
+        step = _find_terminal_step(self.xast)
+        if not _is_element_step(step):
+            # attributes and text nodes are set on their parent node one
+            # at a time, and can only be added at the end
+            if insert_index is not None:
+                raise TypeError(
+                    "Only lists of elements support inserting before an item"
+                )
+            for value in values:
+                self.append(value)
+            return
+
+        first = self._create_after(matches, insert_index)
+        parent = first.getparent()
+        position = parent.index(first)
+        if isinstance(self.mapper, NodeMapper):
+            # replace the new node with the nodes of the xmlobjects; as in
+            # _set_match, they are moved out of their current documents
+            for value in values:
+                document_changed(value.node)
+            parent[position : position + 1] = [value.node for value in values]
+        else:
+            # copy the new node, including anything created for the
+            # predicates in the xpath, then set the values
+            nodes = [first] + [deepcopy(first) for value in values[1:]]
+            parent[position + 1 : position + 1] = nodes[1:]
+            for node, value in zip(nodes, values):
+                _set_in_xml(node, self.mapper.to_xml(value), self.context, step)
+
     def extend(self, list):
         """Extend the list by appending all the items in the given list."""
-        for item in list:
-            self.append(item)
+        values = [item for item in list]
+        if values:
+            self._insert_values(self.matches, values)
 
     def insert(self, i, x):
         """Insert an item (x) at a given position (i)."""
-        if i == len(self):  # end of list or empty list: append
-            self.append(x)
-        elif len(self.matches) > i:
+        matches = self.matches
+        if i == len(matches):  # end of list or empty list: append
+            insert_index = None
+        elif len(matches) > i:
             # create a new xml node at the requested position
-            insert_index = self.matches[i].getparent().index(self.matches[i])
-            _create_xml_node(self.xast, self.node, self.context, insert_index)
-            # then use default set logic
-            self[i] = x
+            insert_index = self._insert_index(matches[i])
         else:
             raise IndexError(
                 "Can't insert '%s' at index %d - list length is only %d"
-                % (x, i, len(self))
+                % (x, i, len(matches))
             )
+        self._insert_values(matches, [x], insert_index)
 
 
 class NodeListManager(object):
-    def get(self, xpath, node, context, mapper, xast):
-        return NodeList(xpath, node, context, mapper, xast)
-
-    def delete(self, xpath, xast, node, context, mapper):
-        current_list = self.get(xpath, node, context, mapper, xast)
-        [current_list.remove(x) for x in current_list]
+    def get(self, xpath, node, context, mapper, xast, evaluate=None):
+        return NodeList(xpath, node, context, mapper, xast, evaluate)
 
-    def set(self, xpath, xast, node, context, mapper, value):
-        current_list = self.get(xpath, node, context, mapper, xast)
-        # for each value in the new list, set the equivalent value
-        # in the NodeList
-        for i in range(len(value)):
-            current_list[i] = value[i]
+    def delete(self, xpath, xast, node, context, mapper, evaluate=None):
+        current_list = self.get(xpath, node, context, mapper, xast, evaluate)
+        current_list._remove_matches(current_list.matches)
 
-        # remove any extra values from end of the current list
-        while len(current_list) > len(value):
-            current_list.pop()
+    def set(self, xpath, xast, node, context, mapper, value, evaluate=None):
+        current_list = self.get(xpath, node, context, mapper, xast, evaluate)
+        current_list._set_values(list(value))
 
 
 # finished field classes mixing a manager and a mapper
@@ -1177,7 +2133,14 @@ class NodeField(Field):
     node_class = property(_get_node_class, _set_node_class)
 
     def create_for_node(self, node, context):
-        return self.manager.create(self.xpath, self.parsed_xpath, node, context)
+        document_changed(node)
+        return self.manager.create(
+            self.eval_xpath,
+            self.parsed_xpath,
+            node,
+            context,
+            evaluate=self._get_xpath(context),
+        )
 
 
 class NodeListField(Field):
@@ -0,0 +1,361 @@
+# file neuxml/xmlmap/streaming.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Match XPath expressions against a document while it is being parsed.
+
+Loading a document into an :class:`~neuxml.xmlmap.XmlObject` builds the
+whole tree in memory, which is not practical for very large files such as
+a CERP email account or a large EAD. A :class:`StreamMatcher` instead
+matches a set of xpaths against the start and end events of
+:func:`lxml.etree.iterparse`, keeping a stack of partially matched paths
+for the elements currently open. Elements are discarded once they have
+ended, unless they are part of a match that is still in progress, so
+memory use depends on the depth of the document and the size of the
+matched elements rather than on the size of the document.
+
+Only a subset of XPath can be matched this way. Supported expressions are
+paths of child element steps, separated by ``/`` or ``//``, optionally
+ending in an attribute or ``text()`` step. Element steps may have
+predicates testing for an attribute (``[@type]``) or comparing an
+attribute with a string literal (``[@type='series']``). Absolute paths
+(``/e:ead/e:eadheader``, ``//e:c02``) are matched from the document;
+relative paths (``e:archdesc/e:did``, ``.//e:unittitle``) are matched from
+the root element, as :mod:`~neuxml.xmlmap` fields are.
+
+:func:`iterobjects` and :func:`iterfields` use a matcher to read
+:class:`~neuxml.xmlmap.XmlObject` instances or field values from a file.
+"""
+
+from copy import deepcopy
+
+from lxml import etree
+
+from neuxml.xmlmap.fields import SingleNodeManager
+from neuxml.xpath import ast
+from neuxml.xpath.core import parse
+
+__all__ = ["StreamMatcher", "iterobjects", "iterfields"]
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _clark_name(name_test, namespaces, attribute=False):
+    if name_test.name == "*":
+        if attribute or name_test.prefix is not None:
+            raise _Unsupported()
+        return None
+    if name_test.prefix is None:
+        return name_test.name
+    try:
+        return "{%s}%s" % (namespaces[name_test.prefix], name_test.name)
+    except KeyError:
+        raise _Unsupported()
+
+
+def _attribute_step(step, namespaces):
+    # name of the attribute selected by a bare @name step, or None
+    if (
+        isinstance(step, ast.Step)
+        and step.axis in ("@", "attribute")
+        and isinstance(step.node_test, ast.NameTest)
+        and not step.predicates
+    ):
+        return _clark_name(step.node_test, namespaces, attribute=True)
+    return None
+
+
+def _is_text_step(step):
+    return (
+        isinstance(step, ast.Step)
+        and step.axis in (None, "child")
+        and isinstance(step.node_test, ast.NodeType)
+        and step.node_test.name == "text"
+        and not step.predicates
+    )
+
+
+def _attribute_test(pred, namespaces):
+    # (name, value) for an [@name] or [@name='value'] predicate; a value of
+    # None only tests that the attribute is present
+    if isinstance(pred, ast.BinaryExpression) and pred.op == "=":
+        step, literal = pred.left, pred.right
+        if isinstance(step, str):
+            step, literal = literal, step
+        name = _attribute_step(step, namespaces)
+        if name is not None and isinstance(literal, str):
+            return name, literal
+    else:
+        name = _attribute_step(pred, namespaces)
+        if name is not None:
+            return name, None
+    raise _Unsupported()
+
+
+def _flatten(xp_ast):
+    # list of (separator, step) pairs for a path, without its root
+    if isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op in ("/", "//"):
+        return _flatten(xp_ast.left) + [(xp_ast.op, xp_ast.right)]
+    return [("/", xp_ast)]
+
+
+class _Pattern(object):
+    """A path compiled for matching: a list of element steps, each a
+    tuple of (descendant, tag, attribute tests), and what to select from
+    the last matched element."""
+
+    __slots__ = ("key", "absolute", "steps", "attribute", "text", "first")
+
+    def __init__(self, key, xp_ast, namespaces, first):
+        self.key = key
+        self.first = first
+        self.absolute = isinstance(xp_ast, ast.AbsolutePath)
+        if self.absolute:
+            if xp_ast.relative is None:
+                raise _Unsupported()
+            path = _flatten(xp_ast.relative)
+            path[0] = (xp_ast.op, path[0][1])
+        else:
+            path = _flatten(xp_ast)
+
+        self.attribute = None
+        self.text = False
+        last = path[-1][1]
+        if isinstance(last, ast.Step) and last.axis in ("@", "attribute"):
+            self.attribute = _attribute_step(last, namespaces)
+            if self.attribute is None or path[-1][0] != "/":
+                raise _Unsupported()
+            path.pop()
+        elif _is_text_step(last):
+            if path[-1][0] != "/":
+                raise _Unsupported()
+            self.text = True
+            path.pop()
+
+        self.steps = []
+        descendant = False
+        for separator, step in path:
+            descendant = descendant or separator == "//"
+            if isinstance(step, ast.AbbreviatedStep) and step.abbr == ".":
+                continue
+            if not (
+                isinstance(step, ast.Step)
+                and step.axis in (None, "child")
+                and isinstance(step.node_test, ast.NameTest)
+            ):
+                raise _Unsupported()
+            tag = _clark_name(step.node_test, namespaces)
+            tests = tuple(_attribute_test(pred, namespaces) for pred in step.predicates)
+            self.steps.append((descendant, tag, tests))
+            descendant = False
+        # a trailing // selects nothing useful; an absolute path must name
+        # at least the root element
+        if descendant or (self.absolute and not self.steps):
+            raise _Unsupported()
+
+    def matches(self, index, element):
+        _descendant, tag, tests = self.steps[index]
+        if tag is not None and element.tag != tag:
+            return False
+        for name, value in tests:
+            attribute = element.get(name)
+            if attribute is None or (value is not None and attribute != value):
+                return False
+        return True
+
+
+class StreamMatcher(object):
+    """Match a set of xpaths against a document as it is parsed.
+
+    :param xpaths: a mapping of keys to xpaths, as strings or parsed
+        expressions; or a sequence of xpaths, which are their own keys
+    :param namespaces: mapping of namespace prefixes to URIs used in the
+        xpaths
+    :param first: if true, only the first match of each xpath in document
+        order is reported, as for a single-valued field
+
+    Raises :class:`ValueError` if an xpath is not in the supported subset.
+    """
+
+    def __init__(self, xpaths, namespaces=None, first=False):
+        if not hasattr(xpaths, "items"):
+            xpaths = {xpath: xpath for xpath in xpaths}
+        namespaces = namespaces or {}
+        self.patterns = []
+        for key, xpath in xpaths.items():
+            xp_ast = parse(xpath) if isinstance(xpath, str) else xpath
+            try:
+                self.patterns.append(_Pattern(key, xp_ast, namespaces, first))
+            except _Unsupported:
+                raise ValueError(
+                    "xpath %r cannot be matched while streaming" % (xpath,)
+                )
+
+    def iterparse(self, source, **kwargs):
+        """Parse `source` (a filename or file object) and generate
+        ``(key, value)`` pairs for every match. The value is the matched
+        element, or the attribute value or text node string for xpaths that
+        end in an attribute or ``text()`` step.
+
+        Attribute values are generated when their element starts; matched
+        elements and their text nodes are generated when the element ends,
+        so a matched element contains its whole subtree but matches
+        nested in it are generated first. Matched elements are generated
+        as copies, since the document is discarded as it is parsed. Any other
+        keyword arguments are passed to :func:`lxml.etree.iterparse`.
+        """
+        patterns = self.patterns
+        done = set()
+        # one entry per open element: the (pattern, step index) states to
+        # try against its children, and the patterns it was matched by
+        stack = []
+        # number of open elements that are being captured
+        capturing = 0
+
+        for event, element in etree.iterparse(
+            source, events=("start", "end"), **kwargs
+        ):
+            if event == "start":
+                if stack:
+                    active = stack[-1][0]
+                else:
+                    active = [(pattern, 0) for pattern in patterns if pattern.absolute]
+                states = []
+                captures = []
+                for pattern, index in active:
+                    if pattern in done:
+                        continue
+                    if pattern.steps[index][0]:
+                        # a descendant step can match further down
+                        states.append((pattern, index))
+                    if not pattern.matches(index, element):
+                        continue
+                    if index + 1 < len(pattern.steps):
+                        states.append((pattern, index + 1))
+                    else:
+                        captures.append(pattern)
+                if not stack:
+                    # relative paths start from the root element
+                    for pattern in patterns:
+                        if pattern.absolute:
+                            continue
+                        if pattern.steps:
+                            states.append((pattern, 0))
+                        else:
+                            captures.append(pattern)
+
+                # with nested matches for two descendant steps, a state
+                # can be reached twice; keep one of each, in order
+                states = list(dict.fromkeys(states))
+
+                ended = []
+                for pattern in captures:
+                    if pattern in done:
+                        continue
+                    if pattern.first:
+                        done.add(pattern)
+                    if pattern.attribute is not None:
+                        value = element.get(pattern.attribute)
+                        if value is not None:
+                            yield pattern.key, value
+                        elif pattern.first:
+                            # look for a later element with the attribute
+                            done.discard(pattern)
+                    else:
+                        ended.append(pattern)
+                if ended:
+                    capturing += 1
+                stack.append((states, ended))
+
+            else:
+                states, ended = stack.pop()
+                if ended:
+                    capturing -= 1
+                    for pattern in ended:
+                        if pattern.text:
+                            texts = [element.text] + [c.tail for c in element]
+                            texts = [text for text in texts if text is not None]
+                            if pattern.first:
+                                if not texts:
+                                    # look for a later element with text
+                                    done.discard(pattern)
+                                texts = texts[:1]
+                            for text in texts:
+                                yield pattern.key, text
+                        else:
+                            # a copy keeps its namespace declarations and
+                            # outlives the document being discarded
+                            yield pattern.key, deepcopy(element)
+                # discard the finished element, unless a capture still
+                # needs it as part of its subtree
+                parent = element.getparent()
+                if not capturing and parent is not None:
+                    element.clear()
+                    parent.remove(element)
+
+
+def iterobjects(source, xpath, xmlclass, namespaces=None, **kwargs):
+    """Generate an instance of `xmlclass` for each element matched by
+    `xpath` in `source` (a filename or file object), parsing the document
+    incrementally with a :class:`StreamMatcher`. Prefixes are resolved with
+    `namespaces`, or by default with the ``ROOT_NAMESPACES`` of
+    `xmlclass`.
+
+    For example, to read the components of a large EAD one at a time::
+
+        for component in iterobjects(path, "//e:c02", eadmap.Component):
+            print(component.did.unittitle)
+    """
+    if namespaces is None:
+        namespaces = xmlclass.ROOT_NAMESPACES
+    matcher = StreamMatcher({"object": xpath}, namespaces)
+    for _key, element in matcher.iterparse(source, **kwargs):
+        yield xmlclass(element)
+
+
+def iterfields(source, xmlclass, names=None, **kwargs):
+    """Generate ``(name, value)`` pairs for fields of `xmlclass` read from
+    the document in `source` (a filename or file object), without loading
+    the whole document. Values are converted to Python as when the field
+    is accessed on an instance of `xmlclass` loaded from the document;
+    list fields generate one pair for each item.
+
+    :param names: names of the fields to read; by default, all fields
+        whose xpaths can be matched while streaming. Raises
+        :class:`ValueError` if a named field cannot.
+    """
+    fields = xmlclass._fields
+    namespaces = xmlclass.ROOT_NAMESPACES
+    if names is None:
+        names = []
+        for name, field in fields.items():
+            try:
+                StreamMatcher([field.parsed_xpath], namespaces)
+            except ValueError:
+                continue
+            names.append(name)
+
+    single = {
+        name: fields[name].parsed_xpath
+        for name in names
+        if isinstance(fields[name].manager, SingleNodeManager)
+    }
+    multiple = {name: fields[name].parsed_xpath for name in names if name not in single}
+    matcher = StreamMatcher(single, namespaces, first=True)
+    matcher.patterns.extend(StreamMatcher(multiple, namespaces).patterns)
+    for name, node in matcher.iterparse(source, **kwargs):
+        yield name, fields[name].mapper.to_python(node)
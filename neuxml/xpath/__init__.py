@@ -30,5 +30,13 @@ This module exports two key functions, :func:`parse` and :func:`serialize`.
    Serialize an XPath AST expressed in terms of :mod:`neuxml.xpath.ast`
    objects into a valid XPath string.
 
+Parsed expressions are cached, so parsing the same string again is cheap.
+The cache is bounded and may be inspected and tuned with
+:func:`neuxml.xpath.core.parse_cache_info`,
+:func:`neuxml.xpath.core.clear_parse_cache` and
+:func:`neuxml.xpath.core.set_parse_cache_size`. To parse many expressions
+at once, such as all of the field xpaths of a class, use
+:func:`neuxml.xpath.core.parse_many`.
+
 This module does not support evaluating XPath expressions.
 """
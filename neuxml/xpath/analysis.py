@@ -0,0 +1,403 @@
+# file neuxml/xpath/analysis.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Static analysis of parsed XPath expressions.
+
+:func:`classify` labels the shape of an expression parsed into
+:mod:`neuxml.xpath.ast` nodes. Most xpaths used to map XML in practice are
+a child element, a short path of child elements, or an attribute or text
+node at the end of such a path; expressions of these shapes can be
+evaluated by walking lxml elements directly instead of through a full
+XPath engine. Any expression that does not match one of the simple shapes
+is labelled :data:`GENERAL`.
+
+:func:`dependencies` reports which element and attribute names an
+expression can observe, and :func:`overlaps` uses that to decide whether a
+change made through one expression may alter the result of another, so
+that values cached for unrelated expressions can be kept.
+"""
+
+from collections import namedtuple
+
+from neuxml.xpath import ast
+
+__all__ = [
+    "Shape",
+    "classify",
+    "Dependencies",
+    "dependencies",
+    "overlaps",
+    "ANY",
+    "SELF",
+    "CHILD",
+    "CHILD_PATH",
+    "ATTRIBUTE",
+    "TEXT",
+    "UNION",
+    "POSITIONAL",
+    "GENERAL",
+]
+
+#: the context node itself: ``.``
+SELF = "self"
+#: a single child element: ``e:did``
+CHILD = "child"
+#: a path of two or more child elements: ``e:did/e:unittitle``
+CHILD_PATH = "child path"
+#: an attribute of the context node or of a child path: ``e:did/@id``
+ATTRIBUTE = "attribute"
+#: text nodes of the context node or of a child path: ``mods:date/text()``
+TEXT = "text"
+#: a union of child elements by name: ``e:c02|e:c03|e:c04``
+UNION = "union"
+#: a child path with numeric position predicates: ``mods:name[1]``
+POSITIONAL = "positional"
+#: anything else
+GENERAL = "general"
+
+
+class Shape(namedtuple("Shape", ["kind", "tags", "attribute", "positions"])):
+    """The shape of an XPath expression, as returned by :func:`classify`.
+
+    ``kind`` is one of the shape constants in this module. For every kind
+    but :data:`UNION`, ``tags`` is the sequence of element names on the
+    child path, in Clark notation (``{namespace-uri}local-name``, or just
+    ``local-name`` for no namespace, or ``*`` for any element). For
+    :data:`UNION` it is the sequence of alternative child element names.
+    ``attribute`` is the Clark name of the attribute selected by an
+    :data:`ATTRIBUTE` expression, and otherwise None. For
+    :data:`POSITIONAL` expressions, ``positions`` gives the one-based
+    position selected at each step of ``tags``, or None for steps without
+    a position; for all other kinds it is None. :data:`GENERAL` shapes have
+    no tags.
+    """
+
+    __slots__ = ()
+
+
+_GENERAL_SHAPE = Shape(GENERAL, (), None, None)
+
+
+def _clark_name(name_test, namespaces, wildcard):
+    # Return the Clark notation name for a NameTest, or None if it uses an
+    # undeclared prefix. Unprefixed names are in no namespace.
+    if name_test.name == "*" and not wildcard:
+        return None
+    if name_test.prefix is None:
+        return name_test.name
+    if name_test.prefix not in namespaces:
+        return None
+    return "{%s}%s" % (namespaces[name_test.prefix], name_test.name)
+
+
+def _path_steps(xp_ast):
+    # Flatten a relative location path joined by / into a list of steps, or
+    # return None for anything else.
+    steps = []
+    while isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op == "/":
+        steps.append(xp_ast.right)
+        xp_ast = xp_ast.left
+    steps.append(xp_ast)
+    steps.reverse()
+    if all(isinstance(step, (ast.Step, ast.AbbreviatedStep)) for step in steps):
+        return steps
+    return None
+
+
+def _child_tag(step, namespaces):
+    # Return the Clark name and position selected by a child element step,
+    # or None if the step is not a simple child step.
+    if not isinstance(step, ast.Step) or step.axis not in (None, "child"):
+        return None
+    if not isinstance(step.node_test, ast.NameTest):
+        return None
+    tag = _clark_name(step.node_test, namespaces, wildcard=True)
+    if tag is None:
+        return None
+    if not step.predicates:
+        return tag, None
+    if len(step.predicates) == 1:
+        position = step.predicates[0]
+        # the parser produces ints for integer literals
+        if type(position) is int and position >= 1:
+            return tag, position
+    return None
+
+
+def _union_names(xp_ast):
+    # Flatten a union into a list of its operands
+    if isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op == "|":
+        return _union_names(xp_ast.left) + _union_names(xp_ast.right)
+    return [xp_ast]
+
+
+def classify(xp_ast, namespaces=None):
+    """Classify the shape of a parsed XPath expression.
+
+    :param xp_ast: an expression parsed by :func:`neuxml.xpath.core.parse`
+    :param namespaces: mapping of namespace prefixes to URIs, used to
+        resolve the tag names in the result. An expression that uses a
+        prefix not in this mapping is classified as :data:`GENERAL`.
+    :returns: a :class:`Shape`
+    """
+    if namespaces is None:
+        namespaces = {}
+
+    if isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op == "|":
+        tags = []
+        for operand in _union_names(xp_ast):
+            child = _child_tag(operand, namespaces)
+            if child is None or child[1] is not None:
+                return _GENERAL_SHAPE
+            tags.append(child[0])
+        return Shape(UNION, tuple(tags), None, None)
+
+    steps = _path_steps(xp_ast)
+    if steps is None:
+        return _GENERAL_SHAPE
+    if len(steps) == 1 and isinstance(steps[0], ast.AbbreviatedStep):
+        if steps[0].abbr == ".":
+            return Shape(SELF, (), None, None)
+        return _GENERAL_SHAPE
+
+    # the last step may select an attribute or text instead of an element
+    kind = None
+    attribute = None
+    last = steps[-1]
+    if isinstance(last, ast.Step) and not last.predicates:
+        if last.axis in ("@", "attribute") and isinstance(last.node_test, ast.NameTest):
+            attribute = _clark_name(last.node_test, namespaces, wildcard=False)
+            if attribute is None:
+                return _GENERAL_SHAPE
+            kind = ATTRIBUTE
+        elif (
+            last.axis in (None, "child")
+            and isinstance(last.node_test, ast.NodeType)
+            and last.node_test.name == "text"
+        ):
+            kind = TEXT
+    if kind is not None:
+        steps = steps[:-1]
+
+    tags = []
+    positions = []
+    for step in steps:
+        child = _child_tag(step, namespaces)
+        if child is None:
+            return _GENERAL_SHAPE
+        tags.append(child[0])
+        positions.append(child[1])
+
+    if any(position is not None for position in positions):
+        if kind is not None:
+            return _GENERAL_SHAPE
+        return Shape(POSITIONAL, tuple(tags), None, tuple(positions))
+    if kind is None:
+        kind = CHILD if len(tags) == 1 else CHILD_PATH
+    return Shape(kind, tuple(tags), attribute, None)
+
+
+#: name standing for any element or attribute name in :class:`Dependencies`
+ANY = "*"
+
+
+class Dependencies(
+    namedtuple("Dependencies", ["elements", "attributes", "positional", "descendants"])
+):
+    """The parts of a document an XPath expression can observe, as returned
+    by :func:`dependencies`.
+
+    ``elements`` and ``attributes`` are frozensets of the element and
+    attribute names tested by the expression, in Clark notation. A name of
+    ``{namespace-uri}*`` stands for any name in that namespace, and
+    :data:`ANY` for any name at all, as for expressions that use
+    wildcards, other node tests, variables, or steps outside the subtree
+    of the context node. ``positional`` is true if the result depends on
+    the position of nodes among their siblings. ``descendants`` is true if
+    the result depends on descendants of the context node other than
+    through the named elements, as for ``//`` paths or the string value of
+    the context node.
+    """
+
+    __slots__ = ()
+
+
+# axes that leave the subtree of the context node
+_OUTSIDE_AXES = (
+    "parent",
+    "ancestor",
+    "ancestor-or-self",
+    "following",
+    "preceding",
+    "namespace",
+)
+_SIBLING_AXES = ("following-sibling", "preceding-sibling")
+_DESCENDANT_AXES = ("descendant", "descendant-or-self")
+_POSITION_FUNCTIONS = ("position", "last")
+# functions that read outside the subtree of the context node: id()
+# through the ID attributes of the whole document, lang() through the
+# xml:lang attributes of ancestors
+_DOCUMENT_FUNCTIONS = ("id", "lang")
+# functions that apply to the context node when called without arguments
+_CONTEXT_FUNCTIONS = (
+    "string",
+    "string-length",
+    "normalize-space",
+    "number",
+    "name",
+    "local-name",
+    "namespace-uri",
+)
+
+
+class _Collector(object):
+    def __init__(self, namespaces):
+        self.namespaces = namespaces
+        self.elements = set()
+        self.attributes = set()
+        self.positional = False
+        self.descendants = False
+
+    def name(self, node_test):
+        if not isinstance(node_test, ast.NameTest):
+            # node(), text(), comment(): any name
+            return ANY
+        if node_test.prefix is None:
+            return node_test.name
+        if node_test.prefix not in self.namespaces:
+            return ANY
+        return "{%s}%s" % (self.namespaces[node_test.prefix], node_test.name)
+
+    def visit(self, node):
+        if isinstance(node, tuple):
+            for item in node:
+                self.visit(item)
+        elif isinstance(node, ast.Step):
+            self.step(node)
+        elif isinstance(node, ast.AbbreviatedStep):
+            if node.abbr == "..":
+                self.elements.add(ANY)
+            else:
+                # the context node itself: its value is its whole subtree
+                self.descendants = True
+        elif isinstance(node, ast.AbsolutePath):
+            self.elements.add(ANY)
+            self.descendants = True
+            self.visit(node.relative)
+        elif isinstance(node, ast.BinaryExpression):
+            if node.op == "//":
+                self.descendants = True
+            self.visit(node.left)
+            self.visit(node.right)
+        elif isinstance(node, ast.FunctionCall):
+            if node.prefix is None and node.name in _POSITION_FUNCTIONS:
+                self.positional = True
+            if node.prefix is None and node.name in _DOCUMENT_FUNCTIONS:
+                self.elements.add(ANY)
+                self.attributes.add(ANY)
+            if (
+                not node.args
+                and node.prefix is None
+                and node.name in _CONTEXT_FUNCTIONS
+            ):
+                self.descendants = True
+            self.visit(node.args)
+        elif isinstance(node, ast.VariableReference):
+            # a variable may hold any nodes
+            self.elements.add(ANY)
+            self.attributes.add(ANY)
+        elif isinstance(node, ast.PredicatedExpression):
+            self.visit(node.base)
+            self.predicates(node.predicates)
+        elif isinstance(node, ast.UnaryExpression):
+            self.visit(node.right)
+
+    def predicates(self, predicates):
+        for pred in predicates:
+            # a number predicate selects by position
+            if isinstance(pred, (int, float)) and not isinstance(pred, bool):
+                self.positional = True
+            self.visit(pred)
+
+    def step(self, step):
+        axis = step.axis
+        if axis in ("@", "attribute"):
+            self.attributes.add(self.name(step.node_test))
+        elif axis in _OUTSIDE_AXES:
+            self.elements.add(ANY)
+            self.attributes.add(ANY)
+        elif axis == "self":
+            self.descendants = True
+            self.elements.add(self.name(step.node_test))
+        else:
+            if axis in _DESCENDANT_AXES:
+                self.descendants = True
+            elif axis in _SIBLING_AXES:
+                self.positional = True
+            self.elements.add(self.name(step.node_test))
+        self.predicates(step.predicates)
+
+
+def dependencies(xp_ast, namespaces=None):
+    """Report the names and structure a parsed XPath expression depends on.
+
+    :param xp_ast: an expression parsed by :func:`neuxml.xpath.core.parse`
+    :param namespaces: mapping of namespace prefixes to URIs, used to
+        resolve names. Names with a prefix not in this mapping may be any
+        name.
+    :returns: a :class:`Dependencies`
+    """
+    collector = _Collector(namespaces or {})
+    collector.visit(xp_ast)
+    return Dependencies(
+        frozenset(collector.elements),
+        frozenset(collector.attributes),
+        collector.positional,
+        collector.descendants,
+    )
+
+
+def _name_matches(name, other):
+    if name == other or ANY in (name, other):
+        return True
+    # {uri}* matches every name in the namespace
+    for wildcard, qname in ((name, other), (other, name)):
+        if wildcard.endswith("}*") and qname.startswith(wildcard[:-1]):
+            return True
+    return False
+
+
+def _names_overlap(names, other_names):
+    if not names or not other_names:
+        return False
+    if names & other_names:
+        return True
+    return any(_name_matches(name, other) for name in names for other in other_names)
+
+
+def overlaps(first, second):
+    """Return True if a change to the nodes selected by one expression may
+    change the result of the other, given the :class:`Dependencies` of two
+    expressions evaluated from the same context node. The answer errs on
+    the side of True: False means the expressions are independent, so
+    that, for example, setting a field mapped to ``mods:note`` does not
+    affect a value read from ``mods:titleInfo/mods:title``.
+    """
+    if first.descendants or second.descendants:
+        return True
+    return _names_overlap(first.elements, second.elements) or _names_overlap(
+        first.attributes, second.attributes
+    )
@@ -22,10 +22,20 @@ The parser provided by this module creates its parsed XPath representation
 from the classes defined in this module. Library callers will mostly not use
 this module directly, unless they need to produce XPath ASTs from scratch or
 perhaps introspect ASTs returned by the parser.
+
+AST nodes are compared and hashed by structure, so two separately parsed
+copies of the same expression are equal and may be used interchangeably as
+dictionary keys. Nodes returned by the parser are shared between callers
+and must not be modified. :func:`intern` maps equal subtrees to a single
+shared object, which saves memory when many similar expressions are kept.
 """
 
+import threading
+import weakref
+
 __all__ = [
     "serialize",
+    "intern",
     "UnaryExpression",
     "BinaryExpression",
     "PredicatedExpression",
@@ -40,7 +50,15 @@ __all__ = [
 
 
 def serialize(xp_ast):
-    """Serialize an XPath AST as a valid XPath expression."""
+    """Serialize an XPath AST as a valid XPath expression. The result is
+    cached on each AST node, so serializing a node or any tree containing
+    it again does not repeat the work."""
+    if isinstance(xp_ast, _Node):
+        try:
+            return xp_ast._serialized
+        except AttributeError:
+            xp_ast._serialized = "".join(xp_ast._serialize())
+            return xp_ast._serialized
     return "".join(_serialize(xp_ast))
 
 
@@ -48,7 +66,9 @@ def _serialize(xp_ast):
     """Generate token strings which, when joined together, form a valid
     XPath serialization of the AST."""
 
-    if hasattr(xp_ast, "_serialize"):
+    if isinstance(xp_ast, _Node):
+        yield serialize(xp_ast)
+    elif hasattr(xp_ast, "_serialize"):
         for tok in xp_ast._serialize():
             yield tok
     elif isinstance(xp_ast, str):
@@ -61,9 +81,82 @@ def _serialize(xp_ast):
         yield str(xp_ast)
 
 
-class UnaryExpression(object):
+def _key_value(value):
+    # wrap plain values with their type, so that 1, 1.0 and True (which
+    # serialize differently) do not compare equal
+    if isinstance(value, _Node):
+        return value
+    if isinstance(value, tuple):
+        return tuple(_key_value(item) for item in value)
+    return (type(value), value)
+
+
+class _Node(object):
+    """Common base class for AST nodes, providing structural equality and
+    hashing. Subclasses list their constructor arguments, which are also
+    their attribute names, in ``_fields``. The hash and serialization of a
+    node are cached, which is only safe because nodes are not modified."""
+
+    __slots__ = ("_hash", "_serialized", "__weakref__")
+    _fields = ()
+
+    def _key(self):
+        return tuple(_key_value(getattr(self, field)) for field in self._fields)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash((type(self), self._key()))
+            return self._hash
+
+    def __reduce__(self):
+        # pickle and copy by constructor arguments only; the cached hash
+        # is not valid in another process
+        return (type(self), tuple(getattr(self, field) for field in self._fields))
+
+
+_interned = weakref.WeakValueDictionary()
+_intern_lock = threading.Lock()
+
+
+def _intern_value(value):
+    if isinstance(value, _Node):
+        return intern(value)
+    if isinstance(value, tuple):
+        items = tuple(_intern_value(item) for item in value)
+        if any(new is not old for new, old in zip(items, value)):
+            return items
+    return value
+
+
+def intern(xp_ast):
+    """Return a canonical AST equal to `xp_ast`, in which equal subtrees
+    are shared with every other interned AST. `xp_ast` itself is not
+    modified. Interned nodes are kept only as long as they are in use."""
+    if not isinstance(xp_ast, _Node):
+        return xp_ast
+    values = [getattr(xp_ast, field) for field in xp_ast._fields]
+    interned_values = [_intern_value(value) for value in values]
+    if any(new is not old for new, old in zip(interned_values, values)):
+        xp_ast = type(xp_ast)(*interned_values)
+    key = (type(xp_ast), xp_ast._key())
+    with _intern_lock:
+        return _interned.setdefault(key, xp_ast)
+
+
+class UnaryExpression(_Node):
     """A unary XPath expression. Practially, this means -foo."""
 
+    __slots__ = _fields = ("op", "right")
+
     def __init__(self, op, right):
         self.op = op
         """the operator used in the expression"""
@@ -82,9 +175,11 @@ class UnaryExpression(object):
 KEYWORDS = set(["or", "and", "div", "mod"])
 
 
-class BinaryExpression(object):
+class BinaryExpression(_Node):
     """Any binary XPath expression. a/b; a and b; a | b."""
 
+    __slots__ = _fields = ("left", "op", "right")
+
     def __init__(self, left, op, right):
         self.left = left
         """the left side of the binary expression"""
@@ -116,20 +211,28 @@ class BinaryExpression(object):
             yield tok
 
 
-class PredicatedExpression(object):
+class PredicatedExpression(_Node):
     """A filtered XPath expression. $var[1]; (a or b)[foo][@bar]."""
 
+    __slots__ = _fields = ("base", "predicates")
+
     def __init__(self, base, predicates=None):
         self.base = base
         """the base expression to be filtered"""
-        self.predicates = predicates or []
-        """a list of filter predicates"""
+        self.predicates = tuple(predicates or ())
+        """a tuple of filter predicates"""
 
     def __repr__(self):
         return "<%s %s>" % (self.__class__.__name__, serialize(self))
 
     def append_predicate(self, pred):
-        self.predicates.append(pred)
+        # only for use while the expression is being built by the parser
+        self.predicates += (pred,)
+        for cached in ("_hash", "_serialized"):
+            try:
+                delattr(self, cached)
+            except AttributeError:
+                pass
 
     def _serialize(self):
         yield "("
@@ -143,9 +246,11 @@ class PredicatedExpression(object):
             yield "]"
 
 
-class AbsolutePath(object):
+class AbsolutePath(_Node):
     """An absolute XPath path. /a/b/c; //a/ancestor:b/@c."""
 
+    __slots__ = _fields = ("op", "relative")
+
     def __init__(self, op="/", relative=None):
         self.op = op
         """the operator used to root the expression"""
@@ -168,16 +273,18 @@ class AbsolutePath(object):
             yield tok
 
 
-class Step(object):
+class Step(_Node):
     """A single step in a relative path. a; @b; text(); parent::foo:bar[5]."""
 
+    __slots__ = _fields = ("axis", "node_test", "predicates")
+
     def __init__(self, axis, node_test, predicates):
         self.axis = axis
         """the step's axis, or @ or None if abbreviated or undefined"""
         self.node_test = node_test
         """a NameTest or NodeType object describing the test represented"""
-        self.predicates = predicates
-        """a list of predicates filtering the step"""
+        self.predicates = tuple(predicates)
+        """a tuple of predicates filtering the step"""
 
     def __repr__(self):
         return "<%s %s>" % (self.__class__.__name__, serialize(self))
@@ -189,8 +296,7 @@ class Step(object):
             yield self.axis
             yield "::"
 
-        for tok in self.node_test._serialize():
-            yield tok
+        yield serialize(self.node_test)
 
         for predicate in self.predicates:
             yield "["
@@ -199,9 +305,11 @@ class Step(object):
             yield "]"
 
 
-class NameTest(object):
+class NameTest(_Node):
     """An element name node test for a Step."""
 
+    __slots__ = _fields = ("prefix", "name")
+
     def __init__(self, prefix, name):
         self.prefix = prefix
         """the namespace prefix used for the test, or None if unset"""
@@ -218,12 +326,14 @@ class NameTest(object):
         yield self.name
 
     def __str__(self):
-        return "".join(self._serialize())
+        return serialize(self)
 
 
-class NodeType(object):
+class NodeType(_Node):
     """A node type node test for a Step."""
 
+    __slots__ = _fields = ("name", "literal")
+
     def __init__(self, name, literal=None):
         self.name = name
         """the node type name, such as node or text"""
@@ -243,12 +353,14 @@ class NodeType(object):
         yield ")"
 
     def __str__(self):
-        return "".join(self._serialize())
+        return serialize(self)
 
 
-class AbbreviatedStep(object):
+class AbbreviatedStep(_Node):
     """An abbreviated XPath step. . or .."""
 
+    __slots__ = _fields = ("abbr",)
+
     def __init__(self, abbr):
         self.abbr = abbr
         """the abbreviated step"""
@@ -260,9 +372,11 @@ class AbbreviatedStep(object):
         yield self.abbr
 
 
-class VariableReference(object):
+class VariableReference(_Node):
     """An XPath variable reference. $foo; $myns:foo."""
 
+    __slots__ = _fields = ("name",)
+
     def __init__(self, name):
         self.name = name
         """a tuple (prefix, localname) containing the variable name"""
@@ -279,16 +393,18 @@ class VariableReference(object):
         yield localname
 
 
-class FunctionCall(object):
+class FunctionCall(_Node):
     """An XPath function call. foo(); my:foo(1); foo(1, 'a', $var)."""
 
+    __slots__ = _fields = ("prefix", "name", "args")
+
     def __init__(self, prefix, name, args):
         self.prefix = prefix
         """the namespace prefix, or None if unspecified"""
         self.name = name
         """the local function name"""
-        self.args = args
-        """a list of argument expressions"""
+        self.args = tuple(args)
+        """a tuple of argument expressions"""
 
     def __repr__(self):
         return "<%s %s>" % (self.__class__.__name__, serialize(self))
@@ -25,18 +25,34 @@ works.
 Note that most client applications will import htese objects from
 neuxml.xpath, not directly from here."""
 
+from collections import OrderedDict, deque, namedtuple
+import copy
+import functools
+import importlib
 import os
 import re
 from ply import lex, yacc
-import tempfile
+import threading
+import types
 
-from neuxml.xpath import lexrules, parserules
+from neuxml.xpath import lexrules, parserules, rdparser
 from neuxml.xpath.ast import serialize
 
-__all__ = ["lexer", "parser", "parse", "serialize"]
+__all__ = [
+    # lexer and parser are built on first use by the module __getattr__
+    "lexer",  # noqa: F822
+    "parser",  # noqa: F822
+    "parse",
+    "parse_many",
+    "serialize",
+    "parse_cache_info",
+    "clear_parse_cache",
+    "set_parse_cache_size",
+    "set_parser_engine",
+    "get_parser_engine",
+]
 
-# build the lexer. This will generate a lextab.py in the neuxml.xpath
-# directory. Unfortunately, xpath requires some wonky lexing.
+# Unfortunately, xpath requires some wonky lexing.
 # Per http://www.w3.org/TR/xpath/#exprlex :
 #  1 If there is a preceding token and the preceding token is not one of @,
 #    ::, (, [, , or an Operator, then a * must be recognized as a
@@ -54,46 +70,26 @@ __all__ = ["lexer", "parser", "parse", "serialize"]
 # described lookahead/lookback lexing, and we dynamically set the lexer's
 # __class__ to this wrapper. That's pretty weird and ugly, but Python allows
 # it. If you can find a prettier solution to the problem then I welcome a
-# fix.
-
-OPERATOR_FORCERS = set(
-    [
-        # @, ::, (, [
-        "ABBREV_AXIS_AT",
-        "AXIS_SEP",
-        "OPEN_PAREN",
-        "OPEN_BRACKET",
-        # Operators: OperatorName
-        "AND_OP",
-        "OR_OP",
-        "MOD_OP",
-        "DIV_OP",
-        "MULT_OP",
-        # Operators: MultiplyOperator
-        "PATH_SEP",
-        # Operators: /, //, |, +, -
-        "ABBREV_PATH_SEP",
-        "UNION_OP",
-        "PLUS_OP",
-        "MINUS_OP",
-        # Operators: =. !=, <, <=, >, >=
-        "EQUAL_OP",
-        "REL_OP",
-        # Also need to add : . Official XPath lexing rules are in terms of
-        # QNames, but we produce QNames in the parse layer. We need to include :
-        # here to force foo:div to be a single step, otherwise that last div
-        # would be interpreted as an operator (where standard xpath would just
-        # call it part of the qname)
-        "COLON",
-    ]
-)
-
-NODE_TYPES = set(["comment", "text", "processing-instruction", "node"])
+# fix. Lookahead uses a buffer of raw tokens that have been lexed but not yet
+# returned, so looking one token ahead costs no more than lexing it.
+
+OPERATOR_FORCERS = lexrules.OPERATOR_FORCERS
+NODE_TYPES = lexrules.NODE_TYPES
 
 
 class LexerWrapper(lex.Lexer):
+    def input(self, s):
+        # reset lookbehind and lookahead state, which may be left over from
+        # a previous expression that failed to parse
+        self.last = None
+        self.lookahead = deque()
+        lex.Lexer.input(self, s)
+
     def token(self):
-        tok = lex.Lexer.token(self)
+        if self.lookahead:
+            tok = self.lookahead.popleft()
+        else:
+            tok = lex.Lexer.token(self)
         if tok is not None:
             if tok.type == "STAR_OP":
                 if self.last is not None and self.last.type not in OPERATOR_FORCERS:
@@ -123,47 +119,277 @@ class LexerWrapper(lex.Lexer):
         return tok
 
     def peek(self):
-        clone = self.clone()
-        return clone.token()
-
-
-# try to build the lexer with cached lex table generation. this will fail if
-# the user doesn't have write perms on the source directory. in that case,
-# try again without lex table generation.
-lexdir = os.path.dirname(lexrules.__file__)
-lexer = None
-try:
-    lexer = lex.lex(module=lexrules, optimize=1, outputdir=lexdir, reflags=re.UNICODE)
-except IOError as e:
-    import errno
-
-    if e.errno != errno.EACCES:
-        raise
-if lexer is None:
-    lexer = lex.lex(module=lexrules, reflags=re.UNICODE)
-# then dynamically rewrite the lexer class to use the wonky override logic
-# above
-lexer.__class__ = LexerWrapper
-lexer.last = None
-
-# build the parser. This will generate a parsetab.py in the neuxml.xpath
-# directory. Unlike lex, though, this just logs a complaint when it fails
-# (contrast lex's explosion). Other than that, it's much less exciting
-# than the lexer wackiness.
-parsedir = os.path.dirname(parserules.__file__)
-# By default, store generated parse files with the code
-# If we don't have write permission, put them in the configured tempdir
-if not os.access(parsedir, os.W_OK):
-    parsedir = tempfile.gettempdir()
-parser = yacc.yacc(module=parserules, outputdir=parsedir, debug=0)
+        """Return the next raw token without consuming it. Only the token
+        type is reliable; disambiguation happens when it is consumed."""
+        if not self.lookahead:
+            tok = lex.Lexer.token(self)
+            if tok is None:
+                return None
+            self.lookahead.append(tok)
+        return self.lookahead[0]
+
+
+# The lexer and parser are built the first time they are needed, from the
+# lextab.py and parsetab.py tables shipped with this package, so importing
+# this module neither runs ply's table generation nor writes any files. If
+# the shipped tables are missing or were generated by an incompatible
+# version of ply, the lexer and parser are built in memory instead. After
+# changing lexrules or parserules, regenerate the tables with
+# scripts/build_xpath_tables.py.
+_build_lock = threading.Lock()
+_lexer = None
+_parser = None
+
+
+def _build_lexer():
+    try:
+        lextab = importlib.import_module("neuxml.xpath.lextab")
+    except ImportError:
+        lextab = None
+    if getattr(lextab, "_tabversion", None) == lex.__tabversion__:
+        new_lexer = lex.lex(module=lexrules, optimize=1, lextab=lextab)
+    else:
+        new_lexer = lex.lex(module=lexrules, reflags=re.UNICODE)
+    # then dynamically rewrite the lexer class to use the wonky override
+    # logic above
+    new_lexer.__class__ = LexerWrapper
+    new_lexer.last = None
+    new_lexer.lookahead = deque()
+    return new_lexer
+
+
+def _build_parser():
+    # yacc checks the signature of the shipped tables against parserules,
+    # and regenerates them in memory if they are missing or out of date
+    return yacc.yacc(
+        module=parserules,
+        tabmodule="neuxml.xpath.parsetab",
+        write_tables=False,
+        debug=False,
+    )
+
+
+def _get_templates():
+    """Return the module-wide lexer and parser, building them if needed."""
+    global _lexer, _parser
+    if _parser is None:
+        with _build_lock:
+            if _parser is None:
+                _lexer = _build_lexer()
+                _parser = _build_parser()
+    return _lexer, _parser
+
+
+def build_tables(outputdir):
+    """Generate ``lextab.py`` and ``parsetab.py`` in `outputdir` from
+    :mod:`~neuxml.xpath.lexrules` and :mod:`~neuxml.xpath.parserules`."""
+    lex.lex(module=lexrules, reflags=re.UNICODE).writetab("lextab", outputdir)
+    # hide the package name from yacc, which would otherwise find the
+    # current neuxml.xpath.parsetab and skip writing a new one
+    rules = dict(vars(parserules))
+    del rules["__package__"]
+    yacc.yacc(
+        module=types.SimpleNamespace(**rules),
+        tabmodule="parsetab",
+        outputdir=outputdir,
+        write_tables=True,
+        debug=False,
+    )
+
+
+def __getattr__(name):
+    # build the module-level lexer and parser on first access
+    if name == "lexer":
+        return _get_templates()[0]
+    if name == "parser":
+        return _get_templates()[1]
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+# The module-level lexer and parser keep their working state (input position,
+# lookbehind token, parse stacks) on the objects themselves, so they must not
+# be shared between concurrent parses. They serve as templates: each thread
+# gets its own lexer clone and shallow parser copy, which share the
+# (read-only) regular expressions and parse tables but nothing else.
+_thread_state = threading.local()
+
+
+def _get_lexer_parser():
+    """Return the lexer and parser for use by the current thread."""
+    try:
+        return _thread_state.lexer, _thread_state.parser
+    except AttributeError:
+        template_lexer, template_parser = _get_templates()
+        _thread_state.lexer = template_lexer.clone()
+        _thread_state.parser = copy.copy(template_parser)
+        return _thread_state.lexer, _thread_state.parser
+
+
+#: default maximum number of parsed expressions kept by :func:`parse`
+PARSE_CACHE_SIZE = 1024
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class _ParseCache(object):
+    """Bounded, thread-safe least-recently-used mapping of xpath strings
+    to parsed ASTs. A ``maxsize`` of None means unbounded; 0 disables
+    caching."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._trim()
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._trim()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def _trim(self):
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_parse_cache = _ParseCache(PARSE_CACHE_SIZE)
+_missing = object()
 
 
 def parse(xpath):
-    """Parse an xpath."""
-    # Expose the parse method of the constructed parser,
-    # but explicitly specify the lexer created here,
-    # since otherwise parse will use the most-recently created lexer.
-    return parser.parse(xpath, lexer=lexer)
+    """Parse an xpath. Safe to call from multiple threads at once.
+
+    Parsed expressions are kept in a bounded least-recently-used cache, so
+    repeated calls with the same string return the same AST object. Callers
+    must treat returned ASTs as read-only; copy them before modifying.
+    """
+    xast = _parse_cache.get(xpath, _missing)
+    if xast is _missing:
+        xast = _parse(xpath)
+        _parse_cache.put(xpath, xast)
+    return xast
+
+
+#: names of the available parsers, for :func:`set_parser_engine`
+PARSER_ENGINES = ("ply", "recursive-descent")
+
+#: environment variable used to select the parser engine at import time
+PARSER_ENGINE_ENV = "NEUXML_XPATH_PARSER"
+
+_parser_engine = "ply"
+
+
+def set_parser_engine(name):
+    """Select the parser used by :func:`parse`: ``"ply"`` (the default), the
+    LALR parser built from :mod:`neuxml.xpath.parserules`, or
+    ``"recursive-descent"``, the hand-written parser in
+    :mod:`neuxml.xpath.rdparser`. Both produce the same ASTs. The initial
+    engine may also be set with the ``NEUXML_XPATH_PARSER`` environment
+    variable. Changing engines clears the parse cache."""
+    global _parser_engine
+    if name not in PARSER_ENGINES:
+        raise ValueError(
+            "Unknown xpath parser engine %r; choose one of %s"
+            % (name, ", ".join(PARSER_ENGINES))
+        )
+    _parser_engine = name
+    clear_parse_cache()
+
+
+def get_parser_engine():
+    """Return the name of the parser currently used by :func:`parse`."""
+    return _parser_engine
+
+
+def _get_parse_function():
+    """Return a function parsing an xpath with the current engine, for use
+    by the current thread only."""
+    if _parser_engine == "recursive-descent":
+        return rdparser.parse
+    # Use the parse method of this thread's parser, but explicitly
+    # specify the matching lexer, since otherwise parse will use the
+    # most-recently created lexer.
+    thread_lexer, thread_parser = _get_lexer_parser()
+    return functools.partial(thread_parser.parse, lexer=thread_lexer)
+
+
+def _parse(xpath):
+    return _get_parse_function()(xpath)
+
+
+def parse_many(xpaths):
+    """Parse a sequence of xpaths, returning a dictionary mapping each
+    distinct xpath to its AST. Each distinct string is parsed once, with a
+    single lexer and parser, and the results share the :func:`parse`
+    cache. Raises an exception for the first xpath that cannot be parsed.
+    """
+    parsed = {}
+    for xpath in xpaths:
+        if xpath not in parsed:
+            parsed[xpath] = _parse_cache.get(xpath, _missing)
+    missing = [xpath for xpath, xast in parsed.items() if xast is _missing]
+    if missing:
+        parse_one = _get_parse_function()
+        for xpath in missing:
+            parsed[xpath] = xast = parse_one(xpath)
+            _parse_cache.put(xpath, xast)
+    return parsed
+
+
+def parse_cache_info():
+    """Report statistics for the :func:`parse` cache as a named tuple of
+    ``hits``, ``misses``, ``maxsize`` and ``currsize``, in the style of
+    :func:`functools.lru_cache`."""
+    return _parse_cache.info()
+
+
+def clear_parse_cache():
+    """Empty the :func:`parse` cache and reset its statistics."""
+    _parse_cache.clear()
+
+
+def set_parse_cache_size(maxsize):
+    """Change the maximum number of expressions kept by the :func:`parse`
+    cache. Use None for an unbounded cache, or 0 to disable caching. Least
+    recently used entries are discarded if the cache is shrunk."""
+    if maxsize is not None and maxsize < 0:
+        raise ValueError("Cache size must be None or a non-negative integer")
+    _parse_cache.resize(maxsize)
+
+
+if os.environ.get(PARSER_ENGINE_ENV):
+    set_parser_engine(os.environ[PARSER_ENGINE_ENV])
 
 
 def ptokens(s):
@@ -171,6 +397,7 @@ def ptokens(s):
     This is used primarily for debugging. You probably don't want this
     function."""
 
-    lexer.input(s)
-    for tok in lexer:
+    debug_lexer = _get_templates()[0].clone()
+    debug_lexer.input(s)
+    for tok in debug_lexer:
         print(tok)
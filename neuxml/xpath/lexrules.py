@@ -115,6 +115,40 @@ NCNAME_REGEX = (
 
 NODE_TYPES = set(["comment", "text", "processing-instruction", "node"])
 
+# tokens after which a * or an NCName is *not* an operator; see the lexing
+# notes in neuxml.xpath.core
+OPERATOR_FORCERS = set(
+    [
+        # @, ::, (, [
+        "ABBREV_AXIS_AT",
+        "AXIS_SEP",
+        "OPEN_PAREN",
+        "OPEN_BRACKET",
+        # Operators: OperatorName
+        "AND_OP",
+        "OR_OP",
+        "MOD_OP",
+        "DIV_OP",
+        "MULT_OP",
+        # Operators: MultiplyOperator
+        "PATH_SEP",
+        # Operators: /, //, |, +, -
+        "ABBREV_PATH_SEP",
+        "UNION_OP",
+        "PLUS_OP",
+        "MINUS_OP",
+        # Operators: =. !=, <, <=, >, >=
+        "EQUAL_OP",
+        "REL_OP",
+        # Also need to add : . Official XPath lexing rules are in terms of
+        # QNames, but we produce QNames in the parse layer. We need to include :
+        # here to force foo:div to be a single step, otherwise that last div
+        # would be interpreted as an operator (where standard xpath would just
+        # call it part of the qname)
+        "COLON",
+    ]
+)
+
 t_NCNAME = NCNAME_REGEX
 
 
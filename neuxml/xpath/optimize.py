@@ -0,0 +1,119 @@
+# file neuxml/xpath/optimize.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Rewrite parsed XPath expressions into cheaper equivalents.
+
+:func:`optimize` takes an expression parsed into :mod:`neuxml.xpath.ast`
+nodes and returns an expression that selects the same nodes in the same
+order, but that is simpler or faster for an XPath engine such as libxml2 to
+evaluate. The rewrites are:
+
+ * ``self::node()`` steps are abbreviated to ``.``
+ * redundant ``.`` steps are removed from paths: ``./a`` and ``a/./b``
+   become ``a`` and ``a/b``
+ * a union of child elements by name, such as ``e:c02|e:c03|e:c04``,
+   becomes a single step with a name predicate,
+   ``*[self::e:c02 or self::e:c03 or self::e:c04]``, which scans the
+   children of the context node once instead of once per name
+
+The input expression is not modified.
+"""
+
+from neuxml.xpath import ast
+
+__all__ = ["optimize"]
+
+
+def _optimize_value(value):
+    if isinstance(value, ast._Node):
+        return optimize(value)
+    if isinstance(value, tuple):
+        items = tuple(_optimize_value(item) for item in value)
+        if any(new is not old for new, old in zip(items, value)):
+            return items
+    return value
+
+
+def _ends_in_step(xp_ast):
+    # true for location paths, which always select a node-set
+    if isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op in ("/", "//"):
+        xp_ast = xp_ast.right
+    return isinstance(xp_ast, (ast.Step, ast.AbbreviatedStep))
+
+
+def _is_self(xp_ast):
+    return isinstance(xp_ast, ast.AbbreviatedStep) and xp_ast.abbr == "."
+
+
+def _union_operands(xp_ast):
+    if isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op == "|":
+        return _union_operands(xp_ast.left) + _union_operands(xp_ast.right)
+    return [xp_ast]
+
+
+def _is_child_name_step(xp_ast):
+    return (
+        isinstance(xp_ast, ast.Step)
+        and xp_ast.axis in (None, "child")
+        and isinstance(xp_ast.node_test, ast.NameTest)
+        and xp_ast.node_test.name != "*"
+        and not xp_ast.predicates
+    )
+
+
+def optimize(xp_ast):
+    """Return an expression equivalent to `xp_ast` that is cheaper to
+    evaluate, or `xp_ast` itself if no rewrite applies."""
+    if not isinstance(xp_ast, ast._Node):
+        return xp_ast
+
+    if isinstance(xp_ast, ast.BinaryExpression) and xp_ast.op == "|":
+        # rewrite a whole union of names at once, before its parts
+        operands = _union_operands(xp_ast)
+        if all(_is_child_name_step(operand) for operand in operands):
+            names = [ast.Step("self", operand.node_test, ()) for operand in operands]
+            predicate = names[0]
+            for name in names[1:]:
+                predicate = ast.BinaryExpression(predicate, "or", name)
+            return ast.Step(None, ast.NameTest(None, "*"), (predicate,))
+
+    # otherwise rewrite from the bottom up
+    values = [getattr(xp_ast, field) for field in xp_ast._fields]
+    optimized_values = [_optimize_value(value) for value in values]
+    if any(new is not old for new, old in zip(optimized_values, values)):
+        xp_ast = type(xp_ast)(*optimized_values)
+
+    if isinstance(xp_ast, ast.Step):
+        # self::node() is the same as .
+        if (
+            xp_ast.axis == "self"
+            and isinstance(xp_ast.node_test, ast.NodeType)
+            and xp_ast.node_test.name == "node"
+            and not xp_ast.predicates
+        ):
+            return ast.AbbreviatedStep(".")
+
+    elif isinstance(xp_ast, ast.BinaryExpression):
+        if xp_ast.op == "/":
+            # ./a is a; a/. is a, as long as a is a node-set
+            if _is_self(xp_ast.left) and isinstance(
+                xp_ast.right, (ast.Step, ast.AbbreviatedStep)
+            ):
+                return xp_ast.right
+            if _is_self(xp_ast.right) and _ends_in_step(xp_ast.left):
+                return xp_ast.left
+
+    return xp_ast
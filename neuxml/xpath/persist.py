@@ -0,0 +1,220 @@
+# file neuxml/xpath/persist.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Optional on-disk cache of parsed XPath expressions.
+
+Every :class:`~neuxml.xmlmap.fields.Field` parses its xpath when its
+:class:`~neuxml.xmlmap.XmlObject` class is defined, so importing modules
+with many xmlobjects parses hundreds of expressions on every interpreter
+start. When the persistent cache is enabled, fields look up their parsed
+xpaths in a pickle file instead, and any expressions that had to be parsed
+are added to the file when the interpreter exits. Short-lived processes,
+such as batch jobs and workers, then start faster after the first run.
+
+The cache is disabled by default. Enable it by setting the
+``NEUXML_XPATH_CACHE`` environment variable to ``1``, which stores the
+cache in the user cache directory (``$XDG_CACHE_HOME/neuxml``, or
+``~/.cache/neuxml``), or to the path of a cache file; or call
+:func:`enable`. Cache files are specific to the neuxml version, and
+unreadable or mismatched files are ignored. Cache files are pickles, so
+only use a cache file that no one else can write to.
+"""
+
+import atexit
+import logging
+import os
+import pickle
+import tempfile
+import threading
+
+import neuxml
+from neuxml.xpath import core
+
+__all__ = [
+    "parse",
+    "parse_many",
+    "enable",
+    "disable",
+    "get_cache",
+    "PersistentParseCache",
+]
+
+logger = logging.getLogger(__name__)
+
+#: environment variable used to enable the cache: ``1`` for the default
+#: location, or the path of a cache file
+CACHE_ENV = "NEUXML_XPATH_CACHE"
+
+# bump when the layout of the cache file changes
+CACHE_FORMAT = 1
+
+
+def default_cache_path():
+    """Path of the cache file in the user cache directory, named for the
+    current neuxml version."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "neuxml", "xpath-%s.pickle" % neuxml.__version__)
+
+
+class PersistentParseCache(object):
+    """Mapping of xpath strings to parsed ASTs, backed by a pickle file.
+    The file is read on first use; new entries are written back by
+    :meth:`save`."""
+
+    def __init__(self, path):
+        self.path = path
+        self._data = None
+        self._added = False
+        self._lock = threading.Lock()
+
+    def _header(self):
+        return {"format": CACHE_FORMAT, "version": neuxml.__version__}
+
+    def _read(self):
+        try:
+            with open(self.path, "rb") as cachefile:
+                header, data = pickle.load(cachefile)
+        except FileNotFoundError:
+            return {}
+        except Exception as err:
+            logger.warning("Ignoring unreadable xpath cache %s: %s", self.path, err)
+            return {}
+        if header != self._header() or not isinstance(data, dict):
+            return {}
+        return data
+
+    def _load(self):
+        if self._data is None:
+            self._data = self._read()
+
+    def get(self, xpath):
+        """Return the cached AST for `xpath`, or None."""
+        with self._lock:
+            self._load()
+            return self._data.get(xpath)
+
+    def put(self, xpath, xp_ast):
+        """Add a parsed expression to the cache."""
+        with self._lock:
+            self._load()
+            if xpath not in self._data:
+                self._data[xpath] = xp_ast
+                self._added = True
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._data)
+
+    def save(self):
+        """Write the cache file if entries have been added since it was
+        read. Entries written by other processes in the meantime are kept;
+        the file is replaced atomically."""
+        with self._lock:
+            if not self._added:
+                return
+            data = self._read()
+            data.update(self._data)
+            directory = os.path.dirname(self.path) or "."
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as cachefile:
+                        pickle.dump(
+                            (self._header(), data),
+                            cachefile,
+                            protocol=pickle.HIGHEST_PROTOCOL,
+                        )
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except OSError as err:
+                logger.warning("Could not write xpath cache %s: %s", self.path, err)
+                return
+            self._data = data
+            self._added = False
+
+
+_cache = None
+_atexit_registered = False
+
+
+def enable(path=None):
+    """Enable the persistent cache, stored at `path` or by default in the
+    user cache directory. The cache is saved when the interpreter exits."""
+    global _cache, _atexit_registered
+    _cache = PersistentParseCache(path or default_cache_path())
+    if not _atexit_registered:
+        atexit.register(_save)
+        _atexit_registered = True
+
+
+def disable():
+    """Disable the persistent cache, saving any new entries first."""
+    global _cache
+    _save()
+    _cache = None
+
+
+def get_cache():
+    """Return the active :class:`PersistentParseCache`, or None if the
+    persistent cache is disabled."""
+    return _cache
+
+
+def _save():
+    if _cache is not None:
+        _cache.save()
+
+
+def parse(xpath):
+    """Parse an xpath like :func:`neuxml.xpath.core.parse`, but use and
+    update the persistent cache when it is enabled."""
+    cache = _cache
+    if cache is None:
+        return core.parse(xpath)
+    xp_ast = cache.get(xpath)
+    if xp_ast is None:
+        xp_ast = core.parse(xpath)
+        cache.put(xpath, xp_ast)
+    return xp_ast
+
+
+def parse_many(xpaths):
+    """Parse a sequence of xpaths like :func:`neuxml.xpath.core.parse_many`,
+    but use and update the persistent cache when it is enabled."""
+    cache = _cache
+    if cache is None:
+        return core.parse_many(xpaths)
+    parsed = {}
+    missing = []
+    for xpath in xpaths:
+        if xpath not in parsed:
+            parsed[xpath] = xp_ast = cache.get(xpath)
+            if xp_ast is None:
+                missing.append(xpath)
+    for xpath, xp_ast in core.parse_many(missing).items():
+        parsed[xpath] = xp_ast
+        cache.put(xpath, xp_ast)
+    return parsed
+
+
+if os.environ.get(CACHE_ENV):
+    enable(None if os.environ[CACHE_ENV] == "1" else os.environ[CACHE_ENV])
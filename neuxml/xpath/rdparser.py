@@ -0,0 +1,340 @@
+# file neuxml/xpath/rdparser.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Hand-written recursive-descent XPath parser.
+
+This is an alternative to the `ply <http://www.dabeaz.com/ply/>`_ based
+parser built in :mod:`neuxml.xpath.core`. It needs no generated lexer or
+parser tables, and produces exactly the same trees of
+:mod:`neuxml.xpath.ast` nodes, including the same handling of the
+`XPath lexical rules <http://www.w3.org/TR/xpath/#exprlex>`_ and the same
+operator precedence as :mod:`neuxml.xpath.parserules`.
+
+Most callers should use :func:`neuxml.xpath.core.parse`, which selects
+between the two parsers with :func:`neuxml.xpath.core.set_parser_engine`.
+"""
+
+import re
+
+from neuxml.xpath import ast, lexrules
+
+__all__ = ["parse", "tokenize"]
+
+
+def _build_token_regex():
+    # Mirror ply's rule ordering: function rules in definition order, then
+    # string rules, longest regular expression first.
+    functions = [
+        ("LITERAL", lexrules.t_LITERAL.__doc__),
+        ("FLOAT", lexrules.t_FLOAT.__doc__),
+        ("INTEGER", lexrules.t_INTEGER.__doc__),
+    ]
+    strings = sorted(
+        (
+            (name[2:], value)
+            for name, value in vars(lexrules).items()
+            if name.startswith("t_") and name != "t_ignore" and isinstance(value, str)
+        ),
+        key=lambda rule: (-len(rule[1]), rule[0]),
+    )
+    return re.compile(
+        "|".join("(?P<%s>%s)" % (name, regex) for name, regex in functions + strings)
+    )
+
+
+_token_regex = _build_token_regex()
+
+
+class Token(object):
+    """A lexed XPath token."""
+
+    __slots__ = ("type", "value", "pos")
+
+    def __init__(self, type, value, pos):
+        self.type = type
+        self.value = value
+        self.pos = pos
+
+    def __repr__(self):
+        return "Token(%s,%r,%d)" % (self.type, self.value, self.pos)
+
+
+def tokenize(xpath):
+    """Lex an XPath expression into a list of :class:`Token` objects,
+    disambiguating operator, function, node type and axis names the same
+    way as :class:`neuxml.xpath.core.LexerWrapper`."""
+    tokens = []
+    pos = 0
+    end = len(xpath)
+    match = _token_regex.match
+    while pos < end:
+        if xpath[pos] in lexrules.t_ignore:
+            pos += 1
+            continue
+        m = match(xpath, pos)
+        if m is None:
+            lexrules.t_error(Token("error", xpath[pos:], pos))
+        type = m.lastgroup
+        value = m.group()
+        if type == "LITERAL":
+            value = value[1:-1]
+        elif type == "FLOAT":
+            value = float(value)
+        elif type == "INTEGER":
+            value = int(value)
+        tokens.append(Token(type, value, pos))
+        pos = m.end()
+
+    last = None
+    for i, tok in enumerate(tokens):
+        after_operand = last is not None and last.type not in lexrules.OPERATOR_FORCERS
+        if tok.type == "STAR_OP" and after_operand:
+            tok.type = "MULT_OP"
+        elif tok.type == "NCNAME":
+            if after_operand:
+                tok.type = lexrules.operator_names.get(tok.value, tok.type)
+            elif i + 1 < len(tokens):
+                next_type = tokens[i + 1].type
+                if next_type == "OPEN_PAREN":
+                    if tok.value in lexrules.NODE_TYPES:
+                        tok.type = "NODETYPE"
+                    else:
+                        tok.type = "FUNCNAME"
+                elif next_type == "AXIS_SEP":
+                    tok.type = "AXISNAME"
+        last = tok
+    return tokens
+
+
+# binary operators by precedence level, loosest first; all associate left
+_BINARY_LEVELS = [
+    ("OR_OP",),
+    ("AND_OP",),
+    ("EQUAL_OP",),
+    ("REL_OP",),
+    ("PLUS_OP", "MINUS_OP"),
+    ("MULT_OP", "DIV_OP", "MOD_OP"),
+]
+
+# tokens that may begin a location step
+_STEP_START = set(
+    [
+        "NCNAME",
+        "STAR_OP",
+        "NODETYPE",
+        "AXISNAME",
+        "ABBREV_AXIS_AT",
+        "ABBREV_STEP_SELF",
+        "ABBREV_STEP_PARENT",
+    ]
+)
+
+
+class _Parser(object):
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset=0):
+        i = self.pos + offset
+        if i < len(self.tokens):
+            return self.tokens[i].type
+        return None
+
+    def next(self):
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+    def expect(self, type):
+        if self.peek() != type:
+            self.error()
+        return self.next()
+
+    def error(self):
+        if self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+        else:
+            tok = None
+        raise RuntimeError("Syntax error at '%s'" % repr(tok))
+
+    def parse(self):
+        expr = self.expr()
+        if self.pos != len(self.tokens):
+            self.error()
+        return expr
+
+    # expressions
+
+    def expr(self, level=0):
+        if level == len(_BINARY_LEVELS):
+            return self.unary_expr()
+        left = self.expr(level + 1)
+        while self.peek() in _BINARY_LEVELS[level]:
+            op = self.next().value
+            left = ast.BinaryExpression(left, op, self.expr(level + 1))
+        return left
+
+    def unary_expr(self):
+        if self.peek() == "MINUS_OP":
+            op = self.next().value
+            return ast.UnaryExpression(op, self.unary_expr())
+        return self.union_expr()
+
+    def union_expr(self):
+        left = self.path_expr()
+        while self.peek() == "UNION_OP":
+            op = self.next().value
+            # a negated operand absorbs the rest of the union, since unary
+            # minus binds less tightly than |
+            if self.peek() == "MINUS_OP":
+                right = self.unary_expr()
+            else:
+                right = self.path_expr()
+            left = ast.BinaryExpression(left, op, right)
+        return left
+
+    # paths
+
+    def path_expr(self):
+        type = self.peek()
+        if type in ("PATH_SEP", "ABBREV_PATH_SEP"):
+            op = self.next().value
+            if type == "PATH_SEP" and self.peek() not in _STEP_START:
+                return ast.AbsolutePath(op)
+            return ast.AbsolutePath(op, self.relative_location_path())
+        if self.starts_filter_expr():
+            filter_expr = self.filter_expr()
+            if self.peek() in ("PATH_SEP", "ABBREV_PATH_SEP"):
+                op = self.next().value
+                return ast.BinaryExpression(
+                    filter_expr, op, self.relative_location_path()
+                )
+            return filter_expr
+        return self.relative_location_path()
+
+    def starts_filter_expr(self):
+        type = self.peek()
+        if type in ("DOLLAR", "LITERAL", "FLOAT", "INTEGER", "FUNCNAME", "OPEN_PAREN"):
+            return True
+        return (
+            type == "NCNAME" and self.peek(1) == "COLON" and self.peek(2) == "FUNCNAME"
+        )
+
+    def relative_location_path(self):
+        path = self.step()
+        while self.peek() in ("PATH_SEP", "ABBREV_PATH_SEP"):
+            op = self.next().value
+            path = ast.BinaryExpression(path, op, self.step())
+        return path
+
+    def step(self):
+        type = self.peek()
+        if type in ("ABBREV_STEP_SELF", "ABBREV_STEP_PARENT"):
+            return ast.AbbreviatedStep(self.next().value)
+        axis = None
+        if type == "AXISNAME":
+            axis = self.next().value
+            self.expect("AXIS_SEP")
+        elif type == "ABBREV_AXIS_AT":
+            self.next()
+            axis = "@"
+        node_test = self.node_test()
+        return ast.Step(axis, node_test, self.predicates())
+
+    def node_test(self):
+        type = self.peek()
+        if type == "STAR_OP":
+            return ast.NameTest(None, self.next().value)
+        if type == "NODETYPE":
+            name = self.next().value
+            self.expect("OPEN_PAREN")
+            literal = None
+            if self.peek() == "LITERAL":
+                literal = self.next().value
+            self.expect("CLOSE_PAREN")
+            return ast.NodeType(name, literal)
+        if type == "NCNAME":
+            name = self.next().value
+            if self.peek() != "COLON":
+                return ast.NameTest(None, name)
+            self.next()
+            if self.peek() not in ("NCNAME", "STAR_OP"):
+                self.error()
+            return ast.NameTest(name, self.next().value)
+        self.error()
+
+    def predicates(self):
+        predicates = []
+        while self.peek() == "OPEN_BRACKET":
+            self.next()
+            predicates.append(self.expr())
+            self.expect("CLOSE_BRACKET")
+        return predicates
+
+    # filter expressions
+
+    def filter_expr(self):
+        type = self.peek()
+        if type == "DOLLAR":
+            self.next()
+            prefix, name = None, self.expect("NCNAME").value
+            if self.peek() == "COLON":
+                self.next()
+                prefix, name = name, self.expect("NCNAME").value
+            base = ast.VariableReference((prefix, name))
+        elif type in ("LITERAL", "FLOAT", "INTEGER"):
+            base = self.next().value
+        elif type == "OPEN_PAREN":
+            self.next()
+            base = self.expr()
+            self.expect("CLOSE_PAREN")
+        else:
+            base = self.function_call()
+
+        while self.peek() == "OPEN_BRACKET":
+            self.next()
+            predicate = self.expr()
+            self.expect("CLOSE_BRACKET")
+            if not hasattr(base, "append_predicate"):
+                base = ast.PredicatedExpression(base)
+            base.append_predicate(predicate)
+        return base
+
+    def function_call(self):
+        prefix = None
+        if self.peek() == "NCNAME":
+            prefix = self.next().value
+            self.expect("COLON")
+        name = self.expect("FUNCNAME").value
+        self.expect("OPEN_PAREN")
+        args = []
+        if self.peek() != "CLOSE_PAREN":
+            args.append(self.expr())
+            while self.peek() == "COMMA":
+                self.next()
+                args.append(self.expr())
+        self.expect("CLOSE_PAREN")
+        return ast.FunctionCall(prefix, name, args)
+
+
+def parse(xpath):
+    """Parse an xpath into a tree of :mod:`neuxml.xpath.ast` nodes.
+
+    Raises :class:`TypeError` for text that cannot be lexed and
+    :class:`RuntimeError` for syntax errors, like the ply-based parser.
+    """
+    return _Parser(tokenize(xpath)).parse()
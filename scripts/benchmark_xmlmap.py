@@ -0,0 +1,266 @@
+# Copyright 2025 Center for Digital Humanities, Princeton University
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmarks for :mod:`neuxml.xmlmap` field access, run against a large
+EAD document built by replicating the components of the heaney653 test
+fixture.
+
+Usage::
+
+    python scripts/benchmark_xmlmap.py fields
+    python scripts/benchmark_xmlmap.py cerp
+    python scripts/benchmark_xmlmap.py lists
+    python scripts/benchmark_xmlmap.py dates
+"""
+
+import argparse
+import copy
+import email
+import os
+import timeit
+
+from datetime import datetime
+
+from lxml import etree
+
+from neuxml import xmlmap
+from neuxml.xmlmap import cerp, compiler, eadmap, fields
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "test",
+    "test_xmlmap",
+    "fixtures",
+    "heaney653.xml",
+)
+
+
+def large_ead(copies):
+    """Load the heaney653 EAD with its top-level dsc components repeated
+    `copies` times."""
+    tree = etree.parse(FIXTURE)
+    dsc = tree.find(".//{%s}dsc" % eadmap.EAD_NAMESPACE)
+    components = list(dsc.iterchildren("{%s}c01" % eadmap.EAD_NAMESPACE))
+    for _ in range(copies - 1):
+        dsc.extend(copy.deepcopy(component) for component in components)
+    return xmlmap.load_xmlobject_from_string(
+        etree.tostring(tree), eadmap.EncodedArchivalDescription
+    )
+
+
+def read_components(ead, held=None):
+    """Read a handful of simple fields from every component, adding the
+    components and the values read to `held` if it is a list."""
+    count = 0
+    components = list(ead.dsc.c)
+    while components:
+        component = components.pop()
+        component.level
+        component.id
+        did = component.did
+        values = [did.unittitle, did.unitid, did.physdesc, did.container]
+        count += 7
+        components.extend(component.c)
+        if held is not None:
+            held.extend([component, did] + values)
+    return count
+
+
+def uncompiled_xpath(field, context):
+    # stand-in for Field._get_xpath that evaluates with node.xpath()
+    return None
+
+
+def bench_fields(args):
+    ead = large_ead(args.copies)
+    accesses = read_components(ead)
+    print(
+        "Reading %d field values from components, best of %d x %d rounds"
+        % (accesses, args.repeat, args.number)
+    )
+    get_xpath = fields.Field._get_xpath
+    for label, enabled, xpath_cache, reuse in [
+        ("node.xpath()", False, False, False),
+        ("cached etree.XPath", False, True, False),
+        ("compiled xpath", True, True, False),
+        ("reused instances", True, True, True),
+    ]:
+        compiler.ENABLED = enabled
+        fields.Field._get_xpath = get_xpath if xpath_cache else uncompiled_xpath
+        xmlmap.XmlObject.REUSE_INSTANCES = reuse
+        # reused instances are kept only while something refers to them
+        held = []
+        if reuse:
+            read_components(ead, held)
+        seconds = min(
+            timeit.repeat(
+                lambda: read_components(ead), repeat=args.repeat, number=args.number
+            )
+        )
+        print(
+            "%-28s %10.2f us/access  (%.3fs)"
+            % (label, seconds * 1e6 / (accesses * args.number), seconds)
+        )
+    fields.Field._get_xpath = get_xpath
+    xmlmap.XmlObject.REUSE_INSTANCES = False
+
+
+def email_message(recipients):
+    """Build an email message with `recipients` To and Cc headers."""
+    lines = [
+        "From: Sender <sender@example.com>",
+        "Subject: Benchmark message",
+        "Date: Fri, 21 Nov 1997 09:55:06 -0600",
+        "Message-ID: <1234@example.com>",
+    ]
+    for i in range(recipients):
+        lines.append("To: Recipient %d <to%d@example.com>" % (i, i))
+        lines.append("Cc: Copied %d <cc%d@example.com>" % (i, i))
+    return email.message_from_string("\n".join(lines) + "\n\nHello.\n")
+
+
+def append_each(node_list, values):
+    # stand-in for NodeList.extend that appends values one at a time
+    for value in values:
+        node_list.append(value)
+
+
+def bench_cerp(args):
+    message = email_message(args.copies)
+    print(
+        "Converting a message with %d headers to CERP, best of %d x %d rounds"
+        % (len(message), args.repeat, args.number)
+    )
+    extend = fields.NodeList.extend
+    for label, method in [("append each", append_each), ("bulk extend", extend)]:
+        fields.NodeList.extend = method
+        seconds = min(
+            timeit.repeat(
+                lambda: cerp.Message.from_email_message(message),
+                repeat=args.repeat,
+                number=args.number,
+            )
+        )
+        print("%-28s %10.2f ms/message" % (label, seconds * 1e3 / args.number))
+    fields.NodeList.extend = extend
+
+
+class Values(xmlmap.XmlObject):
+    ROOT_NAME = "values"
+    strings = xmlmap.StringListField("v")
+    normalized = xmlmap.StringListField("v", normalize=True)
+    integers = xmlmap.IntegerListField("v")
+    floats = xmlmap.FloatListField("v")
+
+
+def convert_each(node_list, matches):
+    # stand-in for NodeList._convert that converts one node at a time
+    return [node_list.mapper.to_python(match) for match in matches]
+
+
+def bench_lists(args):
+    count = args.copies * 100
+    values = Values()
+    for i in range(count):
+        etree.SubElement(values.node, "v").text = " %d " % (i * 7)
+    print(
+        "Reading list fields with %d matches, best of %d x %d rounds"
+        % (count, args.repeat, args.number)
+    )
+    convert = fields.NodeList._convert
+    for name in ["strings", "normalized", "integers", "floats"]:
+        for label, method in [("each node", convert_each), ("bulk", convert)]:
+            fields.NodeList._convert = method
+            seconds = min(
+                timeit.repeat(
+                    lambda: getattr(values, name).data,
+                    repeat=args.repeat,
+                    number=args.number,
+                )
+            )
+            print(
+                "%-28s %10.2f ms/list"
+                % ("%s, %s" % (name, label), seconds * 1e3 / args.number)
+            )
+    fields.NodeList._convert = convert
+
+
+class Dates(xmlmap.XmlObject):
+    ROOT_NAME = "dates"
+    iso = xmlmap.DateTimeListField("iso")
+    formatted = xmlmap.DateTimeListField("formatted", format="%d/%m/%Y %H:%M")
+    dates = xmlmap.DateListField("date")
+
+
+def strptime_each(node_list, matches):
+    # stand-in for NodeList._convert that parses each value with strptime
+    mapper = node_list.mapper
+    values = []
+    for match in matches:
+        rep = match.text
+        if isinstance(mapper, fields.DateMapper):
+            values.append(datetime.strptime(rep, mapper.format).date())
+        elif mapper.format is not None:
+            values.append(datetime.strptime(rep, mapper.format))
+        else:
+            try:
+                values.append(datetime.strptime(rep, "%Y-%m-%dT%H:%M:%S"))
+            except ValueError:
+                values.append(datetime.strptime(rep, "%Y-%m-%dT%H:%M:%S.%f"))
+    return values
+
+
+def bench_dates(args):
+    count = args.copies * 100
+    dates = Dates()
+    for i in range(count):
+        value = datetime(2000 + i % 25, 1 + i % 12, 1 + i % 28, i % 24, i % 60)
+        etree.SubElement(dates.node, "iso").text = value.isoformat()
+        etree.SubElement(dates.node, "formatted").text = value.strftime(
+            "%d/%m/%Y %H:%M"
+        )
+        etree.SubElement(dates.node, "date").text = value.date().isoformat()
+    print(
+        "Reading date list fields with %d matches, best of %d x %d rounds"
+        % (count, args.repeat, args.number)
+    )
+    convert = fields.NodeList._convert
+    for name in ["iso", "formatted", "dates"]:
+        for label, method in [("strptime", strptime_each), ("bulk", convert)]:
+            fields.NodeList._convert = method
+            seconds = min(
+                timeit.repeat(
+                    lambda: getattr(dates, name).data,
+                    repeat=args.repeat,
+                    number=args.number,
+                )
+            )
+            print(
+                "%-28s %10.2f ms/list"
+                % ("%s, %s" % (name, label), seconds * 1e3 / args.number)
+            )
+    fields.NodeList._convert = convert
+
+
+def main(arg_list=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats")
+    parser.add_argument("--number", type=int, default=3, help="rounds per repeat")
+    parser.add_argument(
+        "--copies", type=int, default=50, help="copies of the fixture components"
+    )
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    for name, func, help in [
+        ("fields", bench_fields, "field access latency with compiled xpaths"),
+        ("cerp", bench_cerp, "converting an email message with many headers"),
+        ("lists", bench_lists, "converting the values of long list fields"),
+        ("dates", bench_dates, "parsing the values of long date list fields"),
+    ]:
+        subparsers.add_parser(name, help=help).set_defaults(func=func)
+    args = parser.parse_args(arg_list)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# Copyright 2025 Center for Digital Humanities, Princeton University
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmarks for :mod:`neuxml.xpath`, run against the xpath expressions
+declared on the :class:`~neuxml.xmlmap.XmlObject` classes shipped with
+neuxml.
+
+Usage::
+
+    python scripts/benchmark_xpath.py lex
+    python scripts/benchmark_xpath.py parse
+    python scripts/benchmark_xpath.py import
+    python scripts/benchmark_xpath.py models
+"""
+
+import argparse
+from collections import deque
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from neuxml.xpath import core, persist
+
+XMLMAP_MODULES = [
+    "neuxml.xmlmap.core",
+    "neuxml.xmlmap.cerp",
+    "neuxml.xmlmap.dc",
+    "neuxml.xmlmap.eadmap",
+    "neuxml.xmlmap.mods",
+    "neuxml.xmlmap.premis",
+    "neuxml.xmlmap.teimap",
+]
+
+
+def field_xpaths():
+    """Return the unique xpaths of all fields declared on xmlobject classes
+    in :mod:`neuxml.xmlmap` submodules."""
+    from neuxml.xmlmap import XmlObject
+
+    xpaths = set()
+    for module_name in XMLMAP_MODULES:
+        module = importlib.import_module(module_name)
+        for value in vars(module).values():
+            if isinstance(value, type) and issubclass(value, XmlObject):
+                xpaths.update(field.xpath for field in value._fields.values())
+    return sorted(xpaths)
+
+
+class ClonePeekLexer(core.LexerWrapper):
+    """Lexer with the previous one-token lookahead, which cloned the
+    whole lexer for every peek; used for comparison."""
+
+    def peek(self):
+        clone = self.clone()
+        clone.lookahead = deque(self.lookahead)
+        return core.LexerWrapper.token(clone)
+
+
+def count_tokens(lexer, xpaths):
+    count = 0
+    for xpath in xpaths:
+        lexer.input(xpath)
+        while lexer.token() is not None:
+            count += 1
+    return count
+
+
+def report(label, count, seconds):
+    print("%-28s %10.0f tokens/s  (%.3fs)" % (label, count / seconds, seconds))
+
+
+def bench_lex(args):
+    xpaths = field_xpaths()
+    buffered = core.lexer.clone()
+    clone_peek = core.lexer.clone()
+    clone_peek.__class__ = ClonePeekLexer
+
+    tokens = count_tokens(buffered, xpaths)
+    assert tokens == count_tokens(clone_peek, xpaths)
+    print(
+        "Lexing %d field xpaths (%d tokens), best of %d x %d rounds"
+        % (len(xpaths), tokens, args.repeat, args.number)
+    )
+    for label, lexer in [
+        ("clone-per-peek lookahead", clone_peek),
+        ("buffered lookahead", buffered),
+    ]:
+        seconds = min(
+            timeit.repeat(
+                lambda: count_tokens(lexer, xpaths),
+                repeat=args.repeat,
+                number=args.number,
+            )
+        )
+        report(label, tokens * args.number, seconds)
+
+
+def parse_all(parse, xpaths):
+    for xpath in xpaths:
+        parse(xpath)
+
+
+def bench_parse(args):
+    xpaths = field_xpaths()
+    print(
+        "Parsing %d field xpaths without caching, best of %d x %d rounds"
+        % (len(xpaths), args.repeat, args.number)
+    )
+    for engine in core.PARSER_ENGINES:
+        core.set_parser_engine(engine)
+        seconds = min(
+            timeit.repeat(
+                lambda: parse_all(core._parse, xpaths),
+                repeat=args.repeat,
+                number=args.number,
+            )
+        )
+        print(
+            "%-28s %10.0f xpaths/s  (%.3fs)"
+            % (engine, len(xpaths) * args.number / seconds, seconds)
+        )
+
+
+# older development installs may import neuxml.xpath.core at interpreter
+# startup (through a hatch autorun hook), so forget it before timing
+TIMER_SCRIPT = """
+import sys, time
+for name in list(sys.modules):
+    if name.split(".")[0] == "neuxml":
+        del sys.modules[name]
+start = time.perf_counter()
+%s
+print(time.perf_counter() - start)
+"""
+
+IMPORT_SCRIPT = TIMER_SCRIPT % (
+    'import neuxml.xpath.core\nneuxml.xpath.core.parse("e:did/e:unittitle")'
+)
+
+MODELS_SCRIPT = TIMER_SCRIPT % "\n".join("import %s" % mod for mod in XMLMAP_MODULES)
+
+
+def time_script(script, env, repeat):
+    """Run a timing script in new interpreters; return the best time"""
+    return min(
+        float(
+            subprocess.check_output([sys.executable, "-c", script], env=env, text=True)
+        )
+        for i in range(repeat)
+    )
+
+
+def bench_import(args):
+    print(
+        "Time to import neuxml.xpath.core and parse one xpath in a new "
+        "interpreter, best of %d" % args.repeat
+    )
+    for engine in core.PARSER_ENGINES:
+        env = dict(os.environ)
+        env[core.PARSER_ENGINE_ENV] = engine
+        seconds = time_script(IMPORT_SCRIPT, env, args.repeat)
+        print("%-28s %10.1f ms" % (engine, seconds * 1000))
+
+
+def bench_models(args):
+    print(
+        "Time to import all neuxml.xmlmap modules in a new interpreter, "
+        "best of %d" % args.repeat
+    )
+    env = dict(os.environ)
+    env.pop(persist.CACHE_ENV, None)
+    seconds = time_script(MODELS_SCRIPT, env, args.repeat)
+    print("%-28s %10.1f ms" % ("no persistent cache", seconds * 1000))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env[persist.CACHE_ENV] = os.path.join(tmpdir, "xpath.pickle")
+        # the first run fills the cache
+        time_script(MODELS_SCRIPT, env, 1)
+        seconds = time_script(MODELS_SCRIPT, env, args.repeat)
+    print("%-28s %10.1f ms" % ("persistent cache", seconds * 1000))
+
+
+def main(arg_list=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats")
+    parser.add_argument("--number", type=int, default=20, help="rounds per repeat")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    for name, func, help in [
+        ("lex", bench_lex, "lexing throughput"),
+        ("parse", bench_parse, "parser engine throughput"),
+        ("import", bench_import, "parser engine import time"),
+        ("models", bench_models, "xmlmap import time with the persistent cache"),
+    ]:
+        subparsers.add_parser(name, help=help).set_defaults(func=func)
+    args = parser.parse_args(arg_list)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# Copyright 2025 Center for Digital Humanities, Princeton University
+# SPDX-License-Identifier: Apache-2.0
+
+"""Regenerate the ply lexer and parser tables shipped in neuxml.xpath.
+
+Run this after changing neuxml/xpath/lexrules.py or
+neuxml/xpath/parserules.py, and commit the updated lextab.py and
+parsetab.py.
+"""
+
+import argparse
+import os
+
+from neuxml.xpath import core
+
+
+def main(arg_list=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "outputdir",
+        nargs="?",
+        default=os.path.dirname(core.__file__),
+        help="directory for lextab.py and parsetab.py (default: %(default)s)",
+    )
+    args = parser.parse_args(arg_list)
+    core.build_tables(args.outputdir)
+
+
+if __name__ == "__main__":
+    main()
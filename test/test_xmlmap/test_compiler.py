@@ -0,0 +1,236 @@
+# file test_xmlmap/test_compiler.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import unittest
+from unittest.mock import patch
+
+from lxml import etree
+
+from neuxml import xmlmap
+from neuxml.xmlmap import cerp, compiler, dc, eadmap, mods, premis, teimap  # noqa: F401
+from neuxml.xpath.core import parse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+NAMESPACES = {"ex": "http://example.com/", "ot": "http://other.com/"}
+
+FIXTURE_TEXT = """<root xmlns:ex="http://example.com/" id="r" ex:id="exr">
+  head<!-- comment -->text<?pi data?>tail<![CDATA[cdata]]>
+  <a n="1" type="x"><b>one</b><b>two</b></a>
+  <ex:a n="2"><b>three</b></ex:a>
+  <a n="3"><b>four</b><c type="y">c</c></a>
+  <a n="4" type="x"><role><term>creator</term></role></a>
+  <c/>
+  <!-- trailing -->
+</root>"""
+
+XPATHS = [
+    ".",
+    "a",
+    "./a",
+    "ex:a",
+    "*",
+    "ex:*",
+    "a/b",
+    "a/./b",
+    "a/b/text()",
+    "text()",
+    "a/c/text()",
+    "@id",
+    "@ex:id",
+    "@missing",
+    "a/@n",
+    "a[2]",
+    "a[5]",
+    "a[2]/b[1]",
+    "a/b[2]",
+    "a[@type]",
+    "a[not(@type)]",
+    "a[@type='x']",
+    "a['x'=@type][2]",
+    "a[@type='x'][1]/@n",
+    "a[c]",
+    "a[b='four']",
+    "a[b='four' ]/c/@type",
+    "a|c",
+    "c|ex:a|a",
+]
+
+# expressions the compiler leaves to lxml
+UNSUPPORTED = [
+    "..",
+    ".//b",
+    "a//b",
+    "/root",
+    "@*",
+    "a[0]",
+    "a[1.5]",
+    "a[last()]",
+    "a[role/term='creator']",
+    "a[@n=2]",
+    "a[@type!='x']",
+    "a[$var]",
+    "count(a)",
+    "string(a)",
+    "a|c/b",
+    "undeclared:a",
+    "node()",
+    "comment()",
+    "following-sibling::a",
+]
+
+
+def _parent(node):
+    # the element a smart string result came from
+    return node.getparent() if isinstance(node, str) else node
+
+
+class CompileXpathTest(unittest.TestCase):
+    def setUp(self):
+        self.root = etree.fromstring(FIXTURE_TEXT)
+
+    def assertSameResult(self, xpath, namespaces, nodes):
+        evaluate = compiler.compile_xpath(parse(xpath), namespaces)
+        self.assertIsNotNone(evaluate, xpath)
+        for node in nodes:
+            expected = node.xpath(xpath, namespaces=namespaces)
+            result = evaluate(node)
+            self.assertEqual(expected, result, xpath)
+            # attribute and text results are smart strings, like lxml's
+            self.assertEqual(
+                [_parent(value) for value in expected],
+                [_parent(value) for value in result],
+                xpath,
+            )
+
+    def test_supported(self):
+        nodes = list(self.root.iter("*"))
+        for xpath in XPATHS:
+            self.assertSameResult(xpath, NAMESPACES, nodes)
+
+    def test_unsupported(self):
+        for xpath in UNSUPPORTED:
+            self.assertIsNone(compiler.compile_xpath(parse(xpath), NAMESPACES), xpath)
+
+    def test_prefixes(self):
+        self.assertEqual(set(), compiler.prefixes(parse("a/b")))
+        self.assertEqual(
+            {"ex", "ot"},
+            compiler.prefixes(parse("ex:a[@ot:b='1']/c[not(ex:d)]")),
+        )
+
+    def test_fixture_fields(self):
+        # every compilable field xpath of the bundled xmlobjects gives the
+        # same result as lxml, starting from one element of each tag in the
+        # bundled fixtures
+        documents = []
+        for name in ["heaney653.xml", "tei_clarke.xml", "loc-premis-2.1.xml"]:
+            tree = etree.parse(os.path.join(FIXTURE_DIR, name))
+            nodes = {}
+            for node in tree.iter("*"):
+                nodes.setdefault(node.tag, node)
+            documents.append(list(nodes.values()))
+        compiled = 0
+        classes = [xmlmap.XmlObject]
+        while classes:
+            cls = classes.pop()
+            classes.extend(cls.__subclasses__())
+            for field in cls._fields.values():
+                evaluate = compiler.compile_xpath(
+                    field.parsed_xpath, cls.ROOT_NAMESPACES
+                )
+                if evaluate is None:
+                    continue
+                compiled += 1
+                for nodes in documents:
+                    for node in nodes:
+                        self.assertEqual(
+                            node.xpath(field.xpath, namespaces=cls.ROOT_NAMESPACES),
+                            evaluate(node),
+                            field.xpath,
+                        )
+        self.assertTrue(compiled > 400)
+
+
+class CompiledFieldTest(unittest.TestCase):
+    class CompiledObject(xmlmap.XmlObject):
+        ROOT_NAMESPACES = {"ex": "http://example.com/"}
+        id = xmlmap.StringField("@id")
+        first_b = xmlmap.StringField("a/b")
+        typed = xmlmap.IntegerField("a[@type='x'][2]/@n")
+        text = xmlmap.StringField("text()")
+        ex_a = xmlmap.NodeField("ex:a", xmlmap.XmlObject)
+        bs = xmlmap.StringListField("a/b")
+        count = xmlmap.IntegerField("count(a)")
+
+    def setUp(self):
+        self.obj = xmlmap.load_xmlobject_from_string(FIXTURE_TEXT, self.CompiledObject)
+
+    def test_get(self):
+        compiled = [
+            self.obj.id,
+            self.obj.first_b,
+            self.obj.typed,
+            self.obj.text,
+            self.obj.ex_a.node,
+            list(self.obj.bs),
+            self.obj.count,
+        ]
+        self.assertEqual(
+            ["r", "one", 4, "\n  head", "four"], compiled[:4] + [compiled[5][2]]
+        )
+        with patch.object(compiler, "ENABLED", False):
+            self.assertEqual(
+                compiled,
+                [
+                    self.obj.id,
+                    self.obj.first_b,
+                    self.obj.typed,
+                    self.obj.text,
+                    self.obj.ex_a.node,
+                    list(self.obj.bs),
+                    self.obj.count,
+                ],
+            )
+        self.assertIsNotNone(self.CompiledObject.id._get_evaluator(self.obj.context))
+        self.assertIsNone(self.CompiledObject.count._get_evaluator(self.obj.context))
+
+    def test_smart_strings(self):
+        # compiled attribute and text() values can find their element
+        self.assertIs(self.obj.node, self.obj.id.getparent())
+        self.assertIs(self.obj.node, self.obj.text.getparent())
+        evaluate = self.CompiledObject.typed._get_evaluator(self.obj.context)
+        self.assertEqual(
+            self.obj.node.xpath("a[@n='4']"),
+            [value.getparent() for value in evaluate(self.obj.node)],
+        )
+
+    def test_context(self):
+        # variables and other xpath context disable compiled evaluation
+        context = dict(self.obj.context, var="x")
+        self.assertIsNone(self.CompiledObject.id._get_evaluator(context))
+        self.assertEqual(
+            "r", self.CompiledObject.id.get_for_node(self.obj.node, context)
+        )
+        # evaluators are cached by the namespaces of the prefixes used
+        field = self.CompiledObject.ex_a
+        evaluate = field._get_evaluator(self.obj.context)
+        other = {"namespaces": dict(self.obj.context["namespaces"], ot="urn:x")}
+        self.assertIs(evaluate, field._get_evaluator(other))
+        other["namespaces"]["ex"] = "urn:y"
+        self.assertIsNot(evaluate, field._get_evaluator(other))
+        self.assertIsNone(field.get_for_node(self.obj.node, other))
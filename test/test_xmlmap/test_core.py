@@ -17,12 +17,17 @@
 
 #!/usr/bin/env python
 
+import copy
+import gc
 from lxml import etree
 import os
+import pickle
 import unittest
+from unittest.mock import patch
 import tempfile
 
 from neuxml import xmlmap
+from neuxml.xmlmap.fields import FrozenContext
 
 
 class TestXsl(unittest.TestCase):
@@ -448,6 +453,293 @@ class TestXmlObject(unittest.TestCase):
         self.assertEqual(init_values["bool"], obj.bool)
 
 
+class CachedChild(xmlmap.XmlObject):
+    CACHE_FIELD_VALUES = True
+    name = xmlmap.StringField("@name")
+
+
+class CachedObject(xmlmap.XmlObject):
+    CACHE_FIELD_VALUES = True
+    title = xmlmap.StringField("title")
+    child = xmlmap.NodeField("child", CachedChild)
+    children = xmlmap.NodeListField("child", CachedChild)
+    names = xmlmap.StringListField("child/@name")
+    count = xmlmap.IntegerField("count(child)")
+
+
+class TestCachedFieldValues(unittest.TestCase):
+    FIXTURE = "<doc><title>one</title><child name='a'/><child name='b'/></doc>"
+
+    def setUp(self):
+        self.obj = xmlmap.load_xmlobject_from_string(self.FIXTURE, CachedObject)
+
+    def test_cached(self):
+        field = CachedObject._fields["title"]
+        with patch.object(
+            field, "get_for_node", wraps=field.get_for_node
+        ) as get_for_node:
+            self.assertEqual("one", self.obj.title)
+            self.assertEqual("one", self.obj.title)
+            self.assertEqual(1, get_for_node.call_count)
+        # nested objects are kept too
+        self.assertIs(self.obj.child, self.obj.child)
+        # but not shared between instances
+        other = CachedObject(self.obj.node)
+        self.assertIsNot(self.obj.child, other.child)
+        self.assertEqual(self.obj.child, other.child)
+
+    def test_setters(self):
+        other = CachedObject(self.obj.node)
+        self.assertEqual("one", other.title)
+        self.obj.title = "two"
+        self.assertEqual("two", self.obj.title)
+        self.assertEqual("two", other.title)
+        del self.obj.title
+        self.assertEqual(None, other.title)
+
+        # changes through a nested object
+        self.assertEqual("a", self.obj.child.name)
+        self.assertEqual(["a", "b"], self.obj.names)
+        self.obj.children[0].name = "c"
+        self.assertEqual("c", self.obj.child.name)
+        self.assertEqual(["c", "b"], self.obj.names)
+
+    def test_lists(self):
+        self.assertEqual(2, self.obj.count)
+        self.obj.children.append(CachedChild(etree.fromstring("<child/>")))
+        self.assertEqual(3, self.obj.count)
+        del self.obj.children[0]
+        self.assertEqual(2, self.obj.count)
+        self.obj.names[0] = "d"
+        self.assertEqual("d", self.obj.child.name)
+
+    def test_direct_changes(self):
+        self.assertEqual(2, self.obj.count)
+        self.obj.node.append(etree.Element("child"))
+        self.assertEqual(2, self.obj.count)
+        xmlmap.document_changed(self.obj.node)
+        self.assertEqual(3, self.obj.count)
+
+        # changes to another document do not invalidate the cache
+        other = xmlmap.load_xmlobject_from_string(self.FIXTURE, CachedObject)
+        self.assertEqual("one", self.obj.title)
+        other.title = "two"
+        field = CachedObject._fields["title"]
+        with patch.object(field, "get_for_node") as get_for_node:
+            self.assertEqual("one", self.obj.title)
+            get_for_node.assert_not_called()
+
+    def test_moved(self):
+        child = self.obj.children[0]
+        self.assertEqual("a", child.name)
+        # moved into another document, the child sees changes made there
+        holder = xmlmap.load_xmlobject_from_string(self.FIXTURE, CachedObject)
+        holder.children.append(child)
+        self.assertEqual("a", child.name)
+        holder.names[-1] = "c"
+        self.assertEqual("c", child.name)
+        child.node.set("name", "d")
+        xmlmap.document_changed(child.node)
+        self.assertEqual("d", child.name)
+
+    def test_assigned(self):
+        # assigning an object to a node field moves its children
+        child = xmlmap.load_xmlobject_from_string(
+            "<child name='a'><title>hello</title></child>", CachedObject
+        )
+        self.assertEqual("hello", child.title)
+        self.obj.child = child
+        self.assertEqual("one", self.obj.title)
+        self.assertEqual(None, child.title)
+        self.assertEqual(["hello"], self.obj.node.xpath("child[1]/title/text()"))
+
+    def test_deepcopy(self):
+        self.assertEqual("one", self.obj.title)
+        copied = copy.deepcopy(self.obj)
+        self.assertEqual("one", copied.title)
+        copied.title = "two"
+        self.assertEqual("two", copied.title)
+        self.assertEqual("one", self.obj.title)
+
+
+class SharedChild(xmlmap.XmlObject):
+    REUSE_INSTANCES = True
+    name = xmlmap.StringField("@name")
+
+
+class OtherChild(SharedChild):
+    pass
+
+
+class SharedObject(xmlmap.XmlObject):
+    child = xmlmap.NodeField("child", SharedChild)
+    children = xmlmap.NodeListField("child", SharedChild)
+    other = xmlmap.NodeField("child", OtherChild)
+
+
+class TestReusedInstances(unittest.TestCase):
+    FIXTURE = "<doc><child name='a'/><child name='b'/></doc>"
+
+    def setUp(self):
+        self.obj = xmlmap.load_xmlobject_from_string(self.FIXTURE, SharedObject)
+
+    def test_reused(self):
+        child = self.obj.child
+        self.assertIs(child, self.obj.child)
+        self.assertIs(child, self.obj.children[0])
+        self.assertEqual([child, self.obj.children[1]], list(self.obj.children))
+        self.assertIs(self.obj.children[1], self.obj.children[-1])
+        # shared by every object wrapping the document
+        self.assertIs(child, SharedObject(self.obj.node).child)
+        # but only for the same class
+        self.assertIsInstance(self.obj.other, OtherChild)
+        self.assertIsNot(child, self.obj.other)
+        self.assertEqual(child, self.obj.other)
+
+        # instances of other classes are created on every access
+        self.assertIsNot(self.obj.children, self.obj.children)
+        other = xmlmap.load_xmlobject_from_string(self.FIXTURE, CachedObject)
+        self.assertIsNot(other.children[0], other.children[0])
+
+    def test_changes(self):
+        child = self.obj.child
+        child.name = "c"
+        self.assertIs(child, self.obj.child)
+        self.assertEqual("c", self.obj.child.name)
+        # a new first child gets its own instance
+        self.obj.node.insert(0, etree.Element("child", name="d"))
+        self.assertEqual("d", self.obj.child.name)
+        self.assertIs(child, self.obj.children[1])
+        del self.obj.children[1]
+        self.assertIsNot(child, self.obj.children[1])
+
+    def test_released(self):
+        state = xmlmap.fields.document_state(self.obj.node)
+        child = self.obj.child
+        self.assertEqual(1, len(state.instances))
+        del child
+        gc.collect()
+        self.assertEqual(0, len(state.instances))
+
+
+class ContextLeaf(xmlmap.XmlObject):
+    value = xmlmap.StringField("a:value")
+
+
+class ContextBranch(xmlmap.XmlObject):
+    leaf = xmlmap.NodeField("a:leaf", ContextLeaf)
+    leaves = xmlmap.NodeListField("a:leaf", ContextLeaf)
+    branches = xmlmap.NodeListField("a:branch", "self")
+
+
+class ContextRoot(xmlmap.XmlObject):
+    ROOT_NAMESPACES = {"r": "urn:root"}
+    branch = xmlmap.NodeField("a:branch", ContextBranch)
+    leaf = xmlmap.NodeField("a:branch/a:leaf", ContextLeaf)
+
+
+class TestSharedContext(unittest.TestCase):
+    FIXTURE = """<doc xmlns:a="urn:a">
+      <a:branch>
+        <a:leaf><a:value>1</a:value></a:leaf>
+        <a:leaf><a:value>2</a:value></a:leaf>
+        <a:branch xmlns:b="urn:b"><a:leaf><a:value>3</a:value></a:leaf></a:branch>
+      </a:branch>
+    </doc>"""
+
+    def setUp(self):
+        self.obj = xmlmap.load_xmlobject_from_string(self.FIXTURE, ContextRoot)
+
+    def assertContext(self, obj):
+        # the context an object created on its own would have
+        self.assertEqual(type(obj)(obj.node).context, obj.context)
+
+    def test_shared(self):
+        branch = self.obj.branch
+        self.assertIsInstance(branch.context, FrozenContext)
+        self.assertContext(branch)
+        # shared by children in scope of the same namespaces
+        self.assertIs(branch.context, branch.leaf.context)
+        self.assertIs(branch.context, branch.leaves[1].context)
+        self.assertEqual(["1", "2"], [leaf.value for leaf in branch.leaves])
+        # but not with a parent with other root namespaces
+        self.assertNotEqual(self.obj.context, branch.context)
+        self.assertContext(self.obj.leaf)
+
+        # a child element declaring a namespace gets its own context
+        nested = branch.branches[0]
+        self.assertIsNot(branch.context, nested.context)
+        self.assertEqual("urn:b", nested.context["namespaces"]["b"])
+        self.assertContext(nested)
+        self.assertIs(nested.context, nested.leaf.context)
+        self.assertEqual("3", nested.leaf.value)
+
+        # or if it is passed to an object of another class
+        root = ContextRoot(branch.node, context=branch.context)
+        self.assertIsNot(branch.context, root.context)
+        self.assertContext(root)
+
+    def test_read_only(self):
+        context = self.obj.branch.context
+        self.assertRaises(TypeError, context.update, {"smart_strings": False})
+        self.assertRaises(TypeError, context.__setitem__, "namespaces", {})
+        # so are its namespaces, with an error that says why
+        with self.assertRaisesRegex(TypeError, "read-only"):
+            context["namespaces"]["b"] = "urn:b"
+        self.assertRaises(TypeError, context["namespaces"].update, b="urn:b")
+        self.assertNotIn("b", context["namespaces"])
+        # copies of the context can be changed
+        for other in [
+            context.copy(),
+            copy.copy(context),
+            copy.deepcopy(context),
+            copy.deepcopy(self.obj.branch).context,
+            pickle.loads(pickle.dumps(context)),
+        ]:
+            self.assertNotIsInstance(other, FrozenContext)
+            self.assertEqual(context["namespaces"], other["namespaces"])
+            other["namespaces"]["b"] = "urn:b"
+            self.assertEqual("urn:b", other["namespaces"]["b"])
+            self.assertNotIn("b", context["namespaces"])
+        # a plain dict of the context shares its namespaces, which can be
+        # replaced but not changed
+        other = dict(context, smart_strings=False)
+        self.assertRaises(TypeError, other["namespaces"].update, b="urn:b")
+        other["namespaces"] = dict(other["namespaces"], b="urn:b")
+        self.assertNotIn("b", context["namespaces"])
+        # and it can still be used as the context of a new object
+        branch = ContextBranch(self.obj.branch.node, other)
+        self.assertEqual("urn:b", branch.context["namespaces"]["b"])
+        branch = ContextBranch(self.obj.branch.node, {**context})
+        self.assertEqual(context["namespaces"], branch.context["namespaces"])
+        self.assertEqual("urn:a", context.get("namespaces")["a"])
+
+    def test_smart_string_context(self):
+        # objects wrapping an lxml 'smart' string use the namespaces of
+        # its parent element
+        value = self.obj.branch.node.xpath(
+            "a:branch/a:leaf/a:value/text()", namespaces={"a": "urn:a"}
+        )[0]
+        expected = {"a": "urn:a", "b": "urn:b"}
+        self.assertEqual(expected, ContextLeaf(value).context["namespaces"])
+        leaf = ContextLeaf(value, context=self.obj.branch.context)
+        self.assertIsInstance(leaf.context, FrozenContext)
+        self.assertEqual(expected, leaf.context["namespaces"])
+
+    def test_compiled_xpaths(self):
+        branch = self.obj.branch
+        field = ContextBranch._fields["leaves"]
+        xpath = field._get_xpath(branch.context)
+        self.assertIs(xpath, field._get_xpath(branch.context))
+        self.assertIs(branch.context, field._xpath_for_context[0])
+        field = ContextLeaf._fields["value"]
+        evaluate = field._get_evaluator(branch.context)
+        self.assertIs(evaluate, field._evaluator_for_context[1])
+        # ordinary contexts are looked up by namespace
+        self.assertIs(evaluate, field._get_evaluator(dict(branch.context)))
+        self.assertIs(branch.context, field._evaluator_for_context[0])
+
+
 class TestLoadSchema(unittest.TestCase):
     def test_load_schema(self):
         schema = xmlmap.loadSchema("http://www.w3.org/2001/xml.xsd")
@@ -17,11 +17,23 @@
 
 #!/usr/bin/env python
 
+from array import array
+import copy
 from datetime import datetime, date
+import math
 import tempfile
 import unittest
 
+from lxml import etree
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from neuxml import xmlmap
+from neuxml.xmlmap import fields
+from neuxml.xpath.core import serialize
 
 
 class TestFields(unittest.TestCase):
@@ -66,6 +78,76 @@ class TestFields(unittest.TestCase):
 
     def testInvalidXpath(self):
         self.assertRaises(Exception, xmlmap.StringField, '["')
+        self.assertRaises(Exception, xmlmap.StringListField, '["')
+
+    def testParsedXpath(self):
+        # xpaths are parsed on first use
+        field = xmlmap.StringField("foo/bar")
+        self.assertIsNone(field._parsed_xpath)
+        self.assertEqual("foo/bar", serialize(field.parsed_xpath))
+        self.assertIs(field.parsed_xpath, field._parsed_xpath)
+
+        # or by the metaclass, once for each distinct xpath of a class
+        class TwiceObject(xmlmap.XmlObject):
+            value = xmlmap.StringField("twice/value")
+            values = xmlmap.StringListField("twice/value")
+
+        value = TwiceObject._fields["value"]
+        values = TwiceObject._fields["values"]
+        self.assertIsNotNone(value._parsed_xpath)
+        self.assertIs(value._parsed_xpath, values._parsed_xpath)
+
+    def testCompiledXpathCache(self):
+        class TestObject(xmlmap.XmlObject):
+            bazs = xmlmap.IntegerListField("bar/baz")
+            baz = xmlmap.IntegerField("bar[baz=$n]/baz")
+            ex = xmlmap.StringField("ex:missing[last()]")
+
+        field = TestObject._fields["bazs"]
+        obj = TestObject(self.fixture)
+        self.assertEqual([42, 13], obj.bazs)
+        self.assertEqual([42, 13], TestObject(self.fixture).bazs)
+        # one compiled xpath, shared by every object with the same namespaces
+        self.assertEqual(1, len(field._xpaths))
+        compiled = list(field._xpaths.values())[0]
+        self.assertIsInstance(compiled, etree.XPath)
+        self.assertIs(compiled, field._get_xpath(obj.context))
+
+        # variables are passed when the compiled xpath is evaluated
+        field = TestObject._fields["baz"]
+        context = {"namespaces": self.namespaces, "n": 13}
+        self.assertEqual(13, field.get_for_node(self.fixture, context))
+        context["n"] = 42
+        self.assertEqual(42, field.get_for_node(self.fixture, context))
+        self.assertEqual(1, len(field._xpaths))
+
+        # xpaths are compiled for each namespace they use
+        field = TestObject._fields["ex"]
+        field.get_for_node(self.fixture, {"namespaces": self.namespaces})
+        field.get_for_node(
+            self.fixture, {"namespaces": dict(self.namespaces, other="urn:x")}
+        )
+        self.assertEqual(1, len(field._xpaths))
+        field.get_for_node(self.fixture, {"namespaces": {"ex": "urn:x"}})
+        self.assertEqual(2, len(field._xpaths))
+
+        # extension functions are left to node.xpath
+        self.assertIsNone(field._get_xpath({"extensions": {}}))
+
+        # compiled xpaths are left out of copies
+        field = TestObject._fields["bazs"]
+        copied = copy.deepcopy(field)
+        self.assertEqual({}, copied._xpaths)
+        self.assertEqual("bar/baz", copied.xpath)
+        self.assertEqual([42, 13], copied.get_for_node(self.fixture, obj.context))
+        field = TestObject._fields["ex"]
+        self.assertTrue(field._evaluators)
+        self.assertEqual({}, copy.deepcopy(field)._evaluators)
+
+        # python evaluators are bounded like compiled xpaths
+        for i in range(fields.XPATH_CACHE_SIZE + 1):
+            field._get_evaluator({"namespaces": {"ex": "urn:x%d" % i}})
+        self.assertLessEqual(len(field._evaluators), fields.XPATH_CACHE_SIZE)
 
     def testNodeField(self):
         class TestSubobject(xmlmap.XmlObject):
@@ -344,6 +426,111 @@ class TestFields(unittest.TestCase):
         # check required
         self.assertFalse(obj._fields["missing"].required)
 
+    def testListConversion(self):
+        # list fields convert all of their matches at once, with the same
+        # results as converting each node with xpath
+        values = [
+            "42",
+            " -13 ",
+            "",
+            "1.5e3",
+            "2.675",
+            "1e",
+            "+1",
+            "-",
+            "12345678901234567890.123456789012345678901",
+            "0.0000000000000000000000001234567890123456789012345",
+            "5e-324",
+            "1e400",
+            " text \n with\t space\xa0",
+        ]
+        node = etree.Element("root")
+        for value in values:
+            etree.SubElement(node, "v", n=value).text = value
+        mixed = etree.SubElement(node, "v")
+        mixed.text = " 4"
+        etree.SubElement(mixed, "b").text = "2 "
+        etree.SubElement(mixed, "c").tail = "\n"
+        matches = node.xpath("v") + node.xpath("v/@n")
+
+        for mapper in [
+            fields.StringMapper(),
+            fields.StringMapper(normalize=True),
+            fields.IntegerMapper(),
+            fields.FloatMapper(),
+        ]:
+            expected = []
+            for match in matches:
+                try:
+                    expected.append(mapper.to_python(match))
+                except OverflowError:
+                    expected.append(OverflowError)
+            if isinstance(mapper, fields.IntegerMapper):
+                self.assertRaises(OverflowError, mapper.to_python_list, matches)
+                matches = [
+                    match
+                    for match in matches
+                    if not (isinstance(match, etree._Element) and match.text == "1e400")
+                ]
+                expected = [value for value in expected if value is not OverflowError]
+            converted = mapper.to_python_list(matches)
+            self.assertEqual(
+                [str(value) for value in expected],
+                [str(value) for value in converted],
+                "%s converts a list like each node" % mapper.__class__.__name__,
+            )
+            # strings are lxml smart strings, as xpath returns them
+            self.assertEqual(
+                [type(value) for value in expected],
+                [type(value) for value in converted],
+            )
+
+        # mappers that convert values their own way convert lists that way
+        class UpperMapper(fields.StringMapper):
+            def to_python(self, node):
+                return super(UpperMapper, self).to_python(node).upper()
+
+        class HalfMapper(fields.FloatMapper):
+            def to_python(self, node):
+                return super(HalfMapper, self).to_python(node) / 2
+
+        node = etree.fromstring("<root><v>a</v><v>4</v></root>")
+        self.assertEqual(["A", "4"], UpperMapper().to_python_list(list(node)))
+        self.assertEqual([2.0], HalfMapper().to_python_list(node[1:]))
+
+    def testXpathNumber(self):
+        # _xpath_number must read numbers as the libxml2 lxml uses does
+        number = etree.XPath("number()")
+        node = etree.Element("n")
+        for value in [
+            "0.1",
+            "-0",
+            "-.5",
+            ".",
+            "1.",
+            "1e+",
+            "1E-2",
+            ".5e1",
+            "1 2",
+            "\xa01",
+            "9007199254740993",
+            "1885758236351349410.131383004",
+            "73169764747261017.5089679e-40",
+            "0." + "0" * 400 + "1",
+            "1e" + "9" * 20,
+            "42",
+            " -7.25 ",
+            "0.00000000000000000000123456789012345678901234",
+            "5e-324",
+            "1e400",
+            "1e",
+            "+1",
+        ]:
+            node.text = value
+            self.assertEqual(
+                repr(number(node)), repr(fields._xpath_number(value)), repr(value)
+            )
+
     def testFloatField(self):
         class TestObject(xmlmap.XmlObject):
             val = xmlmap.IntegerField("bar[2]/baz", required=True)
@@ -384,10 +571,18 @@ class TestFields(unittest.TestCase):
         class TestObject(xmlmap.XmlObject):
             letter = xmlmap.ItemField("substring(bar/baz, 1, 1)")
             missing = xmlmap.ItemField("missing", required=False)
+            id = xmlmap.ItemField("@id")
+            text = xmlmap.ItemField("bar[2]/baz/text()")
 
         obj = TestObject(self.fixture)
         self.assertEqual(obj.letter, "4")
         self.assertEqual(obj.missing, None)
+        # attributes and text are lxml smart strings
+        self.assertEqual("a", obj.id)
+        self.assertTrue(obj.id.is_attribute)
+        self.assertIs(self.fixture, obj.id.getparent())
+        self.assertEqual("13", obj.text)
+        self.assertEqual("baz", obj.text.getparent().tag)
 
         # check required
         self.assertFalse(obj._fields["missing"].required)
@@ -499,6 +694,56 @@ class TestFields(unittest.TestCase):
             obj.node.xpath("string(datetime)"), today.strftime("%Y-%m-%dT%H:%M:%S")
         )
 
+    def testDateTimeParsing(self):
+        # values the fast paths read must parse the same as with strptime
+        for rep, format in [
+            ("2010-01-03T02:13:44", "%Y-%m-%dT%H:%M:%S"),
+            ("2010-01-03T02:13:44.003", "%Y-%m-%dT%H:%M:%S.%f"),
+            ("2010-01-03T02:13:44.000003", "%Y-%m-%dT%H:%M:%S.%f"),
+            ("03/01/2010 02:13", "%d/%m/%Y %H:%M"),
+            ("20100103", "%Y%m%d"),
+            ("2010-01-03 %", "%Y-%m-%d %%"),
+            ("02:13", "%H:%M"),
+            # not zero-padded or in another case, left to strptime
+            ("2010-1-3T2:13:44", "%Y-%m-%dT%H:%M:%S"),
+            ("2010-01-03t02:13:44", "%Y-%m-%dT%H:%M:%S"),
+            ("January 03, 2010", "%B %d, %Y"),
+        ]:
+            expected = datetime.strptime(rep, format)
+            self.assertEqual(expected, fields._parse_datetime(rep, format), rep)
+            self.assertEqual(expected, fields.DateTimeMapper(format).to_python(rep))
+            if "%f" in format or format == "%Y-%m-%dT%H:%M:%S":
+                self.assertEqual(expected, fields.DateTimeMapper().to_python(rep))
+
+        # out of range values are still rejected
+        for rep in [
+            "2010-13-03T02:13:44",
+            "2010-01-03T24:13:44",
+            "2010-02-30T02:13:44",
+        ]:
+            self.assertRaises(ValueError, fields.DateTimeMapper().to_python, rep)
+            self.assertRaises(
+                ValueError, fields._parse_datetime, rep, "%Y-%m-%dT%H:%M:%S"
+            )
+        self.assertRaises(ValueError, fields._parse_datetime, "02-29", "%m-%d")
+        mapper = fields.DateMapper()
+        self.assertEqual(date(2010, 1, 3), mapper.to_python("2010-01-03"))
+        self.assertEqual(date(2010, 1, 3), mapper.to_python("2010-1-3"))
+        self.assertRaises(ValueError, mapper.to_python, "2010-02-30")
+
+        # lists convert the same as each node
+        node = etree.Element("events")
+        for rep in ["2010-01-03T02:13:44Z", " 2013-05-01T00:00:00.5+05:00 "]:
+            etree.SubElement(node, "date").text = rep
+        for mapper, matches in [
+            (fields.DateTimeMapper(normalize=True), list(node)),
+            (fields.DateTimeMapper("%Y-%m-%dT%H:%M:%S.%f", normalize=True), node[1:]),
+        ]:
+            self.assertEqual(
+                [mapper.to_python(match) for match in matches],
+                mapper.to_python_list(matches),
+            )
+
     def testDateField(self):
         class TestObject(xmlmap.XmlObject):
             date = xmlmap.DateField("date")
@@ -673,6 +918,8 @@ class ListTestObject(xmlmap.XmlObject):
     int = xmlmap.IntegerListField("bar")
     letters = xmlmap.StringListField("l")
     empty = xmlmap.StringListField("missing")
+    empty_int = xmlmap.IntegerListField("missing")
+    floats = xmlmap.FloatListField("f")
     nodes = xmlmap.NodeListField("sub", SubList)
 
 
@@ -710,13 +957,144 @@ class TestNodeList(unittest.TestCase):
 
     def test_index_checking(self):
         self.assertRaises(TypeError, self.obj.str.__getitem__, "a")
-        self.assertRaises(AssertionError, self.obj.str.__getitem__, slice(0, 10))
         self.assertRaises(TypeError, self.obj.str.__setitem__, "a", "val")
-        self.assertRaises(
-            AssertionError, self.obj.str.__setitem__, slice(0, 10), ["val"]
-        )
         self.assertRaises(TypeError, self.obj.str.__delitem__, "a")
-        self.assertRaises(AssertionError, self.obj.str.__delitem__, slice(0, 10))
+        # extended slices must be assigned the same number of values
+        self.assertRaises(ValueError, self.obj.str.__setitem__, slice(0, 2, 2), [])
+        self.assertRaises(ValueError, self.obj.str.__getitem__, slice(0, 2, 0))
+
+    def test_slices(self):
+        letters = self.obj.letters
+        expected = ["a", "b", "a", "3", "c", "a", "7", "b", "11", "a", "y"]
+        for key in [
+            slice(None),
+            slice(2, 5),
+            slice(5, None),
+            slice(None, 3),
+            slice(-3, None),
+            slice(1, -1),
+            slice(-20, 20),
+            slice(8, 3),
+            slice(None, None, 3),
+            slice(1, 8, 2),
+            slice(None, None, -1),
+            slice(-2, 2, -2),
+        ]:
+            self.assertEqual(expected[key], letters[key], "slice %s" % key)
+        self.assertEqual(["side-a"], self.obj.nodes[0].parts[:1])
+        self.assertEqual([], self.obj.empty[1:])
+
+        # negative indices
+        self.assertEqual("y", letters[-1])
+        letters[-1] = "z"
+        del letters[-2]
+        expected[-1] = "z"
+        del expected[-2]
+        self.assertEqual(expected, letters)
+
+        # slice assignment reuses, adds and removes nodes as needed
+        for key, values in [
+            (slice(1, 3), ["p", "q"]),
+            (slice(1, 3), ["r", "s", "t", "u"]),
+            (slice(0, 6), ["v"]),
+            (slice(2, 2), ["w", "x"]),
+            (slice(-1, None), ["end", "after"]),
+            (slice(None, None, 2), ["e%d" % i for i in range(5)]),
+        ]:
+            letters[key] = values
+            expected[key] = values
+            self.assertEqual(expected, letters, "assign to slice %s" % key)
+        # new nodes are placed with the list items around them
+        self.assertEqual(
+            ["l"] * len(expected), [match.tag for match in letters.matches]
+        )
+        self.assertEqual(
+            ["l"] * len(expected) + ["sub"], [child.tag for child in self.obj.node][4:]
+        )
+        letters[:0] = ["first"]
+        expected[:0] = ["first"]
+        self.assertEqual("first", self.obj.node.xpath("string(l[1])"))
+
+        # slice deletion
+        for key in [slice(1, 3), slice(None, None, 2), slice(-2, None)]:
+            del letters[key]
+            del expected[key]
+            self.assertEqual(expected, letters, "delete slice %s" % key)
+
+        # node lists
+        nodes = [SubList(id=str(i)) for i in range(3)]
+        self.obj.nodes[1:] = nodes
+        self.assertEqual(["007", "0", "1", "2"], [node.id for node in self.obj.nodes])
+        self.obj.nodes[:2] = self.obj.nodes[2:]
+        # the xmlobjects are moved, not copied
+        self.assertEqual(["1", "2"], [node.id for node in self.obj.nodes])
+
+    def test_iter_window(self):
+        letters = self.obj.letters
+        expected = ["a", "b", "a", "3", "c", "a", "7", "b", "11", "a", "y"]
+        self.assertEqual(expected, list(letters.iter_window()))
+        self.assertEqual(expected, list(letters.iter_window(size=2)))
+        self.assertEqual(expected[3:7], list(letters.iter_window(3, 7, size=3)))
+        self.assertEqual(expected[-4:], list(letters.iter_window(-4, size=3)))
+        self.assertEqual(expected[2:-2], list(letters.iter_window(2, -2)))
+        self.assertEqual([], list(letters.iter_window(20)))
+        self.assertEqual([], list(self.obj.empty.iter_window()))
+        self.assertRaises(ValueError, letters.iter_window, size=0)
+        self.assertRaises(ValueError, letters.iter_window, 2, 5, -1)
+
+        # only the nodes in each window are converted
+        converted = []
+        to_python_list = letters.mapper.to_python_list
+
+        def convert(nodes):
+            converted.extend(nodes)
+            return to_python_list(nodes)
+
+        letters.mapper.to_python_list = convert
+        try:
+            window = letters.iter_window(1, size=2)
+            self.assertEqual(["b", "a"], [next(window), next(window)])
+            self.assertEqual(2, len(converted))
+            self.assertEqual(["a", "3", "c"], letters[2:5])
+            self.assertEqual(5, len(converted))
+        finally:
+            del letters.mapper.to_python_list
+
+    def test_iter_chunks(self):
+        # iterating converts a few matches at a time
+        letters = self.obj.letters
+        letters._chunk_size = 3
+        self.assertEqual(
+            ["a", "b", "a", "3", "c", "a", "7", "b", "11", "a", "y"], list(letters)
+        )
+        converted = []
+        to_python_list = letters.mapper.to_python_list
+
+        def convert(nodes):
+            converted.extend(nodes)
+            return to_python_list(nodes)
+
+        letters.mapper.to_python_list = convert
+        try:
+            self.assertIn("b", letters)
+            self.assertEqual(3, len(converted))
+            self.assertEqual("a", next(iter(letters)))
+            self.assertEqual(6, len(converted))
+        finally:
+            del letters.mapper.to_python_list
+
+        # values before one that cannot be converted are still generated
+        class DateList(xmlmap.XmlObject):
+            dates = xmlmap.DateListField("d")
+
+        obj = xmlmap.load_xmlobject_from_string(
+            "<r><d>2020-01-01</d><d>2020-01-02</d><d>bogus</d></r>", DateList
+        )
+        dates = iter(obj.dates)
+        self.assertEqual(
+            [date(2020, 1, 1), date(2020, 1, 2)], [next(dates), next(dates)]
+        )
+        self.assertRaises(ValueError, next, dates)
 
     def test_equals(self):
         # custom equal/not equals allows comparing to normal lists
@@ -1052,6 +1430,162 @@ class TestNodeList(unittest.TestCase):
             ["side-a", "side-b"], node.parts, "popped node has expected parts"
         )
 
+    def test_evaluate_once(self):
+        # each list operation should evaluate the xpath only once
+        calls = []
+
+        def evaluate(node):
+            calls.append(node)
+            return node.xpath("l")
+
+        letters = self.obj.letters
+        letters.evaluate = evaluate
+        for operation, args in [
+            (len, ()),
+            (letters.append, ("z",)),
+            (letters.__setitem__, (0, "x")),
+            (letters.__delitem__, (0,)),
+            (letters.insert, (1, "i")),
+            (letters.pop, ()),
+            (letters.pop, (0,)),
+            (letters.remove, ("a",)),
+            (letters.index, ("b",)),
+        ]:
+            del calls[:]
+            if operation is len:
+                args = (letters,)
+            operation(*args)
+            self.assertEqual(1, len(calls), "%s evaluates xpath once" % operation)
+        self.assertEqual(
+            ["i", "3", "c", "a", "7", "b", "11", "a", "y"],
+            self.obj.letters.data,
+        )
+
+    def test_set_and_delete_whole_list(self):
+        calls = []
+        field = ListTestObject._fields["letters"]
+
+        def evaluate(node):
+            calls.append(node)
+            return node.xpath("l")
+
+        def set_letters(values):
+            del calls[:]
+            field.manager.set(
+                field.xpath,
+                field.parsed_xpath,
+                self.obj.node,
+                self.obj.context,
+                field.mapper,
+                values,
+                evaluate,
+            )
+            self.assertEqual(1, len(calls))
+
+        # existing nodes are reused; extra values are added after them
+        first = self.obj.node.find("l")
+        set_letters(["x"] * 13)
+        self.assertEqual(["x"] * 13, self.obj.letters)
+        self.assertIs(first, self.obj.node.find("l"))
+        # extra nodes are removed from the end
+        set_letters(["a", "b", "a"])
+        self.assertEqual(["a", "b", "a"], self.obj.letters)
+        self.assertIs(first, self.obj.node.find("l"))
+
+        # deleting removes every match, duplicates included
+        del calls[:]
+        field.manager.delete(
+            field.xpath,
+            field.parsed_xpath,
+            self.obj.node,
+            self.obj.context,
+            field.mapper,
+            evaluate,
+        )
+        self.assertEqual(1, len(calls))
+        self.assertEqual([], self.obj.letters)
+        self.assertEqual(["sub"], [child.tag for child in self.obj.node][-1:])
+
+        # node lists can be reordered with their own xmlobjects
+        self.obj.nodes.extend([SubList(id="1"), SubList(id="2")])
+        self.obj.nodes = [self.obj.nodes[2], self.obj.nodes[0]]
+        self.assertEqual(["2", "007"], [node.id for node in self.obj.nodes])
+        self.obj.nodes = [SubList(id="3")] + list(self.obj.nodes)
+        self.assertEqual(["3", "2", "007"], [node.id for node in self.obj.nodes])
+        del self.obj.nodes
+        self.assertEqual([], self.obj.nodes)
+
+    def _add_floats(self):
+        for value in ["1.5", " 2e3 ", "-.25", None]:
+            etree.SubElement(self.obj.node, "f").text = value
+
+    def test_to_array(self):
+        self._add_floats()
+        self.assertEqual(array("q", [42, 13]), self.obj.int.to_array())
+        self.assertEqual(array("q"), self.obj.empty_int.to_array())
+        floats = self.obj.floats
+        self.assertEqual("d", floats.to_array().typecode)
+        self.assertEqual([1.5, 2000.0, -0.25], floats.to_array().tolist()[:3])
+        self.assertTrue(math.isnan(floats.to_array()[3]))
+        # integer lists can't have missing values
+        self.obj.int.append("n/a")
+        self.assertRaises(ValueError, self.obj.int.to_array)
+        # only numeric lists can be exported
+        self.assertRaises(TypeError, self.obj.letters.to_array)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_to_numpy(self):
+        self._add_floats()
+        values = self.obj.int.to_numpy()
+        self.assertEqual(numpy.int64, values.dtype)
+        self.assertEqual([42, 13], values.tolist())
+        self.assertEqual(numpy.float64, self.obj.floats.to_numpy().dtype)
+        numpy.testing.assert_array_equal(
+            numpy.array([1.5, 2000.0, -0.25, numpy.nan]), self.obj.floats.to_numpy()
+        )
+        self.assertRaises(ValueError, self.obj.floats.to_numpy, "int")
+        del self.obj.floats[-1]
+        self.assertEqual([1, 2000, 0], self.obj.floats.to_numpy("int").tolist())
+
+        # lists of integers are read in one go, as number() reads them
+        class Numbers(xmlmap.XmlObject):
+            ROOT_NAME = "numbers"
+            ints = xmlmap.IntegerListField("n")
+            floats = xmlmap.FloatListField("n")
+
+        numbers = Numbers()
+        numbers.ints = [" -007 ", "12\n", "-0"]
+        self.assertEqual([-7, 12, 0], numbers.ints.to_numpy().tolist())
+        values = numbers.floats.to_numpy()
+        self.assertEqual([-7.0, 12.0, 0.0], values.tolist())
+        self.assertEqual(-1.0, numpy.copysign(1, values[2]))
+        # integer lists can't have missing values, unless read as floats
+        self.obj.int.append("n/a")
+        self.assertRaises(ValueError, self.obj.int.to_numpy)
+        self.assertTrue(numpy.isnan(self.obj.int.to_numpy(float)[2]))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_set_from_numpy(self):
+        # setting a list from an array reuses, adds and removes nodes
+        self.obj.int = numpy.arange(5)
+        self.assertEqual([0, 1, 2, 3, 4], self.obj.int)
+        self.obj.floats = numpy.array([0.5, 0.1])
+        self.assertEqual([0.5, 0.1], self.obj.floats)
+        self.assertEqual(["0.5", "0.1"], self.obj.node.xpath("f/text()"))
+        self.obj.int[1:3] = numpy.array([7, 8, 9])
+        numpy.testing.assert_array_equal(
+            numpy.array([0, 7, 8, 9, 3, 4]), self.obj.int.to_numpy()
+        )
+
+    def test_len_does_not_convert(self):
+        # len() counts matching nodes without converting them
+        nodes = self.obj.nodes
+        nodes.mapper.to_python = None
+        try:
+            self.assertEqual(1, len(nodes))
+        finally:
+            del nodes.mapper.to_python
+
     def test_extend(self):
         letters = self.obj.letters
         letters.extend(["w", "d", "40"])
@@ -1084,6 +1618,57 @@ class TestNodeList(unittest.TestCase):
         self.assertEqual(node1.id, self.obj.nodes[1].id)
         self.assertEqual(node2.id, self.obj.nodes[2].id)
 
+    def test_extend_in_bulk(self):
+        class PredicateList(xmlmap.XmlObject):
+            ROOT_NAME = "root"
+            values = xmlmap.IntegerListField("group/value[@type='n']")
+
+        # new nodes are placed together, after the last existing match,
+        # with the nodes for the predicate copied
+        obj = PredicateList()
+        obj.values.extend(iter([1, 2]))
+        obj.node.append(etree.Element("end"))
+        obj.values.extend([3, 4, 5])
+        self.assertEqual([1, 2, 3, 4, 5], obj.values)
+        self.assertEqual(
+            b'<root><group><value type="n">1</value><value type="n">2</value>'
+            b'<value type="n">3</value><value type="n">4</value>'
+            b'<value type="n">5</value></group><end/></root>',
+            etree.tostring(obj.node),
+        )
+
+        # extending with nothing creates nothing
+        obj = PredicateList()
+        obj.values.extend([])
+        self.assertEqual(b"<root/>", etree.tostring(obj.node))
+
+        # node lists splice in the nodes of the xmlobjects, in order
+        nodes = [SubList(id=str(i)) for i in range(4)]
+        self.obj.nodes.extend(nodes)
+        self.assertEqual(
+            ["007", "0", "1", "2", "3"], [node.id for node in self.obj.nodes]
+        )
+        self.assertEqual(["sub"] * 5, [child.tag for child in self.obj.node][-5:])
+
+    def test_insert_attributes(self):
+        class AttributeList(xmlmap.XmlObject):
+            ROOT_NAME = "root"
+            ids = xmlmap.StringListField("v/@id")
+            texts = xmlmap.StringListField("v/text()")
+
+        # attribute and text values can be added to an empty list
+        obj = AttributeList()
+        obj.ids.insert(0, "a")
+        self.assertEqual(["a"], obj.ids)
+        obj.texts.insert(0, "x")
+        self.assertEqual(["x"], obj.texts)
+        self.assertEqual(b'<root><v id="a">x</v></root>', etree.tostring(obj.node))
+        # but not placed before an existing value
+        self.assertRaises(TypeError, obj.ids.insert, 0, "b")
+        self.assertRaises(TypeError, obj.texts.insert, 0, "y")
+        self.assertRaises(TypeError, obj.ids.__setitem__, slice(0, 0), ["b", "c"])
+        self.assertEqual(b'<root><v id="a">x</v></root>', etree.tostring(obj.node))
+
     def test_insert(self):
         letters = self.obj.letters
         orig_letters = list(letters.data)  # copy original letters for comparison
@@ -0,0 +1,190 @@
+# file test_xmlmap/test_streaming.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import unittest
+from copy import deepcopy
+from io import BytesIO
+
+from lxml import etree
+
+from neuxml import xmlmap
+from neuxml.xmlmap import cerp, eadmap
+from neuxml.xmlmap.streaming import StreamMatcher, iterfields, iterobjects
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+EAD_FIXTURE = os.path.join(FIXTURE_DIR, "heaney653.xml")
+CERP_FIXTURE = os.path.join(FIXTURE_DIR, "In.cerp")
+
+EAD_NAMESPACES = {"e": eadmap.EAD_NAMESPACE}
+
+
+def _summary(nodes):
+    # comparable form of xpath results; streamed elements are copies, so
+    # compare elements by position and content
+    return [
+        node
+        if isinstance(node, str)
+        else (node.sourceline, node.tag, etree.tostring(deepcopy(node)))
+        for node in nodes
+    ]
+
+
+class StreamMatcherTest(unittest.TestCase):
+    def assertStreamsLikeXpath(self, path, xpath, namespaces):
+        root = etree.parse(path).getroot()
+        expected = root.xpath(xpath, namespaces=namespaces)
+        matcher = StreamMatcher([xpath], namespaces)
+        found = [value for key, value in matcher.iterparse(path)]
+        # matched elements are generated as they end, so nested matches
+        # may come out of document order
+        self.assertEqual(
+            sorted(_summary(expected), key=str),
+            sorted(_summary(found), key=str),
+            xpath,
+        )
+        self.assertTrue(expected, xpath)
+
+    def test_ead(self):
+        for xpath in [
+            "/e:ead/e:eadheader/e:eadid",
+            "/e:ead/e:eadheader/e:eadid/@countrycode",
+            "e:archdesc/e:did/e:unittitle",
+            "e:archdesc/e:did/e:unittitle/text()",
+            "./e:archdesc/./e:did",
+            "//e:c02",
+            "//e:c01[@level='series']",
+            "//e:c02[@level]/@level",
+            "//e:did//e:unitdate",
+            ".//e:container/text()",
+            "e:archdesc//e:c02//e:container[@type='box']",
+            "e:archdesc/*/e:head",
+            "@id",
+        ]:
+            self.assertStreamsLikeXpath(EAD_FIXTURE, xpath, EAD_NAMESPACES)
+
+    def test_cerp(self):
+        for xpath in [
+            "//xm:Message/xm:Subject/text()",
+            "xm:Folder/xm:Message/xm:Header/xm:Name",
+        ]:
+            self.assertStreamsLikeXpath(
+                CERP_FIXTURE, xpath, cerp.Account.ROOT_NAMESPACES
+            )
+
+    def test_keys(self):
+        matcher = StreamMatcher(
+            {"id": "@id", "title": "e:archdesc/e:did/e:unittitle"}, EAD_NAMESPACES
+        )
+        self.assertEqual(
+            ["id", "title"], [key for key, value in matcher.iterparse(EAD_FIXTURE)]
+        )
+
+    def test_nested_descendants(self):
+        xml = b"<a><a><b/><c><b/></c></a></a>"
+        root = etree.fromstring(xml)
+        for xpath in ["//a//b", "//a//c//b", "a//b"]:
+            expected = root.xpath(xpath)
+            matcher = StreamMatcher([xpath])
+            found = [value for key, value in matcher.iterparse(BytesIO(xml))]
+            self.assertEqual(len(expected), len(found), xpath)
+
+    def test_first(self):
+        xml = b"<r><a n='1'><a/></a><a/><a n='2'>x<b/>y</a></r>"
+        matcher = StreamMatcher({"a": "//a", "n": "a/@n", "t": "a/text()"}, first=True)
+        found = list(matcher.iterparse(BytesIO(xml)))
+        self.assertEqual(
+            [("n", "1"), ("a", '<a n="1"><a/></a>'), ("t", "x")],
+            [
+                (
+                    key,
+                    value if isinstance(value, str) else etree.tostring(value).decode(),
+                )
+                for key, value in found
+            ],
+        )
+
+    def test_unsupported(self):
+        for xpath in [
+            "/",
+            "..",
+            "a[1]",
+            "a[b]",
+            "a[@b!='c']",
+            "a/@*",
+            "a//@b",
+            "a//text()",
+            "ancestor::a",
+            "e:*",
+            "x:a",
+            "count(a)",
+            "a|b",
+        ]:
+            self.assertRaises(ValueError, StreamMatcher, [xpath], EAD_NAMESPACES)
+
+    def test_memory(self):
+        # finished elements are removed from the document as it is parsed
+        xml = b"<r>" + b"<rec id='x'><v>1</v><w/></rec>" * 1000 + b"</r>"
+        matcher = StreamMatcher(["rec/v"])
+        matches = []
+        for key, element in matcher.iterparse(BytesIO(xml)):
+            matches.append(element)
+            parent = matches[0].getparent()
+            if parent is not None:
+                self.assertTrue(len(parent) <= 2)
+        self.assertEqual(1000, len(matches))
+        self.assertTrue(all(element.getparent() is None for element in matches))
+        self.assertEqual("1", matches[-1].text)
+
+
+class IterObjectsTest(unittest.TestCase):
+    def test_iterobjects(self):
+        ead = xmlmap.load_xmlobject_from_file(
+            EAD_FIXTURE, eadmap.EncodedArchivalDescription
+        )
+        expected = [
+            str(c.did.unittitle.short)
+            for c in ead.dsc.c
+            for c in c.c
+            if c.did.unittitle
+        ]
+        components = iterobjects(EAD_FIXTURE, "//e:c02", eadmap.Component)
+        found = [str(c.did.unittitle.short) for c in components if c.did.unittitle]
+        self.assertEqual(expected, found)
+        self.assertTrue(found)
+
+    def test_iterfields(self):
+        ead = xmlmap.load_xmlobject_from_file(
+            EAD_FIXTURE, eadmap.EncodedArchivalDescription
+        )
+        values = dict(iterfields(EAD_FIXTURE, eadmap.EncodedArchivalDescription))
+        self.assertIn("author", values)
+        self.assertEqual(
+            ["id", "author"],
+            [
+                name
+                for name, value in iterfields(
+                    EAD_FIXTURE, eadmap.EncodedArchivalDescription, ["id", "author"]
+                )
+            ],
+        )
+        for name in ["id", "author", "physical_desc"]:
+            self.assertEqual(getattr(ead, name), values[name])
+        self.assertEqual(ead.eadid.value, values["eadid"].value)
+
+        self.assertRaises(
+            ValueError, list, iterfields(EAD_FIXTURE, eadmap.Component, ["c"])
+        )
@@ -17,12 +17,42 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import subprocess
+import sys
+import tempfile
 import unittest
 
-from neuxml.xpath import ast
+from neuxml import xmlmap
+from neuxml.xpath import ast, core, rdparser
 from neuxml.xpath.core import parse, serialize
 
 
+# a sample of the xpath expressions used by neuxml's own xmlobjects, plus
+# some that exercise the trickier lexing rules
+SAMPLE_XPATHS = [
+    "e:c02|e:c03|e:c04|e:c05|e:c06|e:c07|e:c08|e:c09|e:c10|e:c11|e:c12",
+    "e:did/e:unittitle",
+    "mods:titleInfo[not(@type)]/mods:title",
+    "mods:name[mods:role/mods:roleTerm='creator']",
+    "tei:epigraph/tei:cit/tei:quote|tei:epigraph/tei:q",
+    "count(.//exist:match)",
+    "@xlink:href",
+    "normalize-space(.)",
+    "substring-after(.,':')",
+    "parent::parent/parent:parent",
+    "div div div",
+    "***",
+    "node/node()",
+    "boolean(boolean)",
+    "(book or article)[author/last-name = 'Jones']",
+    ".//a/@val[0]*-5",
+    "*[position() mod 2=1]",
+]
+
+
 class ParseTest(unittest.TestCase):
     def test_nametest_step(self):
         xp = parse("""author""")
@@ -165,6 +195,344 @@ class ParseTest(unittest.TestCase):
         self.assertRaises(RuntimeError, parse, """/bogus-(""")
 
 
+# Run in a fresh interpreter: import neuxml.xpath.core while recording any
+# file opened for writing, then parse an expression. Development installs
+# may import neuxml at startup, so forget any neuxml modules first.
+IMPORT_SCRIPT = """
+import builtins, io, sys
+for name in list(sys.modules):
+    if name.split(".")[0] == "neuxml":
+        del sys.modules[name]
+writes = []
+real_open = io.open
+def recording_open(file, mode="r", *args, **kwargs):
+    if set(mode) & set("wax+"):
+        writes.append(file)
+    return real_open(file, mode, *args, **kwargs)
+builtins.open = io.open = recording_open
+from neuxml.xpath import core
+print(core._parser is None)
+core.parse("e:did/e:unittitle")
+print(core._parser is None)
+print(writes)
+"""
+
+
+class TablesTest(unittest.TestCase):
+    def test_shipped_tables_current(self):
+        # the shipped tables must match those generated from the rules
+        xpath_dir = os.path.dirname(core.__file__)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            core.build_tables(tmpdir)
+            for name in ["lextab.py", "parsetab.py"]:
+                with open(os.path.join(xpath_dir, name)) as shipped:
+                    with open(os.path.join(tmpdir, name)) as generated:
+                        self.assertEqual(
+                            generated.read(),
+                            shipped.read(),
+                            "%s is out of date; run scripts/build_xpath_tables.py"
+                            % name,
+                        )
+
+    def test_lazy_build_without_writes(self):
+        output = subprocess.check_output(
+            [sys.executable, "-B", "-c", IMPORT_SCRIPT], text=True
+        )
+        self.assertEqual(["True", "False", "[]"], output.split("\n")[:3])
+
+    def test_module_lexer_parser(self):
+        self.assertTrue(isinstance(core.lexer, core.LexerWrapper))
+        self.assertTrue(core.parser is core._get_templates()[1])
+        self.assertRaises(AttributeError, getattr, core, "bogus")
+
+
+class LexTest(unittest.TestCase):
+    def lex_types(self, xpath):
+        lexer = core.lexer.clone()
+        lexer.input(xpath)
+        return [tok.type for tok in lexer]
+
+    def test_lookahead(self):
+        self.assertEqual(
+            ["NCNAME", "COLON", "NCNAME", "UNION_OP", "NCNAME", "COLON", "NCNAME"],
+            self.lex_types("e:c02|e:c03"),
+        )
+        self.assertEqual(
+            ["FUNCNAME", "OPEN_PAREN", "NODETYPE", "OPEN_PAREN", "CLOSE_PAREN"]
+            + ["CLOSE_PAREN"],
+            self.lex_types("count (text())"),
+        )
+        self.assertEqual(
+            ["AXISNAME", "AXIS_SEP", "NCNAME", "MULT_OP", "INTEGER"],
+            self.lex_types("child :: a * 2"),
+        )
+
+    def test_peek(self):
+        lexer = core.lexer.clone()
+        lexer.input("a/b")
+        self.assertEqual("a", lexer.peek().value)
+        self.assertEqual("a", lexer.peek().value)
+        self.assertEqual("a", lexer.token().value)
+        self.assertEqual("PATH_SEP", lexer.token().type)
+        self.assertEqual("b", lexer.token().value)
+        self.assertEqual(None, lexer.peek())
+        self.assertEqual(None, lexer.token())
+
+
+class ParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        core.clear_parse_cache()
+
+    def tearDown(self):
+        core.set_parse_cache_size(core.PARSE_CACHE_SIZE)
+        core.clear_parse_cache()
+
+    def test_cached(self):
+        xp = parse("a/b[@c='d']")
+        self.assertIs(xp, parse("a/b[@c='d']"))
+        info = core.parse_cache_info()
+        self.assertEqual(1, info.hits)
+        self.assertEqual(1, info.misses)
+        self.assertEqual(1, info.currsize)
+        self.assertEqual(core.PARSE_CACHE_SIZE, info.maxsize)
+
+    def test_clear(self):
+        xp = parse("a")
+        core.clear_parse_cache()
+        self.assertEqual((0, 0), core.parse_cache_info()[:2])
+        self.assertEqual(0, core.parse_cache_info().currsize)
+        self.assertIsNot(xp, parse("a"))
+
+    def test_bounded(self):
+        core.set_parse_cache_size(2)
+        a = parse("a")
+        parse("b")
+        parse("a")  # a is now most recently used
+        parse("c")  # evicts b
+        self.assertEqual(2, core.parse_cache_info().currsize)
+        self.assertIs(a, parse("a"))
+        misses = core.parse_cache_info().misses
+        parse("b")
+        self.assertEqual(misses + 1, core.parse_cache_info().misses)
+
+        # shrinking discards least recently used entries
+        core.set_parse_cache_size(1)
+        self.assertEqual(1, core.parse_cache_info().currsize)
+
+    def test_disabled(self):
+        core.set_parse_cache_size(0)
+        self.assertIsNot(parse("a"), parse("a"))
+        self.assertEqual(0, core.parse_cache_info().currsize)
+        self.assertRaises(ValueError, core.set_parse_cache_size, -1)
+
+    def test_errors_not_cached(self):
+        self.assertRaises(RuntimeError, parse, "bogus-(")
+        self.assertRaises(RuntimeError, parse, "bogus-(")
+        self.assertEqual(0, core.parse_cache_info().currsize)
+
+    def test_parse_many(self):
+        a = parse("a")
+        parsed = core.parse_many(["a", "b/c", "a", "b/c", "@d"])
+        self.assertEqual(["a", "b/c", "@d"], list(parsed))
+        self.assertIs(a, parsed["a"])
+        self.assertIs(parsed["b/c"], parse("b/c"))
+        self.assertEqual("@d", serialize(parsed["@d"]))
+        # each distinct xpath is looked up and parsed once
+        self.assertEqual(3, core.parse_cache_info().currsize)
+        self.assertEqual({}, core.parse_many([]))
+        self.assertRaises(RuntimeError, core.parse_many, ["a", "bogus-("])
+
+        for engine in core.PARSER_ENGINES:
+            core.set_parser_engine(engine)
+            try:
+                expected = dict((xp, parse(xp)) for xp in SAMPLE_XPATHS)
+                core.clear_parse_cache()
+                self.assertEqual(expected, core.parse_many(SAMPLE_XPATHS))
+            finally:
+                core.set_parser_engine("ply")
+
+
+class ThreadSafetyTest(unittest.TestCase):
+    def setUp(self):
+        # disable the cache so every call exercises the lexer and parser
+        core.set_parse_cache_size(0)
+        self.switch_interval = sys.getswitchinterval()
+        # switch threads as often as possible to provoke interleaving
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+        core.set_parse_cache_size(core.PARSE_CACHE_SIZE)
+        core.clear_parse_cache()
+
+    def test_concurrent_parse(self):
+        expected = dict((xp, serialize(parse(xp))) for xp in SAMPLE_XPATHS)
+        work = SAMPLE_XPATHS * 200
+
+        def parse_serialize(xpath):
+            return xpath, serialize(parse(xpath))
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(parse_serialize, work))
+
+        self.assertEqual(len(work), len(results))
+        for xpath, serialized in results:
+            self.assertEqual(expected[xpath], serialized)
+
+    def test_lexer_state_reset(self):
+        # a failed parse must not leave lookbehind state that changes
+        # how the next expression is lexed
+        self.assertRaises(RuntimeError, parse, "a b")
+        xp = parse("div")
+        self.assertTrue(isinstance(xp, ast.Step))
+        self.assertEqual("div", xp.node_test.name)
+
+
+def dump_ast(node):
+    # structural dump of an ast for comparing trees from different parsers
+    if isinstance(node, (list, tuple)):
+        return [dump_ast(item) for item in node]
+    if type(node).__module__ == ast.__name__:
+        attrs = [
+            (name, dump_ast(getattr(node, name)))
+            for name in sorted(dir(node))
+            if not name.startswith("_") and not callable(getattr(node, name))
+        ]
+        return (type(node).__name__, attrs)
+    return (type(node).__name__, node)
+
+
+def xmlobject_xpaths():
+    # every field xpath declared on the xmlobjects shipped with neuxml
+    import neuxml.xmlmap.cerp  # noqa: F401
+    import neuxml.xmlmap.dc  # noqa: F401
+    import neuxml.xmlmap.eadmap  # noqa: F401
+    import neuxml.xmlmap.mods  # noqa: F401
+    import neuxml.xmlmap.premis  # noqa: F401
+    import neuxml.xmlmap.teimap  # noqa: F401
+
+    xpaths = set()
+    classes = [xmlmap.XmlObject]
+    while classes:
+        cls = classes.pop()
+        classes.extend(cls.__subclasses__())
+        xpaths.update(field.xpath for field in cls._fields.values())
+    return sorted(xpaths)
+
+
+class ParserEngineTest(unittest.TestCase):
+    # tokens for generating random, mostly invalid, expressions
+    FUZZ_VOCABULARY = (
+        "a b:c div or and mod text node child comment processing-instruction "
+        "* / // | - + = != < >= ( ) [ ] @ :: : . .. 1 2.5 's' $v , f"
+    ).split()
+
+    def tearDown(self):
+        core.set_parser_engine("ply")
+
+    def assertSameParse(self, xpath):
+        core.set_parser_engine("ply")
+        results = []
+        for parse_xpath in (core._parse, rdparser.parse):
+            try:
+                results.append(dump_ast(parse_xpath(xpath)))
+            except (TypeError, RuntimeError) as err:
+                results.append(type(err))
+        self.assertEqual(results[0], results[1], "parsers disagree on %r" % xpath)
+
+    def test_xmlobject_xpaths(self):
+        xpaths = xmlobject_xpaths()
+        self.assertTrue(len(xpaths) > 200)
+        for xpath in SAMPLE_XPATHS + xpaths:
+            self.assertSameParse(xpath)
+
+    def test_random_expressions(self):
+        rand = random.Random(1)
+        for i in range(2000):
+            words = rand.randint(1, 8)
+            self.assertSameParse(
+                " ".join(rand.choice(self.FUZZ_VOCABULARY) for j in range(words))
+            )
+
+    def test_set_parser_engine(self):
+        self.assertEqual("ply", core.get_parser_engine())
+        self.assertRaises(ValueError, core.set_parser_engine, "earley")
+        self.assertEqual("ply", core.get_parser_engine())
+
+        parse("e:did/e:unittitle")
+        core.set_parser_engine("recursive-descent")
+        self.assertEqual("recursive-descent", core.get_parser_engine())
+        # switching engines empties the cache
+        self.assertEqual(0, core.parse_cache_info().currsize)
+        xp = parse("e:did/e:unittitle")
+        self.assertEqual("e:did/e:unittitle", serialize(xp))
+        self.assertRaises(RuntimeError, parse, "a b")
+        self.assertRaises(TypeError, parse, "!")
+
+
+class AstNodeTest(unittest.TestCase):
+    def setUp(self):
+        # parse fresh copies rather than sharing cached trees
+        core.set_parse_cache_size(0)
+
+    def tearDown(self):
+        core.set_parse_cache_size(core.PARSE_CACHE_SIZE)
+
+    def test_structural_equality(self):
+        for xpath in SAMPLE_XPATHS:
+            first, second = parse(xpath), parse(xpath)
+            self.assertIsNot(first, second)
+            self.assertEqual(first, second)
+            self.assertEqual(hash(first), hash(second))
+
+        self.assertNotEqual(parse("a/b"), parse("a//b"))
+        self.assertNotEqual(parse("a/b"), parse("a/c"))
+        self.assertNotEqual(parse("a[1]"), parse("a[1.0]"))
+        self.assertNotEqual(parse("a['1']"), parse("a[1]"))
+        self.assertNotEqual(parse("$a"), parse("$x:a"))
+        self.assertNotEqual(parse("a"), "a")
+        # usable as dictionary keys
+        self.assertEqual({parse("e:did/e:unittitle"): 1}[parse("e:did/e:unittitle")], 1)
+
+    def test_slots(self):
+        xp = parse("mods:name[mods:role/mods:roleTerm='creator']")
+        self.assertFalse(hasattr(xp, "__dict__"))
+        self.assertRaises(AttributeError, setattr, xp, "bogus", 1)
+        self.assertTrue(isinstance(xp.predicates, tuple))
+        self.assertTrue(isinstance(parse("concat('a', 'b')").args, tuple))
+        self.assertTrue(isinstance(parse("$v[1][2]").predicates, tuple))
+
+    def test_intern(self):
+        first = parse("e:did/e:unittitle")
+        second = parse("e:did/e:origination")
+        interned_first = ast.intern(first)
+        interned_second = ast.intern(second)
+        self.assertEqual(first, interned_first)
+        self.assertEqual(second, interned_second)
+        # the common e:did prefix is shared
+        self.assertIs(interned_first.left, interned_second.left)
+        self.assertIs(interned_first, ast.intern(parse("e:did/e:unittitle")))
+        # interning does not modify its argument
+        self.assertIsNot(first.left, second.left)
+        # plain values are returned unchanged
+        self.assertEqual("a", ast.intern("a"))
+
+    def test_serialize_cached(self):
+        xp = parse("e:did/e:unittitle")
+        self.assertIs(serialize(xp), serialize(xp))
+        # the serialization of subtrees is cached as well
+        self.assertIs(serialize(xp.left), serialize(xp.left))
+
+        # appending a predicate while parsing invalidates the cache
+        pred = ast.PredicatedExpression(ast.VariableReference((None, "v")))
+        pred.append_predicate(1)
+        self.assertEqual("($v)[1]", serialize(pred))
+        pred_hash = hash(pred)
+        pred.append_predicate(2)
+        self.assertEqual("($v)[1][2]", serialize(pred))
+        self.assertNotEqual(pred_hash, hash(pred))
+
+
 class TestSerializeRoundTrip(unittest.TestCase):
     def round_trip(self, xpath_str):
         xp = parse(xpath_str)
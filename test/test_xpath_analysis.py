@@ -0,0 +1,186 @@
+# file test_xpath_analysis.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import unittest
+
+from neuxml.xpath import analysis
+from neuxml.xpath.core import parse
+
+EAD = "urn:isbn:1-931666-22-9"
+NAMESPACES = {"e": EAD, "xlink": "http://www.w3.org/1999/xlink"}
+
+
+class ClassifyTest(unittest.TestCase):
+    def classify(self, xpath):
+        return analysis.classify(parse(xpath), NAMESPACES)
+
+    def test_self(self):
+        self.assertEqual(
+            analysis.Shape(analysis.SELF, (), None, None), self.classify(".")
+        )
+        self.assertEqual(analysis.GENERAL, self.classify("..").kind)
+
+    def test_child(self):
+        shape = self.classify("e:did")
+        self.assertEqual(analysis.CHILD, shape.kind)
+        self.assertEqual(("{%s}did" % EAD,), shape.tags)
+        self.assertEqual(("title",), self.classify("title").tags)
+        self.assertEqual(("*",), self.classify("*").tags)
+        self.assertEqual(("{%s}*" % EAD,), self.classify("e:*").tags)
+        self.assertEqual(analysis.CHILD, self.classify("child::e:did").kind)
+
+    def test_child_path(self):
+        shape = self.classify("e:did/e:unittitle")
+        self.assertEqual(analysis.CHILD_PATH, shape.kind)
+        self.assertEqual(("{%s}did" % EAD, "{%s}unittitle" % EAD), shape.tags)
+
+    def test_attribute(self):
+        shape = self.classify("@id")
+        self.assertEqual(analysis.Shape(analysis.ATTRIBUTE, (), "id", None), shape)
+        shape = self.classify("e:dao/@xlink:href")
+        self.assertEqual(analysis.ATTRIBUTE, shape.kind)
+        self.assertEqual(("{%s}dao" % EAD,), shape.tags)
+        self.assertEqual("{http://www.w3.org/1999/xlink}href", shape.attribute)
+        self.assertEqual(analysis.GENERAL, self.classify("@*").kind)
+
+    def test_text(self):
+        self.assertEqual(
+            analysis.Shape(analysis.TEXT, (), None, None), self.classify("text()")
+        )
+        shape = self.classify("e:did/text()")
+        self.assertEqual(
+            analysis.Shape(analysis.TEXT, ("{%s}did" % EAD,), None, None), shape
+        )
+
+    def test_union(self):
+        shape = self.classify("e:c02|e:c03|e:c04")
+        self.assertEqual(analysis.UNION, shape.kind)
+        self.assertEqual(tuple("{%s}c0%d" % (EAD, i) for i in (2, 3, 4)), shape.tags)
+        self.assertEqual(analysis.GENERAL, self.classify("e:a|e:b/e:c").kind)
+        self.assertEqual(analysis.GENERAL, self.classify("e:a|e:b[1]").kind)
+
+    def test_positional(self):
+        shape = self.classify("e:did[1]/e:unittitle")
+        self.assertEqual(analysis.POSITIONAL, shape.kind)
+        self.assertEqual(("{%s}did" % EAD, "{%s}unittitle" % EAD), shape.tags)
+        self.assertEqual((1, None), shape.positions)
+        self.assertEqual(analysis.GENERAL, self.classify("e:did[0]").kind)
+        self.assertEqual(analysis.GENERAL, self.classify("e:did[1.5]").kind)
+        self.assertEqual(analysis.GENERAL, self.classify("e:did[1]/@id").kind)
+
+    def test_general(self):
+        for xpath in [
+            ".//e:unitdate",
+            "/e:ead",
+            "e:archdesc[@level='collection']/e:did",
+            "count(e:c01)",
+            "parent::e:did",
+            "e:did//e:unittitle",
+            "./e:did",
+            "node()",
+            # undeclared prefix
+            "mods:title",
+        ]:
+            self.assertEqual(analysis.GENERAL, self.classify(xpath).kind, xpath)
+
+
+class DependenciesTest(unittest.TestCase):
+    def dependencies(self, xpath):
+        return analysis.dependencies(parse(xpath), NAMESPACES)
+
+    def test_names(self):
+        deps = self.dependencies("e:did/e:unittitle")
+        self.assertEqual(
+            analysis.Dependencies(
+                frozenset(["{%s}did" % EAD, "{%s}unittitle" % EAD]),
+                frozenset(),
+                False,
+                False,
+            ),
+            deps,
+        )
+        deps = self.dependencies("e:dao[@audience='external']/@xlink:href")
+        self.assertEqual(frozenset(["{%s}dao" % EAD]), deps.elements)
+        self.assertEqual(
+            frozenset(["audience", "{http://www.w3.org/1999/xlink}href"]),
+            deps.attributes,
+        )
+        self.assertEqual(
+            frozenset(["{%s}c02" % EAD, "{%s}c03" % EAD]),
+            self.dependencies("e:c02|e:c03").elements,
+        )
+        self.assertEqual(frozenset(["{%s}*" % EAD]), self.dependencies("e:*").elements)
+        self.assertEqual(frozenset(["title"]), self.dependencies("title").elements)
+
+    def test_any(self):
+        for xpath in ["*", "node()", "text()", "..", "/e:ead", "x:a", "$var"]:
+            self.assertIn(analysis.ANY, self.dependencies(xpath).elements, xpath)
+        self.assertIn(analysis.ANY, self.dependencies("@*").attributes)
+
+    def test_positional(self):
+        for xpath in [
+            "e:did[1]",
+            "e:c01[2]/e:did",
+            "e:did[position() > 1]",
+            "e:did[last()]",
+            "following-sibling::e:did",
+        ]:
+            self.assertTrue(self.dependencies(xpath).positional, xpath)
+        for xpath in ["e:did", "e:did[@id]", "count(e:did)", "e:did[true()]"]:
+            self.assertFalse(self.dependencies(xpath).positional, xpath)
+
+    def test_descendants(self):
+        for xpath in [
+            ".",
+            ".//e:did",
+            "e:c01//e:did",
+            "descendant::e:did",
+            "self::e:did",
+            "normalize-space()",
+        ]:
+            self.assertTrue(self.dependencies(xpath).descendants, xpath)
+        for xpath in ["e:did", "e:did/text()", "e:did[e:head='x']", "string(@id)"]:
+            self.assertFalse(self.dependencies(xpath).descendants, xpath)
+
+    def test_overlaps(self):
+        def overlaps(first, second):
+            result = analysis.overlaps(
+                self.dependencies(first), self.dependencies(second)
+            )
+            # overlap is symmetric
+            self.assertEqual(
+                result,
+                analysis.overlaps(self.dependencies(second), self.dependencies(first)),
+            )
+            return result
+
+        self.assertFalse(overlaps("e:note", "e:did/e:unittitle"))
+        self.assertFalse(overlaps("@id", "e:did/e:unittitle"))
+        self.assertFalse(overlaps("@id", "@level"))
+        self.assertTrue(overlaps("e:did/e:unitid", "e:did/e:unittitle"))
+        self.assertTrue(overlaps("e:did/e:unitid", "e:c01/e:did"))
+        self.assertTrue(overlaps("@id", "e:did[@id]"))
+        self.assertTrue(overlaps("e:note", "e:*"))
+        self.assertFalse(overlaps("note", "e:*"))
+        self.assertTrue(overlaps("e:note", "*"))
+        self.assertTrue(overlaps("e:note", "."))
+        self.assertTrue(overlaps("e:note", ".//e:head"))
+        self.assertTrue(overlaps("@id", "@*"))
+        # id() and lang() read other parts of the document
+        self.assertTrue(overlaps("@id", "id('a')/e:unittitle"))
+        self.assertTrue(overlaps("e:note", "id('a')/e:unittitle"))
+        self.assertTrue(overlaps("@xml:lang", "e:note[lang('en')]"))
+        self.assertTrue(overlaps("e:did", "e:note[lang('en')]"))
@@ -0,0 +1,130 @@
+# file test_xpath_optimize.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import unittest
+
+from lxml import etree
+
+from neuxml import xmlmap
+from neuxml.xmlmap import eadmap, load_xmlobject_from_file
+from neuxml.xpath.core import parse, serialize
+from neuxml.xpath.optimize import optimize
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "test_xmlmap", "fixtures")
+FIXTURES = ["heaney653.xml", "tei_clarke.xml", "loc-premis-2.1.xml"]
+EAD_NAMESPACES = {"e": eadmap.EAD_NAMESPACE}
+
+# extra expressions exercising each rewrite, for the EAD fixture
+EAD_XPATHS = [
+    "./e:did",
+    "e:did/./e:unittitle",
+    "e:did/self::node()",
+    "./.",
+    "e:did/.",
+    ".//e:unittitle/.",
+    "self::node()/e:did",
+    "e:c01|e:c02|e:c03",
+    "count(e:c02|e:c03)",
+    "e:c02[e:did|e:head]",
+    "e:c02|e:c03|e:did/e:unittitle",
+]
+
+
+def optimized(xpath):
+    return serialize(optimize(parse(xpath)))
+
+
+class OptimizeTest(unittest.TestCase):
+    def test_self_steps(self):
+        self.assertEqual("a", optimized("./a"))
+        self.assertEqual("a/b", optimized("./a/./b"))
+        self.assertEqual("a", optimized("a/self::node()"))
+        self.assertEqual("@id", optimized("./@id"))
+        self.assertEqual("..", optimized("./.."))
+        self.assertEqual(".", optimized("."))
+        self.assertEqual(".", optimized("self::node()"))
+        self.assertEqual("a[b]", optimized("a[./b]"))
+        # not equivalent or not a node-set
+        self.assertEqual(".//a", optimized(".//a"))
+        self.assertEqual("a//.", optimized("a//."))
+        self.assertEqual("$x/.", optimized("$x/."))
+        self.assertEqual("self::node()[1]", optimized("self::node()[1]"))
+
+    def test_union(self):
+        self.assertEqual("*[self::e:a or self::e:b or self::c]", optimized("e:a|e:b|c"))
+        self.assertEqual("a|b/c", optimized("a|b/c"))
+        self.assertEqual("a[1]|b", optimized("a[1]|b"))
+        self.assertEqual("@a|@b", optimized("@a|@b"))
+        self.assertEqual("*|a", optimized("*|a"))
+        self.assertEqual("x[*[self::a or self::b]]", optimized("x[a|b]"))
+
+    def test_unchanged(self):
+        xp = parse("./e:did/e:c02|e:c03")
+        xpath = serialize(xp)
+        optimize(xp)
+        self.assertEqual(xpath, serialize(xp))
+        xp = parse("e:did/e:unittitle")
+        self.assertIs(xp, optimize(xp))
+
+    def assertSameResult(self, xpath, namespaces, elements):
+        original = etree.XPath(xpath, namespaces=namespaces)
+        rewritten = etree.XPath(optimized(xpath), namespaces=namespaces)
+        for element in elements:
+            try:
+                expected = original(element)
+            except etree.XPathEvalError:
+                self.assertRaises(etree.XPathEvalError, rewritten, element)
+                continue
+            self.assertEqual(expected, rewritten(element), xpath)
+
+    def test_equivalent_on_fixtures(self):
+        # every field xpath that the optimizer changes selects the same
+        # nodes from every element of the bundled fixtures
+        documents = [
+            list(etree.parse(os.path.join(FIXTURE_DIR, name)).iter("*"))
+            for name in FIXTURES
+        ]
+        checked = 0
+        classes = [xmlmap.XmlObject]
+        while classes:
+            cls = classes.pop()
+            classes.extend(cls.__subclasses__())
+            for field in cls._fields.values():
+                if optimized(field.xpath) == field.xpath:
+                    continue
+                checked += 1
+                for elements in documents:
+                    self.assertSameResult(field.xpath, cls.ROOT_NAMESPACES, elements)
+        self.assertTrue(checked > 0)
+
+        for xpath in EAD_XPATHS:
+            self.assertSameResult(xpath, EAD_NAMESPACES, documents[0])
+
+    def test_optimized_fields(self):
+        self.assertTrue(eadmap.Component.c.optimize)
+        self.assertEqual(
+            eadmap.Component.c.xpath, serialize(eadmap.Component.c.parsed_xpath)
+        )
+        self.assertNotEqual(eadmap.Component.c.xpath, eadmap.Component.c.eval_xpath)
+
+        ead = load_xmlobject_from_file(
+            os.path.join(FIXTURE_DIR, "heaney653.xml"),
+            eadmap.EncodedArchivalDescription,
+        )
+        union = etree.XPath(eadmap.Component.c.xpath, namespaces=EAD_NAMESPACES)
+        for series in ead.dsc.c:
+            self.assertEqual(union(series.node), [c.node for c in series.c])
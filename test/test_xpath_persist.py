@@ -0,0 +1,109 @@
+# file test_xpath_persist.py
+#
+#   Copyright 2025 Center for Digital Humanities, Princeton University
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import neuxml
+from neuxml import xmlmap
+from neuxml.xpath import core, persist
+
+
+class PersistentCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "sub", "xpath.pickle")
+        self.previous_cache = persist.get_cache()
+
+    def tearDown(self):
+        persist.disable()
+        persist._cache = self.previous_cache
+        self.tmpdir.cleanup()
+
+    def test_disabled(self):
+        persist.disable()
+        self.assertIsNone(persist.get_cache())
+        self.assertIs(core.parse("e:did"), persist.parse("e:did"))
+
+    def test_round_trip(self):
+        persist.enable(self.path)
+        xp = persist.parse("mods:name[mods:role/mods:roleTerm='creator']")
+        self.assertEqual(1, len(persist.get_cache()))
+        persist.get_cache().save()
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(
+            [],
+            [f for f in os.listdir(os.path.dirname(self.path)) if f.endswith(".tmp")],
+        )
+
+        cache = persist.PersistentParseCache(self.path)
+        cached = cache.get("mods:name[mods:role/mods:roleTerm='creator']")
+        self.assertIsNot(xp, cached)
+        self.assertEqual(xp, cached)
+        self.assertEqual(hash(xp), hash(cached))
+        self.assertEqual(core.serialize(xp), core.serialize(cached))
+        self.assertIsNone(cache.get("e:did"))
+
+    def test_save_merges(self):
+        first = persist.PersistentParseCache(self.path)
+        second = persist.PersistentParseCache(self.path)
+        first.put("a", core.parse("a"))
+        second.put("b", core.parse("b"))
+        first.save()
+        second.save()
+        self.assertEqual(2, len(persist.PersistentParseCache(self.path)))
+
+    def test_invalid_files_ignored(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as cachefile:
+            pickle.dump(
+                ({"format": persist.CACHE_FORMAT, "version": "0.1"}, {"a": 1}),
+                cachefile,
+            )
+        self.assertEqual(0, len(persist.PersistentParseCache(self.path)))
+
+        with open(self.path, "wb") as cachefile:
+            cachefile.write(b"not a pickle")
+        with self.assertLogs("neuxml.xpath.persist", level="WARNING"):
+            cache = persist.PersistentParseCache(self.path)
+            self.assertIsNone(cache.get("a"))
+        # a damaged file is replaced when the cache is saved
+        cache.put("a", core.parse("a"))
+        cache.save()
+        self.assertEqual(1, len(persist.PersistentParseCache(self.path)))
+
+    def test_field_uses_cache(self):
+        persist.enable(self.path)
+
+        class CachedObject(xmlmap.XmlObject):
+            persisted = xmlmap.StringField("persist/test/field")
+
+        self.assertEqual(
+            CachedObject.persisted.parsed_xpath,
+            persist.get_cache().get("persist/test/field"),
+        )
+
+    def test_default_path(self):
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": self.tmpdir.name}):
+            self.assertEqual(
+                os.path.join(
+                    self.tmpdir.name, "neuxml", "xpath-%s.pickle" % neuxml.__version__
+                ),
+                persist.default_cache_path(),
+            )